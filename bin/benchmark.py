@@ -0,0 +1,234 @@
+#! /usr/bin/env python3
+"""Benchmark the throughput of the version ranges hot paths against a generated corpus and a tracked baseline.
+
+Usage:
+
+    bin/benchmark.py            # compare with the baseline and fail on regressions beyond the threshold
+    bin/benchmark.py --update   # measure and write the baseline
+"""
+import argparse
+import bisect
+import datetime as dti
+import gc
+import itertools
+import json
+import logging
+import pathlib
+import platform
+import random
+import string
+import sys
+import time
+import tracemalloc
+import uuid
+from collections.abc import Callable, Iterator
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+
+from versioalueet.api import VersionRanges, validate  # noqa: E402
+
+BASELINE = pathlib.Path('etc/benchmark-baseline.json')
+ENCODING = 'utf-8'
+SEED = 42
+THRESHOLD = 0.5
+MIN_SECONDS = 0.05
+ROUNDS = 5
+CORPUS_CONSTRAINTS = 10_000
+SIZES = (1, 10, 100, 1000, 5000)
+SCHEMES = ('pypi', 'npm', 'golang', 'maven', 'generic')
+CALIBRATION = 'calibration-ops-per-sec'
+COMPARATORS = ('', '=', '!=', '<', '<=', '>', '>=')
+FRESH_PROBES = 1000
+
+CorpusType = dict[str, list[str]]
+
+
+def version_for(scheme: str, rng: random.Random) -> str:
+    """Generate a realistic version string for the versioning scheme."""
+    major, minor, patch = rng.randint(0, 30), rng.randint(0, 50), rng.randint(0, 200)
+    flavor = rng.random()
+    if scheme == 'pypi':
+        suffix = '' if flavor < 0.8 else rng.choice(('a', 'b', 'rc', '.post', '.dev')) + str(rng.randint(0, 9))
+        return f'{major}.{minor}.{patch}{suffix}'
+    if scheme in ('npm', 'golang'):
+        prefix = 'v' if scheme == 'golang' else ''
+        suffix = '' if flavor < 0.8 else f'-{rng.choice(("alpha", "beta", "rc"))}.{rng.randint(0, 9)}'
+        return f'{prefix}{major}.{minor}.{patch}{suffix}'
+    if scheme == 'maven':
+        suffix = '' if flavor < 0.8 else f'-{rng.choice(("alpha-1", "beta-2", "RC1", "SNAPSHOT", "sp1"))}'
+        return f'{major}.{minor}.{patch}{suffix}'
+    return f'{major}.{minor}.{patch}{"" if flavor < 0.8 else rng.choice(string.ascii_lowercase)}'
+
+
+def realistic(scheme: str, constraints: int, rng: random.Random) -> str:
+    """Generate a valid vers string with alternating bounds, some pinned and some excluded versions."""
+    versions: set[str] = set()
+    while len(versions) < constraints:
+        versions.add(version_for(scheme, rng))
+    parts = []
+    for slot, version in enumerate(sorted(versions)):
+        comparator = ('>=', '<')[slot % 2] if rng.random() < 0.8 else rng.choice(('', '!='))
+        parts.append(f'{comparator}{version}')
+    rng.shuffle(parts)
+    return f'vers:{scheme}/' + '|'.join(parts)
+
+
+def adversarial(constraints: int, rng: random.Random) -> list[str]:
+    """Generate hostile vers strings (framing pipes, percent-encoding, whitespace, late duplicates, misplacements)."""
+    versions = [f'{n // 100}.{n % 100}' for n in rng.sample(range(10 * constraints + 10), constraints)]
+    piped = '|' * 3 + '|||'.join(f'{rng.choice(COMPARATORS)}{version}' for version in versions) + '|' * 3
+    encoded = '|'.join(version.replace('.', '%2E') for version in versions)
+    spaced = ' | '.join(f' {rng.choice(COMPARATORS)} {version} ' for version in versions)
+    duplicated = '|'.join(versions + versions[:1])
+    return [
+        f'vers:pypi/{piped}',
+        f'vers:pypi/{encoded}',
+        f'vers:pypi/{spaced}',
+        f'vers:pypi/{duplicated}',
+        f'vers:pypi/*|{versions[0]}',
+    ]
+
+
+def fresh_probes(scheme: str, rng: random.Random) -> Iterator[list[str]]:
+    """Yield batches of probe versions never generated before (no rank table can have interned them)."""
+    prefix = 'v' if scheme == 'golang' else ''
+    counter = itertools.count(201)  # the corpus patch levels stay below
+    while True:
+        yield [f'{prefix}{rng.randint(0, 30)}.{rng.randint(0, 50)}.{next(counter)}' for _ in range(FRESH_PROBES)]
+
+
+def corpus(seed: int = SEED) -> CorpusType:
+    """Generate the deterministic corpus keyed by case name (roughly the same constraint count per case)."""
+    rng = random.Random(seed)
+    cases: CorpusType = {}
+    for size in SIZES:
+        count = max(1, CORPUS_CONSTRAINTS // size)
+        for scheme in SCHEMES:
+            cases[f'{scheme}-{size}'] = [realistic(scheme, size, rng) for _ in range(count)]
+        cases[f'adversarial-{size}'] = [text for _ in range(max(1, count // 5)) for text in adversarial(size, rng)]
+    return cases
+
+
+def throughput(work: Callable[[], int]) -> float:
+    """Report the best operations per sec of some rounds repeating the work (returning the operations done)."""
+    best = 0.0
+    for _ in range(ROUNDS):
+        gc.collect()
+        operations, elapsed = 0, 0.0
+        while elapsed < MIN_SECONDS:
+            start = time.perf_counter()
+            operations += work()
+            elapsed += time.perf_counter() - start
+        best = max(best, operations / elapsed)
+    return best
+
+
+def calibration() -> int:
+    """Do a fixed amount of pure Python work (tuple keys, sorting, and bisection) as the yardstick of machine speed."""
+    keys = sorted((n % 97, str(n)) for n in range(1000))
+    return len([bisect.bisect_left(keys, key) for key in keys[::10]])
+
+
+def peak_memory_kbytes(work: Callable[[], object]) -> float:
+    """Trace the peak memory allocated while the work is done and its result is alive."""
+    tracemalloc.start()
+    result = work()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return round(peak / 1024, 3)
+
+
+def measure(cases: CorpusType) -> dict[str, dict[str, float]]:
+    """Measure parse, lean parse, normalize, validate, and inclusion throughput per case.
+
+    The inclusion of the boundary versions (interned in the rank tables) and of fresh versions is measured apart.
+    """
+    results = {}
+    for name, texts in cases.items():
+        valid = [version_ranges for version_ranges in map(VersionRanges, texts) if not version_ranges.failed]
+        probes = [pair[0] for version_ranges in valid for pair in version_ranges.version_constraint_pairs][:1000]
+        fresh = fresh_probes(valid[0].versioning_scheme if valid else 'generic', random.Random(SEED))
+        results[name] = {
+            CALIBRATION: throughput(calibration),
+            'parse-ops-per-sec': throughput(lambda: len([VersionRanges(text) for text in texts])),
+            'lean-parse-ops-per-sec': throughput(lambda: len([VersionRanges(text, lean=True) for text in texts])),
+            'normalize-ops-per-sec': throughput(lambda: len([VersionRanges(text).normalize() for text in texts])),
+            'validate-ops-per-sec': throughput(lambda: len([validate(text) for text in texts])),
+            'peak-memory-kbytes': peak_memory_kbytes(lambda: [VersionRanges(text) for text in texts]),
+        }
+        if valid and probes:
+            results[name]['contains-ops-per-sec'] = throughput(
+                lambda: sum(len([vr.contains(probe) for probe in probes]) for vr in valid[:10])
+            )
+            results[name]['contains-many-ops-per-sec'] = throughput(
+                lambda: sum(len(vr.contains_many(probes)) for vr in valid[:10])
+            )
+            results[name]['contains-fresh-ops-per-sec'] = throughput(
+                lambda: sum(len([vr.contains(probe) for probe in next(fresh)]) for vr in valid[:10])
+            )
+            results[name]['contains-many-fresh-ops-per-sec'] = throughput(
+                lambda: sum(len(vr.contains_many(next(fresh))) for vr in valid[:10])
+            )
+    return results
+
+
+def compare(baseline: dict[str, dict[str, float]], current: dict[str, dict[str, float]], threshold: float) -> list[str]:
+    """List the regressions of current against baseline beyond the relative threshold.
+
+    Throughputs are scaled by the ratio of the calibration throughputs measured with each case,
+    so a machine that is slower or busier than the one recording the baseline does not report regressions.
+    """
+    regressions = []
+    for name, metrics in baseline.items():
+        measured = current.get(name, {})
+        scale = measured.get(CALIBRATION, 1.0) / metrics.get(CALIBRATION, 1.0)
+        for metric, reference in metrics.items():
+            value = measured.get(metric)
+            if value is None or metric == CALIBRATION:
+                continue
+            if metric.endswith('-per-sec') and value < reference * scale * (1 - threshold):
+                reference *= scale
+                regressions.append(f'{name} {metric}: {value:.1f} < {reference:.1f} (-{threshold:.0%})')
+            elif metric.endswith('-kbytes') and value > reference * (1 + threshold):
+                regressions.append(f'{name} {metric}: {value:.1f} > {reference:.1f} (+{threshold:.0%})')
+    return regressions
+
+
+def main(argv: list[str]) -> int:
+    """Measure and either update the baseline or compare with it."""
+    parser = argparse.ArgumentParser(description='Benchmark version ranges throughput against a tracked baseline.')
+    parser.add_argument('--update', action='store_true', help='write the baseline instead of comparing with it')
+    parser.add_argument(
+        '--threshold', type=float, default=THRESHOLD, help=f'relative regression (default: {THRESHOLD})'
+    )
+    options = parser.parse_args(argv)
+
+    logging.disable(logging.CRITICAL)
+    current = measure(corpus())
+    for name, metrics in current.items():
+        print(f'{name}: ' + ', '.join(f'{metric}={value:.1f}' for metric, value in metrics.items()))
+
+    if options.update:
+        data = {
+            'versioalueet': {
+                'timestamp': dti.datetime.now(tz=dti.timezone.utc).strftime('%Y-%m-%d %H:%M:%S +00:00'),
+                'node_id': str(uuid.uuid3(uuid.NAMESPACE_DNS, platform.node())),
+                'python_version': platform.python_version(),
+                'seed': SEED,
+                'cases': current,
+            }
+        }
+        BASELINE.write_text(json.dumps(data, indent=2) + '\n', encoding=ENCODING)
+        print(f'wrote baseline to {BASELINE}')
+        return 0
+
+    baseline = json.loads(BASELINE.read_text(encoding=ENCODING))['versioalueet']['cases']
+    regressions = compare(baseline, current, options.threshold)
+    for regression in regressions:
+        print(f'REGRESSION {regression}')
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main(sys.argv[1:]))
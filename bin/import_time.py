@@ -0,0 +1,82 @@
+#! /usr/bin/env python3
+"""Measure the import time of the package via -X importtime and compare with the tracked budget.
+
+Besides importing modules, runs of statements (like a complete command line invocation) are budgeted by the
+total time of all imports they trigger, including the ones deferred into functions.
+The budgets are the import times measured when they were set plus a margin and are scaled by the ratio of the
+current and the recorded import time of a standard library calibration module, so that a slower or busier machine
+does not exceed them while a regression of the import graph still does.
+"""
+import json
+import os
+import pathlib
+import subprocess  # nosec
+import sys
+
+BUDGET = pathlib.Path('etc/import-time-budget.json')
+ENCODING = 'utf-8'
+RUNS = 7
+CALIBRATION = 'calibration'
+SOCKET_ENV = 'VERSIOALUEET_SOCKET'
+TOTAL = '*'
+
+
+def cumulative_usec(statement: str) -> dict[str, int]:
+    """Execute the statement in a fresh interpreter and return the cumulative import times per module in usec.
+
+    The total of the imports at the top level (not nested in other imports) is reported under the TOTAL key.
+    Writing bytecode is allowed, so that only the first of the runs pays for compiling the sources.
+    No daemon socket is used, so runs measure the local processing.
+    """
+    vector = [sys.executable, '-X', 'importtime', '-c', statement]
+    env = {name: value for name, value in os.environ.items() if name != 'PYTHONDONTWRITEBYTECODE'}
+    env[SOCKET_ENV] = os.path.join(os.sep, 'no', 'such', 'folder', 'versioalueet.sock')
+    run = subprocess.run(vector, capture_output=True, encoding=ENCODING, text=True, check=True, env=env)  # nosec
+    report = run.stderr
+    timings = {TOTAL: 0}
+    for line in report.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|')
+        timings[name.strip()] = int(cumulative.strip())
+        if not name[1:].startswith(' '):
+            timings[TOTAL] += int(cumulative.strip())
+    return timings
+
+
+def best_usec(module: str) -> int:
+    """The best cumulative import time of the module in usec of some runs."""
+    return min(cumulative_usec(f'import {module}').get(module, 0) for _ in range(RUNS))
+
+
+def best_total_usec(statement: str) -> int:
+    """The best total import time of the statement in usec of some runs."""
+    return min(cumulative_usec(statement)[TOTAL] for _ in range(RUNS))
+
+
+def main() -> int:
+    """Report the best of some runs per budgeted module and run and fail if any (calibrated) budget is exceeded."""
+    with BUDGET.open('rt', encoding=ENCODING) as handle:
+        budget = json.load(handle)
+    calibration = budget[CALIBRATION]
+    reference = best_usec(calibration['module'])
+    scale = reference / calibration['cumulative-usec']
+    print(f'{calibration["module"]}: {reference} usec cumulative (calibration scale {scale:.2f})')
+    exceeded = False
+    for module, limits in budget['modules'].items():
+        best = best_usec(module)
+        limit = round(limits['cumulative-usec'] * scale)
+        verdict = 'OK' if best <= limit else 'EXCEEDED'
+        exceeded = exceeded or best > limit
+        print(f'{module}: {best} usec cumulative (budget {limit} usec) - {verdict}')
+    for name, limits in budget.get('runs', {}).items():
+        best = best_total_usec(limits['statement'])
+        limit = round(limits['cumulative-usec'] * scale)
+        verdict = 'OK' if best <= limit else 'EXCEEDED'
+        exceeded = exceeded or best > limit
+        print(f'{name}: {best} usec total (budget {limit} usec) - {verdict}')
+    return 1 if exceeded else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,189 @@
+import io
+import json
+
+import pytest
+
+import versioalueet.bulk as bulk
+import versioalueet.cli as cli
+from versioalueet.api import ParseCache
+
+LINES = (
+    'vers:pypi/|1.2.3||',
+    '',
+    'vers:pypi/',
+    'vers:golang/>v0|>=v1|v2|<v3|v4|<v5|>=v6',
+    '   vers:pypi/ 42  ',
+)
+
+
+def test_stream_in_small_batches():
+    sink = io.StringIO()
+    assert bulk.stream(io.StringIO('\n'.join(LINES) + '\n'), sink, batch_size=2) == (4, 1)
+    records = [json.loads(line) for line in sink.getvalue().splitlines()]
+    assert [record['line'] for record in records] == [1, 3, 4, 5]
+    assert records[1] == {
+        'line': 3,
+        'input': 'vers:pypi/',
+        'code': 'empty-version-constraints',
+        'position': 10,
+        'error': 'version constraints must be non empty',
+    }
+    assert records[2]['normalized'] == 'vers:golang/>v0|<v5|>=v6'
+    assert records[3]['normalized'] == 'vers:pypi/42'
+
+
+def test_stream_empty_source():
+    sink = io.StringIO()
+    assert bulk.stream(io.StringIO(''), sink) == (0, 0)
+    assert not sink.getvalue()
+
+
+def test_main_stream_file(tmp_path, capsys):
+    path = tmp_path / 'ranges.txt'
+    path.write_text('vers:npm/<2|>1\nvers:npm/*\n')
+    assert cli.main(['-q', '-s', str(path)]) == 0
+    out, err = capsys.readouterr()
+    assert [json.loads(line)['normalized'] for line in out.splitlines()] == ['vers:npm/>1|<2', 'vers:npm/*']
+    assert not err
+
+
+def test_main_stream_survives_invalid_encoding(tmp_path, capsys):
+    path = tmp_path / 'ranges.txt'
+    path.write_bytes(b'vers:npm/1.0.0\nvers:generic/caf\xe9|1.0\nvers:npm/<2|>1\n')
+    expected = [
+        {'line': 1, 'input': 'vers:npm/1.0.0', 'normalized': 'vers:npm/1.0.0'},
+        {
+            'line': 2,
+            'input': 'vers:generic/caf|1.0',
+            'code': 'invalid-encoding',
+            'position': 16,
+            'error': 'version range must be encoded as utf-8',
+        },
+        {'line': 3, 'input': 'vers:npm/<2|>1', 'normalized': 'vers:npm/>1|<2'},
+    ]
+    for options in ([], ['-m'], ['-j', '2', '--chunk-size', '1']):
+        assert cli.main(['-q', *options, '-s', str(path)]) == 1
+        out, err = capsys.readouterr()
+        assert [json.loads(line) for line in out.splitlines()] == expected
+        assert not err
+
+
+def test_main_stream_stdin_with_failure(monkeypatch, capsys):
+    monkeypatch.setattr('sys.stdin', io.TextIOWrapper(io.BytesIO(b'vers:npm/<\n')))
+    assert cli.main(['-q', '--stream', '-']) == 1
+    out, _ = capsys.readouterr()
+    assert json.loads(out)['code'] == 'empty-version'
+
+
+def test_main_stream_appends_resource_usage_deltas(monkeypatch, capsys):
+    monkeypatch.setattr('sys.stdin', io.TextIOWrapper(io.BytesIO(b'vers:npm/<2|>1\nvers:npm/<\n')))
+    assert cli.main(['-q', '--usage', '--stream', '-']) == 1
+    out, _ = capsys.readouterr()
+    *records, usage = [json.loads(line) for line in out.splitlines()]
+    assert len(records) == 2
+    assert usage['os-resource-usage-delta']['items'] == 2
+    assert usage['os-resource-usage-delta']['wall-msec-usec-precision'] > 0
+
+
+def test_main_usage_needs_stream(capsys):
+    with pytest.raises(SystemExit):
+        cli.main(['--usage', '-r', 'vers:npm/*'])
+    _, err = capsys.readouterr()
+    assert 'only reported when streaming' in err
+
+
+def test_normalize_parallel_keeps_input_order():
+    lines = [f'vers:pypi/<{n}|>{n + 1}' if n % 7 else 'vers:pypi/' for n in range(500)]
+    sequential = list(bulk.normalize_records(lines))
+    parallel = list(bulk.normalize_parallel(lines, jobs=2, chunk_size=16))
+    assert parallel == sequential
+
+
+def test_validate_parallel_keeps_input_order():
+    lines = [f'vers:pypi/<{n}|>{n + 1}' if n % 7 else 'vers:pypi/' for n in range(500)] + ['', 'pypi/1']
+    sequential = list(bulk.validate_records(lines))
+    parallel = list(bulk.validate_parallel(lines, jobs=2, chunk_size=16))
+    assert parallel == sequential
+    assert [record['line'] for record in parallel] == list(range(1, 501, 7)) + [502]
+
+
+def test_normalize_parallel_rejects_non_positive_chunk_size():
+    with pytest.raises(ValueError, match='positive'):
+        list(bulk.normalize_parallel(['vers:pypi/*'], chunk_size=0))
+
+
+def test_main_stream_file_in_parallel(tmp_path, capsys):
+    path = tmp_path / 'ranges.txt'
+    path.write_text(''.join(f'vers:npm/{n}|<{n}.5\n' for n in range(50)))
+    assert cli.main(['-q', '-j', '2', '--chunk-size', '8', '-s', str(path)]) == 0
+    out, _ = capsys.readouterr()
+    assert [json.loads(line)['line'] for line in out.splitlines()] == list(range(1, 51))
+
+
+def test_main_stream_negative_jobs(capsys):
+    with pytest.raises(SystemExit):
+        cli.main(['-j', '-1', '-s', '-'])
+    _, err = capsys.readouterr()
+    assert 'jobs must not be negative' in err
+
+
+def test_validate_records_logs_nothing(caplog):
+    lines = ['vers:pypi/1|>', 'vers:pypi/*', 'pypi/1', '', 'vers:pypi/*|1']
+    records = list(bulk.validate_records(lines))
+    assert [(record['line'], record['code']) for record in records] == [
+        (1, 'empty-version'),
+        (3, 'missing-uri-scheme'),
+        (5, 'misplaced-asterisk'),
+    ]
+    assert not caplog.text
+
+
+def test_normalize_records_parses_valid_lines_only(caplog):
+    cache = ParseCache(lean=True)
+    lines = ['vers:pypi/1|>', 'vers:pypi/<2|>1', 'pypi/1', 'vers:pypi/*|1']
+    records = list(bulk.normalize_records(lines, cache))
+    assert [record.get('code', record.get('normalized')) for record in records] == [
+        'empty-version',
+        'vers:pypi/>1|<2',
+        'missing-uri-scheme',
+        'misplaced-asterisk',
+    ]
+    assert not caplog.text
+    assert cache.stats()['size'] == 1
+
+
+def test_mapped_lines(tmp_path):
+    path = tmp_path / 'ranges.txt'
+    path.write_bytes(b'vers:npm/1.0.0\r\n\nvers:npm/*')
+    assert [bytes(line) for line in bulk.mapped_lines(str(path))] == [b'vers:npm/1.0.0\r', b'', b'vers:npm/*']
+
+
+def test_mapped_lines_empty_file(tmp_path):
+    path = tmp_path / 'empty.txt'
+    path.write_bytes(b'')
+    assert not list(bulk.mapped_lines(str(path)))
+
+
+def test_mapped_lines_with_held_slices(tmp_path):
+    path = tmp_path / 'ranges.txt'
+    path.write_bytes(b'vers:npm/1.0.0\nvers:npm/2.0.0\n')
+    held = list(bulk.mapped_lines(str(path)))
+    assert [str(line, 'utf-8') for line in held] == ['vers:npm/1.0.0', 'vers:npm/2.0.0']
+
+
+def test_main_stream_mapped_file(tmp_path, capsys):
+    path = tmp_path / 'ranges.txt'
+    path.write_bytes(''.join(f'vers:npm/{n}|<{n}.5\n' for n in range(50)).encode() + b'vers:npm/\n')
+    assert cli.main(['-q', '-m', '-s', str(path)]) == 1
+    sequential, _ = capsys.readouterr()
+    assert cli.main(['-q', '--mmap', '-j', '2', '--chunk-size', '8', '-s', str(path)]) == 1
+    parallel, _ = capsys.readouterr()
+    assert sequential == parallel
+    assert [json.loads(line)['line'] for line in sequential.splitlines()] == list(range(1, 52))
+
+
+def test_main_stream_mapped_stdin(capsys):
+    with pytest.raises(SystemExit):
+        cli.main(['-m', '-s', '-'])
+    _, err = capsys.readouterr()
+    assert 'memory mapping needs a file' in err
@@ -0,0 +1,130 @@
+import random
+
+import pytest
+
+from versioalueet.api import (
+    EQ,
+    GE,
+    GT,
+    LE,
+    LT,
+    NE,
+    VCPairsType,
+    VersionRanges,
+    _compile_intervals,
+    _lookup,
+    _optimize_version_constraints,
+    _squeeze_ranges,
+)
+from versioalueet.schemes import generic_key
+
+COMPARATORS = (EQ, NE, LT, LE, GT, GE)
+PROBES = [f'{number / 2:.1f}' for number in range(2 * 40 + 3)]
+
+
+def reference_squeeze_ranges(vc_pairs_to_squeeze: VCPairsType) -> VCPairsType:
+    """The squeeze implementation before the single pass canonicalization (kept verbatim as reference)."""
+    collector: VCPairsType = []
+    ignore_slot = -1
+    prev_cmp = 'irrelevant'
+    vc_pairs_to_squeeze.append(vc_pairs_to_squeeze[-1])
+    for in_slot, (curr_ver, curr_cmp) in enumerate(vc_pairs_to_squeeze[:-1]):
+        next_slot = in_slot + 1
+        if ignore_slot == in_slot:
+            continue
+
+        next_ver, next_cmp = vc_pairs_to_squeeze[next_slot]
+        if curr_cmp in (GE, GT) and next_cmp in (EQ, GE, GT):
+            sel_ver, sel_cmp, ignore_slot = curr_ver, curr_cmp, next_slot
+        elif curr_cmp in (LT, LE, EQ) and next_cmp in (LE, LT):
+            sel_ver, sel_cmp, ignore_slot = next_ver, next_cmp, in_slot
+        else:
+            sel_ver, sel_cmp = curr_ver, curr_cmp
+
+        if not in_slot:
+            collector.append((sel_ver, sel_cmp))
+            prev_cmp = sel_cmp
+            continue
+
+        if prev_cmp in (GE, GT) and sel_cmp in (EQ, GE, GT):
+            continue
+
+        if prev_cmp in (LT, LE, EQ) and sel_cmp in (LE, LT) and collector:
+            collector.pop()
+
+        collector.append((sel_ver, sel_cmp))
+        prev_cmp = sel_cmp
+
+    return collector
+
+
+def reference_optimize(vc_pairs: VCPairsType) -> VCPairsType:
+    """The optimization before the single pass canonicalization (kept as reference)."""
+    vc_unequal_pairs = [(v, c) for v, c in vc_pairs if c == NE]
+    vc_other_pairs = [(v, c) for v, c in vc_pairs if c != NE]
+    if len(vc_pairs) == 1 or len(vc_other_pairs) < 2:
+        return vc_pairs
+    order = {version: rank for rank, (version, _) in enumerate(vc_pairs)}
+    squeezed = list(set(reference_squeeze_ranges(list(vc_other_pairs))))
+    squeezed.extend(vc_unequal_pairs)
+    squeezed.sort(key=lambda pair: order[pair[0]])
+    return squeezed
+
+
+def memberships(vc_pairs: VCPairsType) -> list[bool]:
+    intervals = _compile_intervals(vc_pairs)
+    return [_lookup(intervals, generic_key(probe)) for probe in PROBES]
+
+
+def check(vc_pairs: VCPairsType) -> None:
+    """The properties of the squeeze and the canonicalization for the sorted pairs with unique versions."""
+    received = list(vc_pairs)
+    others = [(v, c) for v, c in vc_pairs if c != NE]
+    if others:
+        order = {version: rank for rank, (version, _) in enumerate(others)}
+        expected = sorted(set(reference_squeeze_ranges(list(others))), key=lambda pair: order[pair[0]])
+        assert _squeeze_ranges(others) == expected
+
+    optimized = _optimize_version_constraints(vc_pairs, model={})
+    assert vc_pairs == received, 'the input must not be changed'
+    assert memberships(optimized) == memberships(reference_optimize(list(vc_pairs)))
+    assert _optimize_version_constraints(list(optimized), model={}) == optimized, 'canonical form must be stable'
+
+
+def random_pairs(rng: random.Random, count: int) -> VCPairsType:
+    versions = sorted(rng.sample(range(1, 41), count))
+    return [(str(version), rng.choice(COMPARATORS)) for version in versions]
+
+
+def test_canonicalization_agrees_with_reference():
+    rng = random.Random(42)
+    for _ in range(5000):
+        check(random_pairs(rng, rng.randint(1, 12)))
+
+
+def test_canonicalization_agrees_with_reference_hypothesis():
+    hypothesis = pytest.importorskip('hypothesis')
+    strategies = hypothesis.strategies
+
+    @hypothesis.settings(max_examples=2000, deadline=None)
+    @hypothesis.given(strategies.lists(strategies.sampled_from(COMPARATORS), min_size=1, max_size=40))
+    def agree(comparators: list[str]) -> None:
+        check([(str(version), comparator) for version, comparator in enumerate(comparators, start=1)])
+
+    agree()
+
+
+def test_canonicalization_drops_unequal_outside_intervals():
+    assert str(VersionRanges('vers:pypi/!=1|>9')) == 'vers:pypi/>9'
+    assert str(VersionRanges('vers:pypi/>=1|<5|!=7')) == 'vers:pypi/>=1|<5'
+    assert str(VersionRanges('vers:pypi/>=1|!=3|<5')) == 'vers:pypi/>=1|!=3|<5'
+
+
+def test_canonicalization_keeps_only_unequal_constraints():
+    assert str(VersionRanges('vers:pypi/!=2|!=1')) == 'vers:pypi/!=1|!=2'
+
+
+def test_canonicalization_scales_linearly_on_thousands_of_constraints():
+    constraints = '|'.join(f'>={2 * n}|<{2 * n + 1}' for n in range(5000))
+    version_ranges = VersionRanges(f'vers:generic/{constraints}', lean=True)
+    assert len(version_ranges.version_constraint_pairs) == 10_000
@@ -1,3 +1,4 @@
+import json
 import logging
 
 import pytest
@@ -121,3 +122,38 @@ def test_main_version_without_version_ranges(capsys, caplog):
     assert not out
     message_part = '42'
     assert message_part in caplog.text
+
+
+def test_main_versions_inclusion(capsys):
+    options = cli.main(['-r', 'vers:npm/>=1.0.0|<2.0.0', '0.9.0', '1.10.0', '2.0.0'])
+    assert options == 0  # type: ignore
+    out, err = capsys.readouterr()
+    assert out.split('\n') == ['vers:npm/>=1.0.0|<2.0.0', 'out 0.9.0', 'in 1.10.0', 'out 2.0.0', '']
+    assert not err
+
+
+def test_main_versions_empty_version(capsys):
+    options = cli.main(['-qr', 'vers:npm/*', '1.0.0', ' '])
+    assert options == 2  # type: ignore
+    out, err = capsys.readouterr()
+    assert not out
+
+
+def test_main_stream_validate_only(tmp_path, capsys):
+    path = tmp_path / 'ranges.txt'
+    path.write_bytes(
+        b''.join(b'vers:npm/<%d|>%d\n' % (n, n + 1) if n % 5 else b'vers:npm/%d|%d\n' % (n, n) for n in range(40))
+    )
+    expected = [(n + 1, 'duplicate-version') for n in range(0, 40, 5)]
+    for options in ([], ['-m'], ['-j', '2', '--chunk-size', '3']):
+        assert cli.main(['-q', '--validate-only', *options, '-s', str(path)]) == 1
+        out, err = capsys.readouterr()
+        assert [(record['line'], record['code']) for record in map(json.loads, out.splitlines())] == expected
+        assert not err
+
+
+def test_main_validate_only_needs_stream(capsys):
+    with pytest.raises(SystemExit):
+        cli.main(['--validate-only', '-r', 'vers:npm/*'])
+    _, err = capsys.readouterr()
+    assert 'validation only applies when streaming' in err
@@ -0,0 +1,114 @@
+import io
+import random
+
+import pytest
+
+import versioalueet.codec as codec
+from versioalueet.api import VersionRanges
+
+RANGES = (
+    'vers:pypi/<44|>42',
+    'vers:npm/>=1.0.0|!=1.2.3|<2.0.0',
+    'vers:golang/*',
+    'vers:maven/=1.0|2.0|>=3.0|<=4.0',
+    'vers:generic/ü-1|ü-2',
+    'vers:deb/%3E1.0',
+)
+
+
+def random_ranges(rng: random.Random, count: int) -> list[VersionRanges]:
+    comparators = ('', '!=', '<', '<=', '>', '>=')
+    texts = []
+    for _ in range(count):
+        versions = rng.sample(range(1000), rng.randint(1, 8))
+        scheme = rng.choice(('pypi', 'npm', 'generic'))
+        texts.append(f'vers:{scheme}/' + '|'.join(f'{rng.choice(comparators)}{v // 10}.{v % 10}' for v in versions))
+    return [VersionRanges(text) for text in texts]
+
+
+@pytest.mark.parametrize('text', RANGES)
+def test_round_trip_single(text):
+    version_ranges = VersionRanges(text)
+    decoded = VersionRanges.from_bytes(version_ranges.to_bytes())
+    assert decoded == version_ranges
+    assert decoded.version_constraint_pairs == version_ranges.version_constraint_pairs
+    assert VersionRanges.from_bytes(bytearray(version_ranges.to_bytes()), lean=True) == version_ranges
+
+
+def test_round_trip_bulk_and_combined():
+    rng = random.Random(42)
+    version_ranges = random_ranges(rng, 500)
+    version_ranges.extend((~version_ranges[0], VersionRanges('vers:pypi/<2') | VersionRanges('vers:pypi/>=1')))
+    decoded = codec.loads(codec.dumps(version_ranges))
+    assert [item.version_constraint_pairs for item in decoded] == [
+        item.version_constraint_pairs for item in version_ranges
+    ]
+    assert [item.contains_many(['5.0', '50.0']) for item in decoded] == [
+        item.contains_many(['5.0', '50.0']) for item in version_ranges
+    ]
+
+
+def test_strings_are_shared():
+    one = VersionRanges('vers:npm/>=1.0.0|<2.0.0')
+    assert len(codec.dumps([one] * 100)) < 100 * len(codec.dumps([one])) // 4
+
+
+@pytest.mark.parametrize('strings', [10, 300, 70_000])
+def test_reference_widths(strings):
+    versions = '|'.join(str(number) for number in range(strings))
+    version_ranges = VersionRanges(f'vers:generic/{versions}', lean=True)
+    data = version_ranges.to_bytes()
+    assert data[5] == codec._width(strings + 1)
+    assert VersionRanges.from_bytes(data).version_constraint_pairs == version_ranges.version_constraint_pairs
+
+
+def test_dump_and_load_in_blocks():
+    version_ranges = random_ranges(random.Random(7), 250)
+    sink = io.BytesIO()
+    assert codec.dump(iter(version_ranges), sink, block_size=100) == 250
+    assert sink.getvalue().count(codec.MAGIC) >= 3
+    loaded = list(codec.load(io.BytesIO(sink.getvalue()), lean=True))
+    assert [str(item) for item in loaded] == [str(item) for item in version_ranges]
+    assert codec.dump([], io.BytesIO()) == 0
+    assert list(codec.load(io.BytesIO(b''))) == []
+    with pytest.raises(ValueError, match='block size'):
+        codec.dump(version_ranges, io.BytesIO(), block_size=0)
+
+
+def test_invalid_version_ranges_are_refused():
+    with pytest.raises(ValueError, match='no binary encoding'):
+        codec.dumps([VersionRanges('vers:pypi/'), VersionRanges('vers:pypi/1')])
+
+
+def test_any_character_in_versions_round_trips():
+    version_ranges = [VersionRanges('vers:pypi/1%0A2|>3'), VersionRanges('vers:generic/a%0A|b%E2%82%AC%0A%00|<c%7C')]
+    assert not any(item.failed for item in version_ranges)
+    assert codec.loads(codec.dumps(version_ranges)) == version_ranges
+    entry = ('pypi', (('\n', '='), ('', '<')))
+    assert codec.Block(codec.encode([entry])).entry(0) == entry
+
+
+def test_damaged_data_is_refused():
+    data = VersionRanges('vers:npm/>=1.0.0|<2.0.0').to_bytes()
+    damaged = (
+        ('truncated', data[:-1]),
+        ('truncated', data[:5]),
+        ('not a version', b'VRXX' + data[4:]),
+        ('format version', data[:4] + b'\x63' + data[5:]),
+        ('corrupt', data[:5] + b'\x03' + data[6:]),
+        ('exactly one', data + data),
+    )
+    for message, blob in damaged:
+        with pytest.raises(ValueError, match=message):
+            VersionRanges.from_bytes(blob)
+    with pytest.raises(ValueError, match='truncated'):
+        list(codec.load(io.BytesIO(data[:-1])))
+    with pytest.raises(ValueError, match='truncated'):
+        list(codec.load(io.BytesIO(data[:3])))
+
+
+def test_corrupt_references_are_refused():
+    data = bytearray(VersionRanges('vers:npm/>=1.0.0|<2.0.0').to_bytes())
+    data[-len(b'npm1.0.02.0.0') - 3 - 1] = 9
+    with pytest.raises(ValueError, match='corrupt'):
+        VersionRanges.from_bytes(bytes(data))
@@ -0,0 +1,97 @@
+import math
+import time
+from typing import Callable
+
+import pytest
+
+from versioalueet.api import VersionRanges, validate
+
+SMALL, GROWTH = 1000, 8
+SLACK = 2.5
+ATTEMPTS = 3
+REPEATS = 5
+
+BuilderType = Callable[[int], str]
+
+FAMILIES: dict[str, BuilderType] = {
+    'thousands-of-pipes': lambda n: 'vers:pypi/' + '|' * (10 * n) + '1' + '|' * (10 * n),
+    'distinct-versions': lambda n: 'vers:generic/' + '|'.join(str(i) for i in range(n)),
+    'percent-encoded-versions': lambda n: 'vers:generic/' + '|'.join(f'{i}%2E' + '%25' * 8 for i in range(n)),
+    'deep-percent-encoding': lambda n: 'vers:generic/' + '%25' * (10 * n),
+    'alternating-comparators': lambda n: 'vers:pypi/'
+    + '|'.join(f'{("<", ">", "<=", ">=", "!=", "")[i % 6]}{i}' for i in range(n)),
+    'nested-lower-bounds': lambda n: 'vers:pypi/' + '|'.join(f'>{i}' for i in range(n)),
+    'near-duplicates-pypi': lambda n: 'vers:pypi/' + '|'.join(f'1.{i}|1.{i}.post1' for i in range(n // 2)),
+    'near-duplicates-npm': lambda n: 'vers:npm/'
+    + '|'.join(f'1.0.0-alpha.{i}|1.0.0-alpha.{i}.1' for i in range(n // 2)),
+    'duplicate-at-the-end': lambda n: 'vers:generic/' + '|'.join(str(i) for i in range(n)) + '|0',
+    'empty-version-at-the-end': lambda n: 'vers:generic/' + '|'.join(str(i) for i in range(n)) + '|>',
+    'misplaced-asterisk': lambda n: 'vers:generic/*|' + '|'.join(str(i) for i in range(n)),
+    'long-version': lambda n: 'vers:pypi/1.' + '.'.join('0' for _ in range(n)),
+    'long-prerelease': lambda n: 'vers:npm/1.0.0-' + '.'.join(f'a{i}' for i in range(n)),
+}
+
+
+def workload(version_range: str) -> None:
+    VersionRanges(version_range).normalize()
+    validate(version_range)
+
+
+def fastest(version_range: str, run: Callable[[str], None]) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        run(version_range)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def assert_scales_like_n_log_n(build: BuilderType, small: int = SMALL, run: Callable[[str], None] = workload) -> None:
+    large = small * GROWTH
+    bound = SLACK * GROWTH * math.log(large) / math.log(small)
+    small_input, large_input = build(small), build(large)
+    ratios = []
+    for _ in range(ATTEMPTS):  # timings on busy machines are noisy, a superlinear path fails every attempt
+        ratio = fastest(large_input, run) / max(fastest(small_input, run), 1e-9)
+        if ratio <= bound:
+            return
+        ratios.append(round(ratio, 1))
+    pytest.fail(f'growing the input {GROWTH} fold took {ratios} times longer (bound is {bound:.1f})')
+
+
+@pytest.mark.parametrize('family', FAMILIES)
+def test_pathological_families_scale(family):
+    assert_scales_like_n_log_n(FAMILIES[family])
+
+
+def test_quadratic_work_is_detected():
+    def quadratic(version_range: str) -> None:
+        size = int(version_range)
+        sum(i * j for i in range(size) for j in range(0, size, 8))
+
+    with pytest.raises(pytest.fail.Exception, match='times longer'):
+        assert_scales_like_n_log_n(str, small=100, run=quadratic)
+
+
+def test_pathological_inputs_scale_hypothesis():
+    hypothesis = pytest.importorskip('hypothesis')
+    strategies = hypothesis.strategies
+    comparators = ('', '=', '!=', '<', '<=', '>', '>=')
+    suffixes = ('', '.0', '.post1', '-alpha.1', '%2E1', '%25%25', 'rc1')
+
+    @hypothesis.settings(max_examples=15, deadline=None, suppress_health_check=list(hypothesis.HealthCheck))
+    @hypothesis.given(
+        scheme=strategies.sampled_from(('generic', 'pypi', 'npm', 'semver', 'maven')),
+        cycle=strategies.lists(strategies.sampled_from(comparators), min_size=1, max_size=6),
+        suffix=strategies.sampled_from(suffixes),
+        pipes=strategies.integers(min_value=1, max_value=5),
+        tail=strategies.sampled_from(('', '|>', '|0', '|*', '|' * 50)),
+    )
+    def scales(scheme: str, cycle: list[str], suffix: str, pipes: int, tail: str) -> None:
+        def build(n: int) -> str:
+            constraints = (f'{cycle[i % len(cycle)]}{i}{suffix}' for i in range(n))
+            return f'vers:{scheme}/' + ('|' * pipes).join(constraints) + tail
+
+        assert_scales_like_n_log_n(build, small=500)
+
+    scales()
@@ -62,3 +62,37 @@ def test_report_as_json():
     reported = json.loads(env.report(options, format='json'))  # noqa
     del reported['os-resource-usage']
     assert assessed == reported
+
+
+def test_resource_delta_as_context_manager():
+    with env.ResourceDelta(items=5) as delta:
+        sum(number * number for number in range(10_000))
+    report = delta.report()['os-resource-usage-delta']
+    assert report['items'] == 5
+    assert report['wall-msec-usec-precision'] > 0
+    assert report['items-per-sec'] > 0
+    assert list(report)[3:] == list(env.USAGE_KEYS)
+    if 'resource' in sys.modules:
+        assert report['ru-utime-msec-usec-precision'] >= 0
+        assert report['ru-maxrss-mbytes-kbytes-precision'] >= 0
+
+
+def test_resource_delta_as_decorator():
+    delta = env.ResourceDelta()
+
+    @delta
+    def work():
+        return sorted(range(1000, 0, -1))[0]
+
+    assert work() == 1
+    assert delta.elapsed > 0
+    assert delta.report()['os-resource-usage-delta']['items-per-sec'] == 0
+
+
+def test_resource_delta_without_resource(monkeypatch):
+    monkeypatch.delitem(sys.modules, 'resource', raising=False)
+    with env.ResourceDelta() as delta:
+        pass
+    report = delta.report()['os-resource-usage-delta']
+    assert all(report[key] == -1 for key in env.USAGE_KEYS)
+    assert env.resource_usage() == dict.fromkeys(env.USAGE_KEYS, -1)
@@ -0,0 +1,38 @@
+import os
+import subprocess
+import sys
+
+HEAVY_MODULES = {'concurrent.futures', 'json', 'pathlib', 'platform', 'resource', 'urllib.parse', 'uuid'}
+
+
+def imported_modules(statement, env=None):
+    vector = [sys.executable, '-X', 'importtime', '-c', statement]
+    report = subprocess.run(vector, capture_output=True, encoding='utf-8', text=True, check=True, env=env).stderr
+    return {line.split('|')[-1].strip() for line in report.splitlines() if line.startswith('import time:')}
+
+
+def test_import_api_and_cli_stay_lean():
+    baseline = imported_modules('pass')
+    for module in ('versioalueet.api', 'versioalueet.cli'):
+        assert not (imported_modules(f'import {module}') - baseline) & HEAVY_MODULES, module
+
+
+def test_import_has_no_logging_side_effects():
+    statement = (
+        'import logging; formatTime = logging.Formatter.formatTime; import versioalueet.cli;'
+        ' assert not logging.getLogger().handlers; assert logging.Formatter.formatTime is formatTime'
+    )
+    subprocess.run([sys.executable, '-c', statement], check=True)
+
+
+def test_command_line_run_without_daemon_stays_lean(tmp_path):
+    env = dict(os.environ, VERSIOALUEET_SOCKET=str(tmp_path / 'no-daemon.sock'))
+    env.pop('VERSIOALUEET_CACHE', None)
+    baseline = imported_modules('pass', env)
+    statement = "import versioalueet.cli as cli; cli.main(['-qr', 'vers:npm/<2|>1', '1.5'])"
+    heavy = HEAVY_MODULES | {'hashlib', 'socket', 'struct', 'tempfile', 'versioalueet.codec', 'versioalueet.store'}
+    assert not (imported_modules(statement, env) - baseline) & heavy
+
+
+def test_import_matrix_defers_numpy():
+    assert 'numpy' not in imported_modules('import versioalueet.matrix')
@@ -0,0 +1,63 @@
+import random
+
+import pytest
+
+from versioalueet.api import VersionRanges
+from versioalueet.index import VersionRangesIndex
+
+RANGES = (
+    'vers:pypi/*',
+    'vers:pypi/<1.0',
+    'vers:pypi/>=1.0|<2.0',
+    'vers:pypi/>=1.5|!=1.7|<3.0',
+    'vers:pypi/1.2|1.8|>=4.0',
+    'vers:pypi/!=2.0',
+    'vers:pypi/<=0.5|>2.5',
+)
+
+
+def test_stab_agrees_with_contains():
+    ranges = [VersionRanges(text) for text in RANGES]
+    index = VersionRangesIndex()
+    for slot, version_ranges in enumerate(ranges):
+        index.add(version_ranges, label=slot)
+    probes = [f'{major}.{minor}' for major in range(6) for minor in range(10)]
+    for version in probes:
+        expected = [slot for slot, version_ranges in enumerate(ranges) if version in version_ranges]
+        assert sorted(index.stab('pypi', version)) == expected, version
+
+
+def test_stab_random_ranges_agree_with_contains():
+    rng = random.Random(42)
+    comparators = ('', '<', '<=', '>', '>=', '!=')
+    ranges = []
+    for _ in range(200):
+        versions = rng.sample(range(100), rng.randint(1, 6))
+        text = '|'.join(f'{rng.choice(comparators)}{version}' for version in versions)
+        ranges.append(VersionRanges(f'vers:intdot/{text}'))
+    index = VersionRangesIndex()
+    for slot, version_ranges in enumerate(ranges):
+        index.add(version_ranges, label=slot)
+    for probe in range(-1, 102):
+        version = str(abs(probe)) if probe >= 0 else '0.5'
+        expected = [slot for slot, version_ranges in enumerate(ranges) if version in version_ranges]
+        assert sorted(index.stab('intdot', version)) == expected, version
+
+
+def test_stab_rebuilds_after_add():
+    index = VersionRangesIndex([VersionRanges('vers:npm/<1.0.0')])
+    assert len(index.stab('npm', '2.0.0')) == 0
+    index.add(VersionRanges('vers:npm/>1.0.0'), label='later')
+    assert index.stab('npm', '2.0.0') == ['later']
+
+
+def test_add_invalid_version_ranges():
+    index = VersionRangesIndex()
+    with pytest.raises(ValueError, match='invalid version ranges'):
+        index.add(VersionRanges('vers:npm/'))
+
+
+def test_stab_empty_version():
+    index = VersionRangesIndex([VersionRanges('vers:npm/*')])
+    with pytest.raises(ValueError, match='non empty'):
+        index.stab('npm', ' ')
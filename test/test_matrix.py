@@ -0,0 +1,133 @@
+import json
+import random
+
+import pytest
+
+import versioalueet.cli as cli
+import versioalueet.matrix as matrix
+import versioalueet.schemes as schemes
+from versioalueet.api import VersionRanges
+from versioalueet.matrix import contains_masks, contains_matrix
+
+COMPARATORS = ('', '!=', '<', '<=', '>', '>=')
+
+
+def random_ranges(rng: random.Random, count: int) -> list[VersionRanges]:
+    ranges = []
+    while len(ranges) < count:
+        scheme = rng.choice(('pypi', 'npm', 'generic', 'no-such-scheme'))
+        if rng.random() < 0.05:
+            ranges.append(VersionRanges(f'vers:{scheme}/*'))
+            continue
+        versions = rng.sample(range(100), rng.randint(1, 6))
+        text = f'vers:{scheme}/' + '|'.join(f'{rng.choice(COMPARATORS)}{v // 10}.{v % 10}.0' for v in versions)
+        version_ranges = VersionRanges(text)
+        if not version_ranges.failed:
+            ranges.append(version_ranges)
+    return ranges
+
+
+def random_versions(rng: random.Random, count: int) -> list[str]:
+    return [f'{rng.randint(0, 10)}.{rng.randint(0, 10)}.{rng.choice((0, 0, 1))}' for _ in range(count)]
+
+
+def expected(versions: list[str], version_ranges: list[VersionRanges]) -> list[list[bool]]:
+    return [[item.contains(version) for item in version_ranges] for version in versions]
+
+
+def test_matrix_agrees_with_contains():
+    rng = random.Random(42)
+    for _ in range(20):
+        versions, version_ranges = random_versions(rng, 60), random_ranges(rng, 25)
+        assert contains_matrix(versions, version_ranges) == expected(versions, version_ranges)
+
+
+def test_matrix_edge_cases():
+    assert contains_matrix([], [VersionRanges('vers:pypi/1')]) == []
+    assert contains_matrix(['1', '2'], []) == [[], []]
+    assert contains_matrix([' 1 '], [VersionRanges('vers:pypi/1.0')]) == [[True]]
+    with pytest.raises(ValueError, match='non empty'):
+        contains_matrix(['1', ' '], [VersionRanges('vers:pypi/1')])
+    with pytest.raises(ValueError, match='invalid version ranges'):
+        contains_matrix(['1'], [VersionRanges('vers:pypi/1'), VersionRanges('vers:pypi/')])
+
+
+def test_matrix_exceeding_the_shared_rank_table(monkeypatch):
+    table = schemes.RankTable(schemes.pypi_key, maxsize=8)
+    monkeypatch.setitem(schemes._RANK_TABLES, 'pypi', table)
+    versions = [f'{number}.0' for number in range(100)]
+    version_ranges = [VersionRanges('vers:pypi/>=10.0|<20.0'), VersionRanges('vers:pypi/!=50.0')]
+    assert contains_matrix(versions, version_ranges) == expected(versions, version_ranges)
+    assert len(table) <= table.maxsize
+
+
+def test_masks_agree_with_matrix():
+    numpy = pytest.importorskip('numpy')
+    rng = random.Random(7)
+    for _ in range(20):
+        versions, version_ranges = random_versions(rng, 80), random_ranges(rng, 30)
+        masks = contains_masks(versions, version_ranges)
+        assert masks.dtype == numpy.bool_
+        assert masks.shape == (80, 30)
+        assert masks.tolist() == contains_matrix(versions, version_ranges)
+
+
+def test_masks_edge_cases():
+    pytest.importorskip('numpy')
+    assert contains_masks([], [VersionRanges('vers:pypi/1')]).shape == (0, 1)
+    assert contains_masks(['1', '2'], []).shape == (2, 0)
+    assert contains_masks(['1', '2'], [VersionRanges('vers:npm/*')]).tolist() == [[True], [True]]
+    with pytest.raises(ValueError, match='non empty'):
+        contains_masks([''], [VersionRanges('vers:pypi/1')])
+
+
+def test_masks_require_numpy(monkeypatch):
+    monkeypatch.setattr(matrix, 'HAS_NUMPY', False)
+    with pytest.raises(ImportError, match='NumPy'):
+        contains_masks(['1'], [VersionRanges('vers:pypi/1')])
+
+
+def test_cli_matrix_formats(tmp_path, capsys):
+    ranges = tmp_path / 'ranges.txt'
+    ranges.write_text('vers:npm/<2.0.0\n\nvers:npm/>=1.5.0|!=3.0.0\n')
+    versions = tmp_path / 'versions.txt'
+    versions.write_text('1.0.0\n3.0.0\n')
+    arguments = ['-q', '-r', f'@{ranges}', '-r', 'vers:pypi/*', f'@{versions}', '2.0.0']
+
+    assert cli.main(arguments) == matrix.INCLUDED
+    assert capsys.readouterr().out == (
+        'version-ranges,1.0.0,3.0.0,2.0.0\n'
+        'vers:npm/<2.0.0,1,0,0\n'
+        'vers:npm/>=1.5.0|!=3.0.0,0,0,1\n'
+        'vers:pypi/*,1,1,1\n'
+    )
+
+    assert cli.main(['--matrix', 'bitmap', *arguments]) == matrix.INCLUDED
+    assert capsys.readouterr().out.splitlines() == [
+        '100 vers:npm/<2.0.0',
+        '001 vers:npm/>=1.5.0|!=3.0.0',
+        '111 vers:pypi/*',
+    ]
+
+    assert cli.main(['--matrix', 'ndjson', *arguments]) == matrix.INCLUDED
+    records = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [record['contains'] for record in records] == [[True, False, False], [False, False, True], [True] * 3]
+    assert [record['line'] for record in records] == [1, 2, 3]
+
+
+def test_cli_matrix_exit_codes(capsys):
+    assert cli.main(['-q', '-r', 'vers:npm/<1', '-r', 'vers:npm/>9', '2']) == 0
+    assert cli.main(['-q', '--matrix', 'ndjson', '-r', 'vers:npm/<1', '-r', 'vers:npm/<', '0']) == 1
+    out = capsys.readouterr().out.splitlines()
+    assert json.loads(out[-1])['code'] == 'empty-version'
+    assert cli.main(['-q', '-r', 'vers:npm/<1', '-r', 'vers:npm/>9', ' ']) == 2
+    assert cli.main(['-q', '--matrix', 'bitmap', '-r', 'vers:npm/<1']) == 0
+    assert capsys.readouterr().out == ' vers:npm/<1\n'
+
+
+def test_cli_matrix_refusals(capsys):
+    with pytest.raises(SystemExit):
+        cli.main(['--matrix', 'csv', '-s', '-'])
+    with pytest.raises(SystemExit):
+        cli.main(['-r', '@/no/such/file', '1'])
+    assert 'cannot read arguments' in capsys.readouterr().err
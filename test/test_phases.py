@@ -0,0 +1,94 @@
+import io
+
+import pytest
+
+import versioalueet.cli as cli
+import versioalueet.phases as phases
+from versioalueet.api import VersionRanges
+from versioalueet.phases import PhaseStats
+
+
+@pytest.fixture(autouse=True)
+def fresh_phases():
+    phases.disable()
+    phases.reset()
+    yield
+    phases.disable()
+    phases.reset()
+
+
+def test_nothing_is_recorded_when_disabled():
+    VersionRanges('vers:pypi/>=1|<2')
+    assert phases.report() == {}
+
+
+def test_phases_of_valid_version_ranges():
+    phases.enable()
+    VersionRanges('vers:pypi/>=1|<2')
+    VersionRanges('vers:pypi/>=1|<2', lean=True)
+    report = phases.report()
+    assert list(report) == ['tokenize', 'sort', 'optimize', 'model']
+    assert [entry['calls'] for entry in report.values()] == [2, 2, 2, 1]
+    assert not any(entry['rejected'] for entry in report.values())
+    for entry in report.values():
+        assert 0 <= entry['p50-usec'] <= entry['p90-usec'] <= entry['p99-usec'] <= entry['max-usec']
+        assert entry['max-usec'] <= entry['total-usec']
+
+
+@pytest.mark.parametrize(
+    'version_range, rejecting',
+    [
+        ('pypi/1', 'uri-scheme'),
+        ('vers:pypi', 'versioning-scheme'),
+        ('vers:pypi/', 'versioning-scheme'),
+        ('vers:pypi/|', 'split'),
+        ('vers:pypi/1|>|2', 'pairs'),
+        ('vers:pypi/1|1.0', 'sort'),
+    ],
+)
+def test_the_rejecting_phase_is_counted(version_range, rejecting):
+    phases.enable()
+    VersionRanges(version_range)
+    report = phases.report()
+    assert [phase for phase, entry in report.items() if entry['rejected'] and phase != 'tokenize'] == [rejecting]
+    assert report['tokenize']['rejected'] == (rejecting != 'sort')
+    assert 'optimize' not in report
+
+
+def test_samples_are_bounded():
+    phase_stats = PhaseStats(sample_size=8)
+    started = phase_stats.start()
+    for _ in range(100):
+        started = phase_stats.record(phases.SORT, started)
+    assert len(phase_stats._samples[phases.SORT]) == 8
+    assert phase_stats.report()[phases.SORT]['calls'] == 100
+    with pytest.raises(ValueError, match='positive'):
+        PhaseStats(sample_size=0)
+
+
+def test_cli_reports_the_phases_to_standard_error(capsys):
+    assert cli.main(['-q', '--stats', '-r', 'vers:pypi/<2|>1', '1.5']) == 0
+    captured = capsys.readouterr()
+    assert captured.out == 'vers:pypi/>1|<2\nin 1.5\n'
+    lines = captured.err.splitlines()
+    assert lines[0].split()[:3] == ['phase', 'calls', 'rejected']
+    assert [line.split()[:3] for line in lines[1:]] == [
+        [phase, '1', '0'] for phase in ('tokenize', 'sort', 'optimize', 'model')
+    ]
+    assert not phases.PHASE_STATS.enabled
+
+
+def test_cli_reports_the_rejections_of_streams(monkeypatch, capsys):
+    lines = b'vers:pypi/<2|>1\nvers:pypi/\nvers:pypi/1|1.0\nvers:pypi/2\nvers:pypi/caf\xe9\n'
+    monkeypatch.setattr('sys.stdin', io.TextIOWrapper(io.BytesIO(lines)))
+    assert cli.main(['-q', '--stats', '-s', '-']) == 1
+    captured = capsys.readouterr()
+    assert len(captured.out.splitlines()) == 5
+    rows = {line.split()[0]: line.split()[1:3] for line in captured.err.splitlines()[1:]}
+    assert rows == {'tokenize': ['4', '2'], 'sort': ['3', '1'], 'optimize': ['2', '0']}
+    assert not phases.PHASE_STATS.enabled
+
+
+def test_cli_refuses_statistics_of_worker_processes():
+    with pytest.raises(SystemExit):
+        cli.main(['--stats', '-j', '2', '-s', '-'])
@@ -0,0 +1,60 @@
+import random
+
+import pytest
+
+import versioalueet.schemes as schemes
+from versioalueet.api import VersionRanges
+from versioalueet.resolve import best_match
+
+COMPARATORS = ('', '!=', '<', '<=', '>', '>=')
+
+
+def random_range(rng: random.Random) -> VersionRanges:
+    while True:
+        versions = rng.sample(range(60), rng.randint(1, 5))
+        text = 'vers:pypi/' + '|'.join(f'{rng.choice(COMPARATORS)}{v // 10}.{v % 10}' for v in versions)
+        version_ranges = VersionRanges(text)
+        if not version_ranges.failed:
+            return version_ranges
+
+
+def test_best_match_agrees_with_filtering():
+    rng = random.Random(42)
+    for _ in range(300):
+        catalog = sorted({f'{rng.randint(0, 6)}.{rng.randint(0, 9)}' for _ in range(25)}, key=schemes.pypi_key)
+        constraints = [random_range(rng) for _ in range(rng.randint(1, 3))]
+        matching = [version for version in catalog if all(item.contains(version) for item in constraints)]
+        assert best_match(catalog, *constraints) == (matching[-1] if matching else None)
+        assert best_match(catalog, *constraints, highest=False) == (matching[0] if matching else None)
+
+
+def test_best_match_bisects_instead_of_scanning(monkeypatch):
+    calls = []
+
+    def counting_key(version):
+        calls.append(version)
+        return schemes.intdot_key(version)
+
+    monkeypatch.setitem(schemes.SCHEMES, 'counted', counting_key)
+    monkeypatch.setitem(schemes._RANK_TABLES, 'counted', schemes.RankTable(counting_key))
+    catalog = [f'{major}.{minor}' for major in range(100) for minor in range(100)]
+    constraints = (VersionRanges('vers:counted/>=12.0|<57.3'), VersionRanges('vers:counted/!=57.2|!=57.1'))
+    calls.clear()
+    assert best_match(catalog, *constraints) == '57.0'
+    assert best_match(catalog, *constraints, highest=False) == '12.0'
+    assert len(calls) < 200
+
+
+def test_best_match_edge_cases():
+    assert best_match([], VersionRanges('vers:npm/*')) is None
+    assert best_match(['1.0.0', '2.0.0']) == '2.0.0'
+    assert best_match(['1.0.0', '2.0.0'], VersionRanges('vers:npm/*'), highest=False) == '1.0.0'
+    assert best_match(['1.0', '1.0.0'], VersionRanges('vers:pypi/1')) == '1.0.0'
+    assert best_match(['1.0.0', '2.0.0'], VersionRanges('vers:npm/<1.0.0'), VersionRanges('vers:npm/>1.0.0')) is None
+
+
+def test_best_match_refuses_mixed_schemes_and_invalid_version_ranges():
+    with pytest.raises(ValueError, match='versioning schemes npm and pypi'):
+        best_match(['1'], VersionRanges('vers:npm/1'), VersionRanges('vers:pypi/1'))
+    with pytest.raises(ValueError, match='invalid version ranges'):
+        best_match(['1'], VersionRanges('vers:npm/1'), VersionRanges('vers:npm/'))
@@ -0,0 +1,151 @@
+import random
+
+import pytest
+
+import versioalueet.schemes as schemes
+from versioalueet.api import ErrorCode, VersionRanges, _compile_intervals, _lookup, validate
+
+
+def test_numeric_order_across_schemes():
+    for scheme in ('cargo', 'generic', 'golang', 'intdot', 'maven', 'npm', 'pypi', 'semver'):
+        key = schemes.key_function(scheme)
+        assert sorted(['10.0.0', '9.0.0', '9.10.0', '9.2.0'], key=key) == ['9.0.0', '9.2.0', '9.10.0', '10.0.0']
+
+
+def test_keys_of_one_scheme_are_comparable():
+    odd_ones = ['1.0', 'abc', '1.0-x.7', 'v2', '1!2.0', '1.0+local', '', '*', '1..2', 'rc']
+    for scheme in schemes.SCHEMES:
+        key = schemes.key_function(scheme)
+        assert len(sorted(odd_ones, key=key)) == len(odd_ones)
+
+
+def test_golang_pre_releases():
+    key = schemes.key_function('golang')
+    assert sorted(['v1.2.0', 'v1.2.0-beta.2', 'v1.2.0-beta.10'], key=key) == [
+        'v1.2.0-beta.2',
+        'v1.2.0-beta.10',
+        'v1.2.0',
+    ]
+
+
+def test_register_rejects_upper_case():
+    with pytest.raises(ValueError, match='lower case'):
+        schemes.register('PyPI', schemes.pypi_key)
+
+
+def test_normalize_sorts_per_scheme():
+    assert VersionRanges('vers:pypi/<10.0|>=9.0').normalize() == 'vers:pypi/>=9.0|<10.0'
+    assert VersionRanges('vers:npm/10.0.0|9.0.0|>11.0.0').normalize() == 'vers:npm/9.0.0|10.0.0|>11.0.0'
+
+
+def test_contains_per_scheme():
+    version_ranges = VersionRanges('vers:pypi/>=9.0|<10.0')
+    assert '9.5' in version_ranges
+    assert '9.10' in version_ranges
+    assert '10.0.0' not in version_ranges
+    assert '10.0rc1' in version_ranges
+
+
+def test_equivalent_versions_are_not_unique():
+    version_ranges = VersionRanges('vers:pypi/1.0|1.0.0')
+    assert 'unique' in version_ranges.model.get('error', '')
+
+
+def random_versions(rng: random.Random, count: int) -> list[str]:
+    suffixes = ('', '.0', 'rc1', '.post1', '.dev2')
+    return [f'{rng.randint(0, 20)}.{rng.randint(0, 20)}{rng.choice(suffixes)}' for _ in range(count)]
+
+
+def single_ranks(table: schemes.RankTable, versions: list[str]) -> list[int]:
+    while True:
+        generation = table.generation
+        ranks = [table.rank(version) for version in versions]
+        if table.generation == generation:
+            return ranks
+
+
+def test_ranks_order_like_keys_across_relabels(monkeypatch):
+    monkeypatch.setattr(schemes, 'RANK_GAP', 4)
+    rng = random.Random(42)
+    for _ in range(100):
+        table = schemes.RankTable(schemes.pypi_key)
+        generation = table.generation
+        pool = random_versions(rng, 150)
+        for _ in range(20):
+            batch = rng.sample(pool, rng.randint(1, 30))
+            ranks = table.ranks(batch) if rng.random() < 0.5 else single_ranks(table, batch)
+            for left, left_rank in zip(batch, ranks):
+                for right, right_rank in zip(batch, ranks):
+                    left_key, right_key = schemes.pypi_key(left), schemes.pypi_key(right)
+                    assert (left_key < right_key) == (left_rank < right_rank)
+                    assert (left_key == right_key) == (left_rank == right_rank)
+        assert table.generation > generation
+
+
+def test_rank_table_is_bounded():
+    table = schemes.RankTable(schemes.generic_key, maxsize=10)
+    table.ranks([str(number) for number in range(8)])
+    generation = table.generation
+    table.ranks(['100', '101', '102'])
+    assert table.generation > generation
+    assert len(table) == 3
+    assert table.key('7') is table.key('7')
+
+
+def test_register_resets_rank_table():
+    schemes.register('reverse-intdot', lambda version: tuple(-int(part) for part in version.split('.')))
+    try:
+        first = schemes.rank_table('reverse-intdot')
+        assert first.rank('1') > first.rank('2')
+        schemes.register('reverse-intdot', schemes.intdot_key)
+        assert schemes.rank_table('reverse-intdot') is not first
+        assert schemes.rank_table('reverse-intdot').rank('1') < schemes.rank_table('reverse-intdot').rank('2')
+    finally:
+        del schemes.SCHEMES['reverse-intdot']
+        schemes._RANK_TABLES.pop('reverse-intdot', None)
+
+
+def test_contains_survives_new_generations(monkeypatch):
+    monkeypatch.setattr(schemes, 'RANK_GAP', 2)
+    version_ranges = VersionRanges('vers:pypi/>=1.0|!=1.5|<2.0|>=5.0rc1|<=7.0')
+    assert version_ranges.contains('1.2')
+    table = schemes.RankTable(schemes.pypi_key, maxsize=64)
+    monkeypatch.setitem(schemes._RANK_TABLES, 'pypi', table)
+    generation = table.generation
+    rng = random.Random(7)
+    expected = _compile_intervals(list(version_ranges.version_constraint_pairs), schemes.pypi_key)
+    for _ in range(50):
+        probes = random_versions(rng, rng.randint(1, 40))
+        if rng.random() < 0.5:
+            table.ranks(probes[: len(probes) // 2])
+        verdicts = [_lookup(expected, schemes.pypi_key(probe)) for probe in probes]
+        assert version_ranges.contains_many(probes) == verdicts
+        assert [version_ranges.contains(probe) for probe in probes] == verdicts
+    assert table.generation > generation
+
+
+def test_probing_new_versions_keeps_the_ranks(monkeypatch):
+    table = schemes.RankTable(schemes.pypi_key)
+    monkeypatch.setitem(schemes._RANK_TABLES, 'pypi', table)
+    version_ranges = VersionRanges('vers:pypi/>=1.0|<1.1|>=2.0|<3.0')
+    assert version_ranges.contains('1.0')
+    generation = table.generation
+    probes = [f'{major}.{minor}' for major in range(4) for minor in range(2, 200, 3)]
+    verdicts = [version_ranges.contains(probe) for probe in probes]
+    assert version_ranges.contains_many(probes) == verdicts
+    assert verdicts.count(True) == 66
+    assert table.generation == generation
+    assert all(table.get(probe) is None for probe in probes)
+
+
+@pytest.mark.parametrize(
+    'version_range',
+    ['vers:deb/1:2.0|1.2.0', 'vers:rpm/1.0-1|1.0.1', 'vers:generic/1.0|1.00', 'vers:conan/1.0|1_0', 'vers:gem/A|a'],
+)
+def test_generic_fallback_keeps_distinct_versions(version_range):
+    assert validate(version_range) == (ErrorCode.OK, -1)
+    assert not VersionRanges(version_range).failed
+
+
+def test_generic_fallback_still_rejects_duplicates():
+    assert validate('vers:deb/1:2.0|>=1:2.0') == (ErrorCode.DUPLICATE_VERSION, 15)
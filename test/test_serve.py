@@ -0,0 +1,224 @@
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+import versioalueet.cli as cli
+import versioalueet.serve as serve
+from versioalueet import APP_ENV
+from versioalueet.api import ParseCache
+
+
+@pytest.fixture
+def daemon(tmp_path):
+    """Run the daemon on a temporary socket in a background event loop."""
+    path = str(tmp_path / 'daemon.sock')
+    loop = asyncio.new_event_loop()
+    task = loop.create_task(serve.serve(path))
+
+    def run() -> None:
+        with contextlib.suppress(asyncio.CancelledError):
+            loop.run_until_complete(task)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    for _ in range(500):
+        if serve.available(path):
+            break
+        time.sleep(0.01)
+    yield path
+    loop.call_soon_threadsafe(task.cancel)
+    thread.join(timeout=5)
+    loop.close()
+
+
+def test_socket_path_from_environment(monkeypatch):
+    monkeypatch.setenv(serve.SOCKET_ENV, '/some/where.sock')
+    assert serve.socket_path() == '/some/where.sock'
+    monkeypatch.delenv(serve.SOCKET_ENV)
+    monkeypatch.setenv('XDG_RUNTIME_DIR', '/run/user/42')
+    assert serve.socket_path() == '/run/user/42/versioalueet.sock'
+
+
+def test_answer_requests():
+    cache = ParseCache(lean=True)
+    assert serve.answer({'op': 'normalize', 'vers': 'vers:npm/<2|>1'}, cache) == {'normalized': 'vers:npm/>1|<2'}
+    assert serve.answer({'op': 'contains', 'vers': 'vers:npm/<2|>1', 'versions': ['1.5', '2']}, cache) == {
+        'normalized': 'vers:npm/>1|<2',
+        'contains': [True, False],
+    }
+    assert cache.stats()['hits'] == 1
+
+
+def test_answer_invalid_requests_without_parsing(caplog):
+    caplog.set_level(logging.DEBUG, logger=APP_ENV)
+    cache = ParseCache(lean=True)
+    assert serve.answer({'op': 'normalize', 'vers': 'vers:npm/1|<1'}, cache) == {
+        'code': 'duplicate-version',
+        'position': 11,
+        'error': 'versions must be unique across all version constraints',
+    }
+    assert cache.stats()['misses'] == 0
+    assert not caplog.records
+
+
+@pytest.mark.parametrize(
+    'request_, error',
+    [
+        ({'id': 'x'}, 'operation must be normalize or contains'),
+        ({'op': 'normalize', 'vers': 42}, 'vers must be a string'),
+        ({'op': 'contains', 'vers': 'vers:npm/1'}, 'versions must be a list of non empty strings'),
+        ({'op': 'contains', 'vers': 'vers:npm/1', 'versions': [' ']}, 'versions must be a list of non empty strings'),
+    ],
+)
+def test_answer_bad_requests(request_, error):
+    response = serve.answer(request_, ParseCache())
+    assert response['code'] == serve.BAD_REQUEST
+    assert response['error'] == error
+    assert response.get('id') == request_.get('id')
+
+
+def test_forward_to_daemon(daemon):
+    requests = [
+        {'id': 1, 'op': 'normalize', 'vers': 'vers:pypi/ 42 ||'},
+        {'id': 2, 'op': 'contains', 'vers': 'vers:pypi/>=1|<2', 'versions': ['1.1', '3']},
+        {'id': 3, 'op': 'normalize', 'vers': 'vers:pypi/'},
+    ]
+    responses = serve.forward(requests, daemon)
+    assert responses == [
+        {'id': 1, 'normalized': 'vers:pypi/42'},
+        {'id': 2, 'normalized': 'vers:pypi/>=1|<2', 'contains': [True, False]},
+        {
+            'id': 3,
+            'code': 'empty-version-constraints',
+            'position': 10,
+            'error': 'version constraints must be non empty',
+        },
+    ]
+
+
+def test_daemon_answers_garbage_lines(daemon):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.connect(daemon)
+        client.sendall(b'not json\n[1, 2]\n')
+        client.shutdown(socket.SHUT_WR)
+        with client.makefile('rb') as stream:
+            responses = [json.loads(line) for line in stream]
+    assert [response['code'] for response in responses] == [serve.BAD_REQUEST, serve.BAD_REQUEST]
+
+
+def test_daemon_serves_connections_concurrently(daemon):
+    results = {}
+
+    def work(slot: int) -> None:
+        requests = [{'id': n, 'op': 'contains', 'vers': f'vers:pypi/<{slot}', 'versions': [str(n)]} for n in range(20)]
+        results[slot] = [response['contains'][0] for response in serve.forward(requests, daemon)]
+
+    threads = [threading.Thread(target=work, args=(slot,)) for slot in range(1, 9)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(timeout=10)
+    assert results == {slot: [n < slot for n in range(20)] for slot in range(1, 9)}
+
+
+def test_second_daemon_is_refused(daemon):
+    with pytest.raises(RuntimeError, match='already serving'):
+        asyncio.run(serve.serve(daemon))
+
+
+def test_stale_socket_is_replaced_and_removed(tmp_path):
+    path = str(tmp_path / 'stale.sock')
+    stale = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    stale.bind(path)
+    stale.close()
+    assert os.path.exists(path) and not serve.available(path)
+    assert serve.forward([{'op': 'normalize', 'vers': 'vers:npm/1'}], path) is None
+
+    async def briefly() -> None:
+        task = asyncio.ensure_future(serve.serve(path))
+        while not serve.available(path):
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(briefly())
+    assert not os.path.exists(path)
+
+
+def test_cli_forwards_to_daemon(daemon, capsys):
+    assert cli.main(['--socket', daemon, '-r', 'vers:pypi/<2|>1', '1.5', '3']) == 0
+    assert capsys.readouterr().out == 'vers:pypi/>1|<2\nin 1.5\nout 3\n'
+    assert cli.main(['--socket', daemon, '-r', 'vers:pypi/']) == 1
+
+
+def test_cli_without_daemon_works_locally(tmp_path, capsys):
+    assert cli.main(['--socket', str(tmp_path / 'none.sock'), '-r', 'vers:pypi/<2|>1', '1.5']) == 0
+    assert capsys.readouterr().out == 'vers:pypi/>1|<2\nin 1.5\n'
+
+
+def test_daemon_takes_long_request_lines(daemon):
+    vers = 'vers:pypi/' + '|'.join(f'!={major}.{minor}' for major in range(100) for minor in range(100))
+    assert len(vers) > 1 << 16
+    responses = serve.forward([{'op': 'contains', 'vers': vers, 'versions': ['7.7', '7.7.1']}], daemon)
+    assert responses[0]['contains'] == [False, True]
+
+
+def test_daemon_refuses_too_long_request_lines(tmp_path, monkeypatch):
+    monkeypatch.setattr(serve, 'LINE_LIMIT', 1 << 10)
+
+    async def briefly(path: str) -> list[dict[str, object]]:
+        task = asyncio.ensure_future(serve.serve(path))
+        while not serve.available(path):
+            await asyncio.sleep(0.01)
+        reader, writer = await asyncio.open_unix_connection(path)
+        writer.write(b'{"op": "normalize", "vers": "vers:pypi/' + b'1' * 2048 + b'"}\n')
+        await writer.drain()
+        responses = [json.loads(line) async for line in reader]
+        writer.close()
+        task.cancel()
+        with contextlib.suppress(asyncio.CancelledError):
+            await task
+        return responses
+
+    responses = asyncio.run(briefly(str(tmp_path / 'small.sock')))
+    assert responses == [{'code': serve.BAD_REQUEST, 'error': 'request line too long'}]
+
+
+def test_socket_is_private(daemon):
+    assert os.stat(daemon).st_mode & 0o777 == 0o600
+
+
+def test_socket_of_other_user_is_ignored(daemon, monkeypatch):
+    monkeypatch.setattr(os, 'getuid', lambda: os.stat(daemon).st_uid + 1)
+    assert not serve.owned(daemon)
+    assert serve.forward([{'op': 'normalize', 'vers': 'vers:npm/1'}], daemon) is None
+
+
+def test_cli_falls_back_when_daemon_drops_the_request(tmp_path, capsys):
+    path = str(tmp_path / 'dropping.sock')
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as listener:
+        listener.bind(path)
+        listener.listen()
+
+        def drop() -> None:
+            connection, _ = listener.accept()
+            connection.close()
+
+        thread = threading.Thread(target=drop, daemon=True)
+        thread.start()
+        assert cli.main(['--socket', path, '-r', 'vers:pypi/<2|>1', '1.5']) == 0
+        thread.join(timeout=5)
+    assert capsys.readouterr().out == 'vers:pypi/>1|<2\nin 1.5\n'
+
+
+def test_cli_serve_conflicts():
+    with pytest.raises(SystemExit):
+        cli.main(['--serve', '-r', 'vers:pypi/1'])
@@ -0,0 +1,176 @@
+import json
+import logging
+import os
+
+import versioalueet.cli as cli
+import versioalueet.store as store
+from versioalueet import APP_ENV
+from versioalueet.api import ParseCache, VersionRanges
+from versioalueet.store import DiskCache
+
+RANGES = (
+    'vers:pypi/<44|>42',
+    'vers:npm/>=1.0.0|!=1.2.3|<2.0.0',
+    'vers:golang/*',
+    'vers:maven/=1.0|2.0|>=3.0',
+    'vers:generic/ü-1|ü-2',
+)
+
+
+def filled(path: str) -> DiskCache:
+    cache = DiskCache(path)
+    for text in RANGES:
+        cache.put(text, VersionRanges(text))
+    assert cache.save() == len(RANGES)
+    return cache
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / 'ranges.cache')
+    filled(path)
+    reader = DiskCache(path)
+    for text in RANGES:
+        cached = reader.get(text, lean=True)
+        parsed = VersionRanges(text)
+        assert cached == parsed
+        assert cached.version_constraint_pairs == parsed.version_constraint_pairs
+        assert cached.model['version-range'] == parsed.model['version-range']
+    assert reader.get('vers:pypi/1') is None
+    assert reader.stats() == {'hits': len(RANGES), 'misses': 1, 'loaded': len(RANGES), 'added': 0}
+
+
+def test_versions_with_line_feeds_are_saved(tmp_path):
+    path = str(tmp_path / 'ranges.cache')
+    writer = DiskCache(path)
+    writer.put('vers:pypi/1%0A2|>3', VersionRanges('vers:pypi/1%0A2|>3'))
+    assert writer.save() == 1
+    cached = DiskCache(path).get('vers:pypi/1%0A2|>3')
+    assert cached.version_constraint_pairs == (('1\n2', '='), ('3', '>'))
+
+
+def test_loads_lazily_on_first_lookup(tmp_path):
+    path = str(tmp_path / 'ranges.cache')
+    filled(path)
+    reader = DiskCache(path)
+    os.unlink(path)
+    assert reader.stats()['loaded'] == 0
+    assert reader.get(RANGES[0]) is None
+
+
+def test_save_merges_with_loaded_entries(tmp_path):
+    path = str(tmp_path / 'ranges.cache')
+    filled(path)
+    writer = DiskCache(path)
+    writer.put(RANGES[0], VersionRanges(RANGES[0]))
+    writer.put('vers:deb/>=1.0', VersionRanges('vers:deb/>=1.0'))
+    assert writer.save() == 1
+    assert writer.save() == 0
+    reader = DiskCache(path)
+    assert [str(reader.get(text)) for text in RANGES] == [str(VersionRanges(text)) for text in RANGES]
+    assert str(reader.get('vers:deb/>=1.0')) == 'vers:deb/>=1.0'
+
+
+def test_corrupt_and_foreign_files_are_ignored_and_replaced(tmp_path, caplog):
+    caplog.set_level(logging.WARNING, logger=APP_ENV)
+    path = tmp_path / 'ranges.cache'
+    filled(str(path))
+    blob = path.read_bytes()
+    for damaged in (blob[:-1], blob + b'x', b'VRSC\x63' + blob[5:], b''):
+        path.write_bytes(damaged)
+        assert DiskCache(str(path)).get(RANGES[0]) is None
+    assert 'ignoring' in caplog.text
+    filled(str(path))
+    assert DiskCache(str(path)).get(RANGES[0]) is not None
+
+
+def test_files_of_other_library_versions_are_discarded(tmp_path, monkeypatch):
+    path = str(tmp_path / 'ranges.cache')
+    monkeypatch.setattr(store, 'STAMP', store.digest('0.0.1'))
+    filled(path)
+    assert DiskCache(path).get(RANGES[0]) is not None
+    monkeypatch.setattr(store, 'STAMP', store.digest('0.0.2'))
+    assert DiskCache(path).get(RANGES[0]) is None
+    filled(path)
+    assert DiskCache(path).get(RANGES[0]) is not None
+
+
+def test_read_only_caches_ignore_added_entries(tmp_path):
+    path = str(tmp_path / 'ranges.cache')
+    reader = DiskCache(path, read_only=True)
+    reader.put(RANGES[0], VersionRanges(RANGES[0]))
+    assert reader.stats()['added'] == 0
+    assert reader.save() == 0
+    assert not os.path.exists(path)
+
+
+def test_added_entries_are_flushed_periodically(tmp_path):
+    path = str(tmp_path / 'ranges.cache')
+    writer = DiskCache(path, flush_size=2)
+    for text in RANGES:
+        writer.put(text, VersionRanges(text))
+        assert writer.stats()['added'] < 2
+    assert writer.saved == 4
+    assert writer.save() == 1
+    assert writer.saved == len(RANGES)
+    assert DiskCache(path).get(RANGES[-1]) is not None
+
+
+def test_parse_cache_consults_and_feeds_the_store(tmp_path):
+    path = str(tmp_path / 'ranges.cache')
+    cold = ParseCache(lean=True, store=DiskCache(path))
+    assert str(cold.get(' vers:pypi/<44 | >42 ')) == 'vers:pypi/>42|<44'
+    assert cold.get('vers:pypi/').failed
+    assert cold.store.stats() == {'hits': 0, 'misses': 2, 'loaded': 0, 'added': 1}
+    cold.store.save()
+
+    warm = ParseCache(lean=True, store=DiskCache(path))
+    shared = warm.get('vers:pypi/<44|>42')
+    assert str(shared) == 'vers:pypi/>42|<44'
+    assert shared.normalize('vers:pypi/1') == 'vers:pypi/1'
+    assert str(shared) == 'vers:pypi/>42|<44'
+    assert warm.store.stats()['hits'] == 1
+
+
+def test_configured_by_environment(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.delenv(store.STORE_ENV, raising=False)
+    assert store.configured() is None
+    monkeypatch.setenv(store.STORE_ENV, str(tmp_path / 'env.cache'))
+    assert store.configured().path == str(tmp_path / 'env.cache')
+
+
+def test_configured_by_configuration_file(monkeypatch, tmp_path):
+    monkeypatch.delenv(store.STORE_ENV, raising=False)
+    monkeypatch.setenv('HOME', str(tmp_path / 'home'))
+    monkeypatch.chdir(tmp_path)
+    config = tmp_path / '.versioalueet.json'
+    config.write_text(json.dumps({'cache': 'folder/ranges.cache'}))
+    assert store.configured().path == str(tmp_path / 'folder' / 'ranges.cache')
+    config.write_text(json.dumps({'cache': ''}))
+    assert store.configured() is None
+    config.write_text('{')
+    assert store.configured() is None
+
+
+def test_stream_fills_and_reuses_the_configured_cache(monkeypatch, tmp_path, capsys):
+    path = tmp_path / 'ranges.cache'
+    monkeypatch.setenv(store.STORE_ENV, str(path))
+    source = tmp_path / 'ranges.txt'
+    source.write_text('\n'.join(RANGES + ('vers:pypi/',)) + '\n')
+    assert cli.main(['-q', '--stream', str(source)]) == 1
+    first = capsys.readouterr().out
+    assert path.exists()
+    assert DiskCache(str(path)).stats()['loaded'] == 0
+    assert cli.main(['-q', '--stream', str(source)]) == 1
+    assert capsys.readouterr().out == first
+
+
+def test_parallel_stream_leaves_the_configured_cache_alone(monkeypatch, tmp_path, capsys):
+    path = tmp_path / 'ranges.cache'
+    monkeypatch.setenv(store.STORE_ENV, str(path))
+    source = tmp_path / 'ranges.txt'
+    source.write_text('\n'.join(RANGES) + '\n')
+    assert cli.main(['-q', '-j', '2', '--chunk-size', '2', '--stream', str(source)]) == 0
+    assert len(capsys.readouterr().out.splitlines()) == len(RANGES)
+    assert not path.exists()
@@ -2,7 +2,7 @@ import operator
 
 import pytest
 
-from versioalueet.api import VersionRanges
+from versioalueet.api import ERROR_CODES, ErrorCode, ParseCache, VersionRanges, _diagnose, _tokenize, validate
 
 
 def test_versioalueet():
@@ -157,3 +157,277 @@ def test_comparisons_other_than_identity_are_blocked():
     for op in ops:
         with pytest.raises(TypeError):
             op(vr_reborn, vr)  # type: ignore
+
+
+def test_contains_within_bounds():
+    version_ranges = VersionRanges('vers:golang/>v0|<v5|>=v6')
+    assessed = {version: version_ranges.contains(version) for version in ('v0', 'v1', 'v5', 'v55', 'v6', 'v7')}
+    assert assessed == {'v0': False, 'v1': True, 'v5': False, 'v55': True, 'v6': True, 'v7': True}
+
+
+def test_contains_only_not_equal():
+    version_ranges = VersionRanges('vers:pypi/!=42')
+    assert '41' in version_ranges
+    assert '42' not in version_ranges
+
+
+def test_contains_only_equal():
+    version_ranges = VersionRanges('vers:pypi/1|3')
+    assert [version_ranges.contains(v) for v in ('0', '1', '2', '3', '4')] == [False, True, False, True, False]
+
+
+def test_contains_below_and_above():
+    version_ranges = VersionRanges('vers:pypi/<=2|>4')
+    assert [version_ranges.contains(v) for v in ('1', '2', '3', '4', '5')] == [True, True, False, False, True]
+
+
+def test_contains_rejects_non_strings():
+    assert 42 not in VersionRanges('vers:pypi/*')
+
+
+def test_contains_invalid_version_ranges():
+    version_ranges = VersionRanges('vers:pypi/')
+    with pytest.raises(ValueError, match='invalid version ranges'):
+        version_ranges.contains('42')
+
+
+def test_contains_empty_version():
+    version_ranges = VersionRanges('vers:pypi/*')
+    with pytest.raises(ValueError, match='non empty'):
+        version_ranges.contains('  ')
+
+
+def test_contains_after_normalize_with_other_range():
+    version_ranges = VersionRanges('vers:pypi/<2')
+    assert '1' in version_ranges
+    version_ranges.normalize('vers:pypi/>2')
+    assert '1' not in version_ranges
+    assert '3' in version_ranges
+
+
+def test_parse_cache_evicts_least_recently_used():
+    cache = ParseCache(maxsize=2)
+    first = cache.get('vers:pypi/1')
+    cache.get('vers:pypi/2')
+    assert cache.get('vers:pypi/1') is first
+    cache.get('vers:pypi/3')
+    assert len(cache) == 2
+    assert cache.get('vers:pypi/1') is first
+    assert cache.stats() == {'hits': 2, 'misses': 3, 'evictions': 1, 'size': 2, 'maxsize': 2}
+
+
+def test_parse_cache_keeps_failures():
+    cache = ParseCache()
+    failed = cache.get('vers:pypi/')
+    assert failed.failed
+    assert cache.get(' vers:pypi/ ') is failed
+    assert cache.stats()['hits'] == 1
+
+
+def test_parse_cache_entries_are_frozen():
+    cache = ParseCache()
+    shared = cache.get('vers:pypi/<2')
+    assert 'empty' in shared.normalize('vers:pypi/>')
+    assert not shared.failed
+    assert shared.normalize() == 'vers:pypi/<2'
+    assert '1' in cache.get('vers:pypi/<2')
+
+
+def test_parse_cache_rejects_non_positive_size():
+    with pytest.raises(ValueError, match='positive'):
+        ParseCache(maxsize=0)
+
+
+def test_contains_many_agrees_with_contains():
+    version_ranges = VersionRanges('vers:pypi/<1.0|>=2.0|!=2.5|<3.0|4.0|>=5.0')
+    versions = [f'{major}.{minor}' for major in range(7) for minor in range(0, 10, 3)] + ['2.5', '0.1', '2.5']
+    assert version_ranges.contains_many(versions) == [version_ranges.contains(v) for v in versions]
+
+
+def test_contains_many_without_versions():
+    assert VersionRanges('vers:pypi/*').contains_many([]) == []
+
+
+def test_contains_many_empty_version():
+    with pytest.raises(ValueError, match='non empty'):
+        VersionRanges('vers:pypi/*').contains_many(['1', ' '])
+
+
+def test_lean_version_ranges_keep_no_model():
+    lean = VersionRanges('vers:golang/>v0|>=v1|v2|<v3|v4|<v5|>=v6', lean=True)
+    assert not hasattr(lean, '__dict__')
+    assert lean._model is None
+    assert lean.version_constraint_pairs == (('v0', '>'), ('v5', '<'), ('v6', '>='))
+    assert lean.version_constraints == ['>v0', '<v5', '>=v6']
+    assert str(lean) == 'vers:golang/>v0|<v5|>=v6'
+    assert lean == VersionRanges('vers:golang/>v0|>=v1|v2|<v3|v4|<v5|>=v6')
+    assert 'v55' in lean
+
+
+def test_lean_model_on_request():
+    lean = VersionRanges('vers:pypi/<44|>42', lean=True)
+    assert lean.model == VersionRanges('vers:pypi/>42|<44').model
+    assert lean._model is None
+
+
+def test_lean_failure_keeps_model():
+    lean = VersionRanges('vers:pypi/|1.2.3|>||||', lean=True)
+    assert lean.failed
+    assert lean.normalize() == 'ERROR:<empty version detected>'
+    with pytest.raises(AttributeError):
+        lean.version_range
+
+
+def test_lean_normalize_other_version_ranges():
+    lean = VersionRanges('vers:pypi/42', lean=True)
+    assert lean.normalize('vers:pypi/<2|>1') == 'vers:pypi/>1|<2'
+    assert lean._model is None
+
+
+VALIDATION_CASES = (
+    ('', ErrorCode.MISSING_URI_SCHEME, 0),
+    ('Vers:pypi/1', ErrorCode.MISSING_URI_SCHEME, 0),
+    ('vers:pypi>42', ErrorCode.MISSING_SLASH, 5),
+    ('vers:/42', ErrorCode.EMPTY_VERSIONING_SCHEME, 5),
+    ('vers:Npm/42', ErrorCode.UPPER_CASE_VERSIONING_SCHEME, 5),
+    ('vers:pypi/    ', ErrorCode.EMPTY_VERSION_CONSTRAINTS, 10),
+    ('vers:pypi/|||', ErrorCode.EMPTY_VERSION_CONSTRAINTS, 10),
+    ('vers:pypi/||*|<=42', ErrorCode.MISPLACED_ASTERISK, 12),
+    ('vers:pypi/|1.2.3|>||||', ErrorCode.EMPTY_VERSION, 17),
+    ('vers:pypi/1%3e2|1>2', ErrorCode.DUPLICATE_VERSION, 16),
+    ('vers:pypi/1|1|>', ErrorCode.EMPTY_VERSION, 14),
+    ('vers:pypi/*', ErrorCode.OK, -1),
+    ('vers:golang/>v0|>=v1|v2|<v3|v4|<v5|>=v6', ErrorCode.OK, -1),
+    ('vers:pypi/=<3|==4|!5|=>6', ErrorCode.OK, -1),
+    ('vers:pypi/1|<=|2', ErrorCode.EMPTY_VERSION, 12),
+    ('vers:pypi/1|!=', ErrorCode.EMPTY_VERSION, 12),
+    ('vers:pypi/*1|2', ErrorCode.MISPLACED_ASTERISK, 10),
+    ('vers:pypi/*1', ErrorCode.OK, -1),
+    ('vers:pypi/a/b', ErrorCode.OK, -1),
+)
+
+
+def test_validate_agrees_with_parse(caplog):
+    for version_range, code, position in VALIDATION_CASES:
+        assert validate(version_range) == (code, position), version_range
+        caplog.clear()
+        error = VersionRanges(version_range).model.get('error', '')
+        assert ERROR_CODES.get(error, ErrorCode.OK) is code, version_range  # type: ignore
+    caplog.clear()
+    for version_range, _, _ in VALIDATION_CASES:
+        validate(version_range)
+    assert not caplog.text
+
+
+def test_tokenizer_agrees_with_parse_phases(caplog):
+    for version_range, code, _ in VALIDATION_CASES:
+        text = ''.join(version_range.split())
+        tokenized, _, _, vc_pairs = _tokenize(text)
+        assert tokenized is code or code is ErrorCode.DUPLICATE_VERSION, version_range
+        model = {'received': text}
+        failed, diagnosed = _diagnose(text, model)
+        assert ERROR_CODES.get(model.get('error', ''), ErrorCode.OK) is code, version_range  # type: ignore
+        if not failed:
+            assert sorted(vc_pairs) == sorted(diagnosed), version_range
+
+
+def test_binary_input():
+    received = b'vers:npm/ >=1.0.0 | <2.0.0 \nvers:npm/2.0.0\n'
+    assert str(VersionRanges(received[:27])) == 'vers:npm/>=1.0.0|<2.0.0'
+    assert str(VersionRanges(bytearray(received[:27]))) == 'vers:npm/>=1.0.0|<2.0.0'
+    assert str(VersionRanges(memoryview(received)[28:])) == 'vers:npm/2.0.0'
+    assert validate(memoryview(received)[28:]) == (ErrorCode.OK, -1)
+    assert VersionRanges('vers:npm/42').normalize(b'vers:npm/|1.2.3|') == 'vers:npm/1.2.3'
+
+
+def test_binary_input_must_be_utf8():
+    version_ranges = VersionRanges(b'vers:npm/\xff')
+    assert version_ranges.failed
+    assert version_ranges.model == {'received': 'vers:npm/', 'error': 'version range must be encoded as utf-8'}
+    assert validate(memoryview(b'vers:npm/1|\xff')) == (ErrorCode.INVALID_ENCODING, 11)
+
+
+def test_parse_only_pipes():
+    version_ranges = VersionRanges('vers:pypi/|||')
+    assert 'non empty' in version_ranges.model.get('error', '')
+
+
+def _random_version_ranges(rng, versions):
+    """Random valid version ranges over some of the versions with random comparators."""
+    picked = rng.sample(versions, rng.randint(1, 6))
+    constraints = [f'{rng.choice(("", "!=", "<", "<=", ">", ">="))}{version}' for version in picked]
+    return VersionRanges('vers:pypi/' + '|'.join(constraints))
+
+
+SET_OPERATIONS = (
+    (operator.or_, lambda left, right: left or right),
+    (operator.and_, lambda left, right: left and right),
+    (operator.sub, lambda left, right: left and not right),
+)
+
+
+@pytest.mark.parametrize('combine, expected', SET_OPERATIONS)
+def test_set_operations_agree_with_membership(combine, expected):
+    import random
+
+    rng = random.Random(42)
+    versions = [str(number) for number in range(1, 10)]
+    probes = [f'{number / 2:.1f}' for number in range(21)]
+    for _ in range(500):
+        left, right = _random_version_ranges(rng, versions), _random_version_ranges(rng, versions)
+        wanted = [expected(left.contains(probe), right.contains(probe)) for probe in probes]
+        if not any(wanted):
+            with pytest.raises(ValueError, match='no vers representation'):
+                combine(left, right)
+            continue
+        result = combine(left, right)
+        assert result.contains_many(probes) == wanted
+        assert VersionRanges(str(result)) == result
+        assert VersionRanges(str(result)).contains_many(probes) == wanted
+
+
+def test_complement_agrees_with_membership():
+    import random
+
+    rng = random.Random(42)
+    versions = [str(number) for number in range(1, 10)]
+    probes = [f'{number / 2:.1f}' for number in range(21)]
+    for _ in range(500):
+        version_ranges = _random_version_ranges(rng, versions)
+        inverted = ~version_ranges
+        assert inverted.contains_many(probes) == [not inside for inside in version_ranges.contains_many(probes)]
+        assert (~inverted).contains_many(probes) == version_ranges.contains_many(probes)
+        assert ~~inverted == inverted
+
+
+def test_set_operations_with_asterisk():
+    everything = VersionRanges('vers:npm/*')
+    some = VersionRanges('vers:npm/>=1.0.0|<2.0.0')
+    assert everything & some == some
+    assert everything | some == everything
+    assert str(~some | some) == 'vers:npm/*'
+    with pytest.raises(ValueError, match='no vers representation'):
+        ~everything
+
+
+def test_set_operations_keep_lean_mode():
+    union = VersionRanges('vers:pypi/<1', lean=True) | VersionRanges('vers:pypi/>2')
+    assert union.model['version-range'] == 'vers:pypi/<1|>2'
+    assert str(union) == 'vers:pypi/<1|>2'
+
+
+def test_set_operations_require_same_versioning_scheme():
+    with pytest.raises(ValueError, match='versioning schemes npm and pypi'):
+        VersionRanges('vers:npm/1.0.0') | VersionRanges('vers:pypi/1.0')
+
+
+def test_set_operations_reject_invalid_version_ranges():
+    with pytest.raises(ValueError, match='invalid'):
+        VersionRanges('vers:npm/1.0.0') & VersionRanges('vers:npm/')
+    with pytest.raises(ValueError, match='invalid'):
+        ~VersionRanges('vers:npm/')
+
+
+def test_set_operations_with_other_types():
+    with pytest.raises(TypeError):
+        VersionRanges('vers:npm/1.0.0') | 'vers:npm/2.0.0'
@@ -1,9 +1,7 @@
 """Version ranges (Finnish: versioalueet)."""
 
-import datetime as dti
 import logging
 import os
-import pathlib
 from typing import no_type_check
 
 # [[[fill git_describe()]]]
@@ -18,7 +16,7 @@ __all__: list[str] = [
     'APP_ENV',
     'APP_NAME',
     'DEBUG',
-    'DEFAULT_CONFIG_NAME',  # TODO - add capability and harmonize processing
+    'DEFAULT_CONFIG_NAME',  # TODO - harmonize processing
     'ENCODING',
     'ENCODING_ERRORS_POLICY',
     'QUIET',  # TODO - harmonize processing
@@ -28,7 +26,7 @@ __all__: list[str] = [
     'VERSION_INFO',
 ]
 
-APP_ALIAS = str(pathlib.Path(__file__).parent.name)
+APP_ALIAS = os.path.basename(os.path.dirname(os.path.abspath(__file__)))
 APP_ENV = APP_ALIAS.upper()
 APP_NAME = locals()['__doc__']
 DEBUG = bool(os.getenv(f'{APP_ENV}_DEBUG', ''))
@@ -40,10 +38,10 @@ ENCODING_ERRORS_POLICY = 'ignore'
 DEFAULT_CONFIG_NAME = f'.{APP_ALIAS}.json'
 
 DEFAULT_LF_ONLY = 'YES'
-log = logging.getLogger()  # Module level logger is sufficient
-LOG_FOLDER = pathlib.Path('logs')
+log = logging.getLogger(APP_ENV)  # Module level logger is sufficient
+LOG_FOLDER = 'logs'
 LOG_FILE = f'{APP_ALIAS}.log'
-LOG_PATH = pathlib.Path(LOG_FOLDER, LOG_FILE) if LOG_FOLDER.is_dir() else pathlib.Path(LOG_FILE)
+LOG_PATH = os.path.join(LOG_FOLDER, LOG_FILE) if os.path.isdir(LOG_FOLDER) else LOG_FILE
 LOG_LEVEL = logging.INFO
 
 TS_FORMAT_LOG = '%Y-%m-%dT%H:%M:%S'
@@ -56,24 +54,27 @@ VERSION_INFO = __version_info__
 @no_type_check
 def formatTime_RFC3339(self, record, datefmt=None):  # noqa
     """HACK A DID ACK we could inject .astimezone() to localize ..."""
+    import datetime as dti
+
     return dti.datetime.fromtimestamp(record.created, dti.timezone.utc).isoformat()  # pragma: no cover
 
 
+class RFC3339Formatter(logging.Formatter):
+    """Format the timestamps of our log records per RFC3339 (without patching all formatters)."""
+
+    formatTime = formatTime_RFC3339
+
+
 @no_type_check
 def init_logger(name=None, level=None):
-    """Initialize module level logger"""
+    """Initialize module level logger (only if the root logger has no handlers yet).
+
+    Importing the package does not configure logging, the CLI calls this function instead.
+    """
     global log  # pylint: disable=global-statement
 
-    log_format = {
-        'format': '%(asctime)s %(levelname)s [%(name)s]: %(message)s',
-        'datefmt': TS_FORMAT_LOG,
-        # 'filename': LOG_PATH,
-        'level': LOG_LEVEL if level is None else level,
-    }
-    logging.Formatter.formatTime = formatTime_RFC3339
-    logging.basicConfig(**log_format)
+    handler = logging.StreamHandler()
+    handler.setFormatter(RFC3339Formatter('%(asctime)s %(levelname)s [%(name)s]: %(message)s', TS_FORMAT_LOG))
+    logging.basicConfig(level=LOG_LEVEL if level is None else level, handlers=[handler])
     log = logging.getLogger(APP_ENV if name is None else name)
     log.propagate = True
-
-
-init_logger(name=APP_ENV, level=logging.DEBUG if DEBUG else None)
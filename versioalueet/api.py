@@ -6,12 +6,32 @@ Use case example:
 >>> assert version_ranges.normalize() == 'vers:pypi/1.2.3'
 """
 
-import argparse
-from typing import Union
-from urllib.parse import unquote
-
-import versioalueet.env as env
-from versioalueet import log
+import enum
+from bisect import bisect_left
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Callable, Union
+
+from versioalueet import ENCODING, ENCODING_ERRORS_POLICY, log
+from versioalueet.phases import (
+    MODEL,
+    OPTIMIZE,
+    PAIRS,
+    PHASE_STATS,
+    SORT,
+    SPLIT,
+    TOKENIZE,
+    URI_SCHEME,
+    VERSIONING_SCHEME,
+    PhaseStats,
+)
+from versioalueet.schemes import (
+    GENERIC,
+    KeyFunctionType,
+    RankTable,
+    VersionKeyType,
+    generic_key,
+    rank_table,
+)
 
 ASTERISK = '*'
 COLON = ':'
@@ -28,7 +48,57 @@ LT = '<'
 LE = LT + EQ
 
 VCPairsType = list[tuple[str, str]]
+VCPairsTupleType = tuple[tuple[str, str], ...]
 ModelType = dict[str, Union[str, list[str], VCPairsType]]
+IntervalTableType = tuple[list[VersionKeyType], list[bool]]
+VersionRangeInputType = Union[str, bytes, bytearray, memoryview]
+
+if TYPE_CHECKING:
+    import argparse
+
+    from versioalueet.store import DiskCache
+
+
+class ErrorCode(enum.Enum):
+    """Enumerated reasons for rejecting version ranges."""
+
+    OK = 'ok'
+    MISSING_URI_SCHEME = 'missing-uri-scheme'
+    MISSING_SLASH = 'missing-slash'
+    EMPTY_VERSIONING_SCHEME = 'empty-versioning-scheme'
+    UPPER_CASE_VERSIONING_SCHEME = 'upper-case-versioning-scheme'
+    EMPTY_VERSION_CONSTRAINTS = 'empty-version-constraints'
+    MISPLACED_ASTERISK = 'misplaced-asterisk'
+    EMPTY_VERSION = 'empty-version'
+    DUPLICATE_VERSION = 'duplicate-version'
+    INVALID_ENCODING = 'invalid-encoding'
+
+
+ERROR_MESSAGES = {
+    ErrorCode.MISSING_URI_SCHEME: 'version range must start with the URI scheme vers',
+    ErrorCode.MISSING_SLASH: 'version range must provide <versioning-scheme> followed by a slash (/)',
+    ErrorCode.EMPTY_VERSIONING_SCHEME: 'version system must be non empty',
+    ErrorCode.UPPER_CASE_VERSIONING_SCHEME: 'version system must be lower case',
+    ErrorCode.EMPTY_VERSION_CONSTRAINTS: 'version constraints must be non empty',
+    ErrorCode.MISPLACED_ASTERISK: 'if present, asterisk (%s) must be the only version constraint' % (ASTERISK,),
+    ErrorCode.EMPTY_VERSION: 'empty version detected',
+    ErrorCode.DUPLICATE_VERSION: 'versions must be unique across all version constraints',
+    ErrorCode.INVALID_ENCODING: 'version range must be encoded as %s' % (ENCODING,),
+}
+ERROR_CODES = {message: code for code, message in ERROR_MESSAGES.items()}
+
+
+def unquote(version: str) -> str:
+    """Percent-decode the version importing the URL parsing machinery only when needed.
+
+    Usage examples:
+
+    >>> unquote('1%3E2')
+    '1>2'
+    """
+    from urllib.parse import unquote as url_unquote
+
+    return url_unquote(version)
 
 
 def fail(message: str, model: Union[ModelType, None] = None, debug: bool = False) -> bool:
@@ -59,7 +129,7 @@ def _parse_uri_scheme(version_range: str, model: ModelType) -> tuple[bool, str]:
     (True, '')
     """
     if not version_range.startswith(f'vers{COLON}'):
-        model['error'] = 'version range must start with the URI scheme vers'
+        model['error'] = ERROR_MESSAGES[ErrorCode.MISSING_URI_SCHEME]
         return fail(message=model['error'], model=model), ''  # type: ignore
 
     model['uri-scheme'] = 'vers'
@@ -80,22 +150,22 @@ def _parse_version_scheme(scheme_and_vcs: str, model: ModelType) -> tuple[bool,
     (True, '')
     """
     if SLASH not in scheme_and_vcs:
-        model['error'] = 'version range must provide <versioning-scheme> followed by a slash (/)'
+        model['error'] = ERROR_MESSAGES[ErrorCode.MISSING_SLASH]
         return fail(message=model['error'], model=model), ''  # type: ignore
 
     versioning_scheme, vc_string = scheme_and_vcs.split(SLASH, 1)
     model['versioning-scheme'] = versioning_scheme
 
     if not versioning_scheme:
-        model['error'] = 'version system must be non empty'
+        model['error'] = ERROR_MESSAGES[ErrorCode.EMPTY_VERSIONING_SCHEME]
         return fail(message=model['error'], model=model), ''  # type: ignore
 
     if not versioning_scheme.lower() == versioning_scheme:
-        model['error'] = 'version system must be lower case'
+        model['error'] = ERROR_MESSAGES[ErrorCode.UPPER_CASE_VERSIONING_SCHEME]
         return fail(message=model['error'], model=model), ''  # type: ignore
 
     if not vc_string:
-        model['error'] = 'version constraints must be non empty'
+        model['error'] = ERROR_MESSAGES[ErrorCode.EMPTY_VERSION_CONSTRAINTS]
         return fail(message=model['error'], model=model), ''  # type: ignore
 
     return False, vc_string
@@ -114,16 +184,23 @@ def _split_version_constraints(vc_string: str, model: ModelType) -> tuple[bool,
 
     >>> _split_version_constraints('|1|2|3|=4||>=6', {})
     (False, ['1', '2', '3', '=4', '>=6'])
+
+    >>> _split_version_constraints('|||', {})
+    (True, [])
     """
     if PIPE in vc_string:
         vc_unframed = vc_string.strip(PIPE)
         if vc_unframed.startswith(ASTERISK):
             version_constraints = [ASTERISK]
             if vc_unframed != ASTERISK:
-                model['error'] = 'if present, asterisk (%s) must be the only version constraint' % (ASTERISK,)
+                model['error'] = ERROR_MESSAGES[ErrorCode.MISPLACED_ASTERISK]
                 return fail(message=model['error'], model=model), []  # type: ignore
 
     version_constraints = [vc for vc in vc_string.split(PIPE) if vc]
+    if not version_constraints:
+        model['error'] = ERROR_MESSAGES[ErrorCode.EMPTY_VERSION_CONSTRAINTS]
+        return fail(message=model['error'], model=model), []  # type: ignore
+
     return False, version_constraints
 
 
@@ -133,12 +210,22 @@ def _parse_version_constraint_pairs(version_constraints: list[str], model: Model
     Implementer notes:
 
     - the version constraints items contain no spaces and no pipes
+    - the pairs are sorted per the versioning scheme in the model (the sort key is computed once per version)
+    - versions with equal sort keys (like 1.0 and 1.0.0 for pypi) are not unique
 
     Usage examples:
 
     >>> _parse_version_constraint_pairs(['1', '3', '=4', '2', '>=6'], model={})
     (False, [('1', '='), ('2', '='), ('3', '='), ('4', '='), ('6', '>=')])
 
+    >>> _parse_version_constraint_pairs(['9.0', '10.0', '9.0rc1'], model={'versioning-scheme': 'pypi'})
+    (False, [('9.0rc1', '='), ('9.0', '='), ('10.0', '=')])
+
+    >>> model = {'versioning-scheme': 'pypi'}
+    >>> _parse_version_constraint_pairs(['1.0', '1.0.0'], model=model)
+    (True, [])
+    >>> assert 'unique' in model.get('error', '')
+
     >>> model = {}
     >>> _parse_version_constraint_pairs(['1', '', '2'], model=model)
     (True, [])
@@ -163,7 +250,7 @@ def _parse_version_constraint_pairs(version_constraints: list[str], model: Model
             comparator, version = EQ, cv
 
         if not version:
-            model['error'] = 'empty version detected'
+            model['error'] = ERROR_MESSAGES[ErrorCode.EMPTY_VERSION]
             return fail(message=model['error'], model=model), []  # type: ignore
 
         if PERCENT in version:
@@ -171,21 +258,89 @@ def _parse_version_constraint_pairs(version_constraints: list[str], model: Model
 
         vc_pairs.append((version, comparator))
 
-    vc_pairs.sort()
-    model['version-constraint-pairs'] = vc_pairs
+    return _sort_version_constraint_pairs(vc_pairs, model)
+
 
-    versions = [version for version, _ in vc_pairs]
+def _diagnose(
+    version_range: str, model: ModelType, phase_stats: Union[PhaseStats, None] = None, started: int = 0
+) -> tuple[bool, VCPairsType]:
+    """Run the parse phases one by one to build the diagnostic model (and log) for an invalid version range.
 
-    if sorted(list(set(versions))) != versions:
-        model['error'] = 'versions must be unique across all version constraints'
+    The phases are recorded in the phase statistics (if given) starting at the clock reading started.
+
+    Usage examples:
+
+    >>> model = {'received': 'vers:pypi/'}
+    >>> _diagnose('vers:pypi/', model)
+    (True, [])
+    >>> model['error']
+    'version constraints must be non empty'
+    """
+    failed, scheme_and_vcs = _parse_uri_scheme(version_range, model)
+    if phase_stats is not None:
+        started = phase_stats.record(URI_SCHEME, started, failed)
+    if failed:
+        return failed, []
+
+    failed, vc_string = _parse_version_scheme(scheme_and_vcs, model)
+    if phase_stats is not None:
+        started = phase_stats.record(VERSIONING_SCHEME, started, failed)
+    if failed:
+        return failed, []
+
+    failed, version_constraints = _split_version_constraints(vc_string, model)
+    if phase_stats is not None:
+        started = phase_stats.record(SPLIT, started, failed)
+    if failed:
+        return failed, []
+
+    if phase_stats is None:
+        return _parse_version_constraint_pairs(version_constraints, model)
+    failed, vc_pairs = _parse_version_constraint_pairs(version_constraints, model)
+    phase_stats.record(PAIRS, started, failed)
+    return failed, vc_pairs
+
+
+def _sort_version_constraint_pairs(vc_pairs: VCPairsType, model: ModelType) -> tuple[bool, VCPairsType]:
+    """Sort the pairs per the versioning scheme of the model (one sort key per version) and check their uniqueness.
+
+    Usage examples:
+
+    >>> _sort_version_constraint_pairs([('10', '<'), ('9', '>')], model={})
+    (False, [('9', '>'), ('10', '<')])
+    """
+    key = rank_table(model.get('versioning-scheme', GENERIC)).key  # type: ignore
+    keyed = sorted((key(version), version, comparator) for version, comparator in vc_pairs)
+    vc_pairs = [(version, comparator) for _, version, comparator in keyed]
+    model['version-constraint-pairs'] = vc_pairs
+
+    if any(keyed[slot][0] == keyed[slot + 1][0] for slot in range(len(keyed) - 1)):
+        model['error'] = ERROR_MESSAGES[ErrorCode.DUPLICATE_VERSION]
         return fail(message=model['error'], model=model), []  # type: ignore
 
     return False, vc_pairs
 
 
+_EMIT = {
+    (False, True, False): EQ,
+    (False, False, True): GT,
+    (False, True, True): GE,
+    (True, False, False): LT,
+    (True, True, False): LE,
+    (True, False, True): NE,
+}
+
+
 def _squeeze_ranges(vc_pairs_to_squeeze: VCPairsType) -> VCPairsType:
     """Squeeze any redundant version constraint pair occurrences.
 
+    Implementer notes:
+
+    - the pairs are sorted and contain no not equal constraints
+    - a run of lower bounds keeps the lowest, a run of upper bounds keeps the highest, and equal constraints next to
+      such runs are absorbed
+    - single pass with one pair look ahead that does not change the pairs to squeeze
+
     Examples:
 
     >>> to_squeeze = [('v0', GT), ('v1', GE), ('v2', EQ), ('v3', LT), ('v4', EQ), ('v5', LT), ('v6', GT)]
@@ -194,32 +349,26 @@ def _squeeze_ranges(vc_pairs_to_squeeze: VCPairsType) -> VCPairsType:
     [('v0', '>'), ('v5', '<'), ('v6', '>')]
     """
     collector: VCPairsType = []
-    ignore_slot = -1
+    skip_next = False
     prev_cmp = 'irrelevant'
-    vc_pairs_to_squeeze.append(vc_pairs_to_squeeze[-1])
-    for in_slot, (curr_ver, curr_cmp) in enumerate(vc_pairs_to_squeeze[:-1]):
-        next_slot = in_slot + 1
-        if ignore_slot == in_slot:
+    look_ahead = vc_pairs_to_squeeze[1:] + vc_pairs_to_squeeze[-1:]
+    for in_slot, ((curr_ver, curr_cmp), (next_ver, next_cmp)) in enumerate(zip(vc_pairs_to_squeeze, look_ahead)):
+        if skip_next:
+            skip_next = False
             continue
 
-        next_ver, next_cmp = vc_pairs_to_squeeze[next_slot]
         if curr_cmp in (GE, GT) and next_cmp in (EQ, GE, GT):
-            sel_ver, sel_cmp, ignore_slot = curr_ver, curr_cmp, next_slot
+            sel_ver, sel_cmp, skip_next = curr_ver, curr_cmp, True
         elif curr_cmp in (LT, LE, EQ) and next_cmp in (LE, LT):
-            sel_ver, sel_cmp, ignore_slot = next_ver, next_cmp, in_slot
+            sel_ver, sel_cmp = next_ver, next_cmp
         else:
             sel_ver, sel_cmp = curr_ver, curr_cmp
 
-        if not in_slot:
-            collector.append((sel_ver, sel_cmp))
-            prev_cmp = sel_cmp
-            continue
-
-        if prev_cmp in (GE, GT) and sel_cmp in (EQ, GE, GT):
-            continue
-
-        if prev_cmp in (LT, LE, EQ) and sel_cmp in (LE, LT) and collector:
-            collector.pop()
+        if in_slot:
+            if prev_cmp in (GE, GT) and sel_cmp in (EQ, GE, GT):
+                continue
+            if prev_cmp in (LT, LE, EQ) and sel_cmp in (LE, LT):
+                collector.pop()
 
         collector.append((sel_ver, sel_cmp))
         prev_cmp = sel_cmp
@@ -230,6 +379,12 @@ def _squeeze_ranges(vc_pairs_to_squeeze: VCPairsType) -> VCPairsType:
 def _optimize_version_constraints(vc_pairs: VCPairsType, model: ModelType) -> VCPairsType:
     """Validate and optimize the version constraints parsed from string.
 
+    Implementer notes:
+
+    - the pairs are sorted with unique versions, so the canonicalization is linear and needs no further sort
+    - after squeezing the runs of bounds every pair gets the comparator its surroundings require (if any)
+    - not equal constraints outside of the included intervals and other constraints without effect are dropped
+
     Examples:
 
     >>> received = 'vers:golang/>v0|>=v1|v2|<v3|v4|<v5|>=v6'
@@ -237,6 +392,9 @@ def _optimize_version_constraints(vc_pairs: VCPairsType, model: ModelType) -> VC
     >>> pairs = _optimize_version_constraints(vc_pairs=split_up, model={})
     >>> pairs
     [('v0', '>'), ('v5', '<'), ('v6', '>')]
+
+    >>> _optimize_version_constraints([('1', LT), ('3', NE), ('5', GE), ('7', NE)], model={})
+    [('1', '<'), ('5', '>='), ('7', '!=')]
     """
     vc_unequal_pairs: VCPairsType = [(v, c) for v, c in vc_pairs if c == NE]
     vc_other_pairs: VCPairsType = [(v, c) for v, c in vc_pairs if c != NE]
@@ -247,17 +405,371 @@ def _optimize_version_constraints(vc_pairs: VCPairsType, model: ModelType) -> VC
     if len(vc_pairs) == 1:
         return vc_pairs
 
-    if len(vc_other_pairs) < 2:
-        return vc_pairs
+    squeezed = _squeeze_ranges(vc_other_pairs) if len(vc_other_pairs) > 1 else vc_other_pairs
+    if vc_unequal_pairs:
+        kept = set(squeezed)
+        squeezed = [(v, c) for v, c in vc_pairs if c == NE or (v, c) in kept]
+
+    ranged = next((c for _, c in squeezed if c not in (EQ, NE)), '')
+    inside = ranged in (LT, LE) if ranged else not vc_other_pairs
+    vc_pairs = []
+    for version, comparator in squeezed:
+        if comparator == NE:
+            if inside:
+                vc_pairs.append((version, NE))
+        elif comparator == EQ:
+            if not inside:
+                vc_pairs.append((version, EQ))
+        elif comparator == GE:
+            if not inside:
+                vc_pairs.append((version, GE))
+                inside = True
+        elif comparator == GT:
+            vc_pairs.append((version, NE if inside else GT))
+            inside = True
+        elif comparator == LT:
+            if inside:
+                vc_pairs.append((version, LT))
+                inside = False
+        else:
+            vc_pairs.append((version, LE if inside else EQ))
+            inside = False
 
-    vc_pairs = list(set(_squeeze_ranges(vc_other_pairs)))
-    vc_pairs.extend(vc_unequal_pairs)
-    vc_pairs.sort()
     model['version-constraint-pairs'] = vc_pairs
 
     return vc_pairs
 
 
+def _compile_intervals(vc_pairs: VCPairsType, key: KeyFunctionType = generic_key) -> IntervalTableType:
+    """Compile the sorted and optimized version constraint pairs into a table for bisection.
+
+    Implementer notes:
+
+    - the table holds the sort keys of the n boundary versions and 2n + 1 membership flags
+    - flag 2i + 1 belongs to the boundary version i itself
+    - flag 2i belongs to the stretch below boundary version i and flag 2n to the stretch above the last one
+    - not equal constraints only punch holes, so ranges made of such constraints alone include all other versions
+
+    Usage examples:
+
+    >>> _compile_intervals([('1', GE), ('3', NE), ('5', LT)])[1]
+    [False, True, True, False, True, False, False]
+
+    >>> _compile_intervals([('*', EQ)])
+    ([], [True])
+    """
+    if vc_pairs == [(ASTERISK, EQ)]:
+        return [], [True]
+
+    bounds = [key(version) for version, _ in vc_pairs]
+    ranged = [comparator for _, comparator in vc_pairs if comparator not in (EQ, NE)]
+    inside = ranged[0] in (LT, LE) if ranged else all(comparator == NE for _, comparator in vc_pairs)
+    members = [inside]
+    for _, comparator in vc_pairs:
+        members.append(comparator in (EQ, LE, GE))
+        if comparator in (GT, GE):
+            inside = True
+        elif comparator in (LT, LE):
+            inside = False
+        members.append(inside)
+
+    return bounds, members
+
+
+def _lookup(intervals: IntervalTableType, version_key: VersionKeyType) -> bool:
+    """Bisect the compiled intervals for the sort key of a version and return the membership.
+
+    Usage examples:
+
+    >>> intervals = _compile_intervals([('1', GE), ('3', NE), ('5', LT)])
+    >>> [_lookup(intervals, generic_key(version)) for version in ('0', '1', '2', '3', '4', '5', '6')]
+    [False, True, True, False, True, False, False]
+    """
+    bounds, members = intervals
+    slot = bisect_left(bounds, version_key)
+    if slot < len(bounds) and bounds[slot] == version_key:
+        return members[2 * slot + 1]
+    return members[2 * slot]
+
+
+def _sweep(intervals: IntervalTableType, version_keys: list[VersionKeyType]) -> list[bool]:
+    """Sort the sort keys of many versions once and sweep them through the compiled intervals in one pass.
+
+    Implementer notes:
+
+    - the cost is O(m log m + n) for m versions and n boundaries
+    - the memberships are returned in the order of the given keys
+
+    Usage examples:
+
+    >>> intervals = _compile_intervals([('1', GE), ('3', NE), ('5', LT)])
+    >>> _sweep(intervals, [generic_key(version) for version in ('6', '3', '0', '4', '1', '5', '2')])
+    [False, False, False, True, True, False, True]
+    """
+    bounds, members = intervals
+    count = len(bounds)
+    verdicts = [False] * len(version_keys)
+    slot = 0
+    for index in sorted(range(len(version_keys)), key=version_keys.__getitem__):
+        version_key = version_keys[index]
+        while slot < count and bounds[slot] < version_key:
+            slot += 1
+        if slot < count and bounds[slot] == version_key:
+            verdicts[index] = members[2 * slot + 1]
+        else:
+            verdicts[index] = members[2 * slot]
+    return verdicts
+
+
+def _merge_intervals(
+    left: IntervalTableType,
+    left_versions: list[str],
+    right: IntervalTableType,
+    right_versions: list[str],
+    operation: Callable[[bool, bool], bool],
+) -> tuple[list[str], IntervalTableType]:
+    """Merge two compiled interval tables of one versioning scheme in a single pass applying the operation per region.
+
+    Implementer notes:
+
+    - the cost is O(n + m) for n and m boundaries as both tables are already sorted
+    - a boundary of one table lies inside a stretch of the other table, which hence provides the flags
+    - for boundaries with equal sort keys the version string of the left table is kept
+
+    Usage examples:
+
+    >>> left = _compile_intervals([('1', GE), ('5', LT)])
+    >>> right = _compile_intervals([('3', GE), ('7', LT)])
+    >>> versions, (_, members) = _merge_intervals(left, ['1', '5'], right, ['3', '7'], bool.__and__)
+    >>> versions, members
+    (['1', '3', '5', '7'], [False, False, False, True, True, False, False, False, False])
+    """
+    (left_bounds, left_members), (right_bounds, right_members) = left, right
+    left_count, right_count = len(left_bounds), len(right_bounds)
+    left_inside, right_inside = left_members[0], right_members[0]
+    versions: list[str] = []
+    bounds: list[VersionKeyType] = []
+    members = [operation(left_inside, right_inside)]
+    i = j = 0
+    while i < left_count or j < right_count:
+        if j == right_count or (i < left_count and left_bounds[i] < right_bounds[j]):
+            version, bound = left_versions[i], left_bounds[i]
+            left_at, left_inside = left_members[2 * i + 1], left_members[2 * i + 2]
+            right_at = right_inside
+            i += 1
+        elif i == left_count or right_bounds[j] < left_bounds[i]:
+            version, bound = right_versions[j], right_bounds[j]
+            right_at, right_inside = right_members[2 * j + 1], right_members[2 * j + 2]
+            left_at = left_inside
+            j += 1
+        else:
+            version, bound = left_versions[i], left_bounds[i]
+            left_at, left_inside = left_members[2 * i + 1], left_members[2 * i + 2]
+            right_at, right_inside = right_members[2 * j + 1], right_members[2 * j + 2]
+            i += 1
+            j += 1
+        versions.append(version)
+        bounds.append(bound)
+        members.append(operation(left_at, right_at))
+        members.append(operation(left_inside, right_inside))
+
+    return versions, (bounds, members)
+
+
+def _emit_version_constraints(
+    versions: list[str], intervals: IntervalTableType
+) -> tuple[VCPairsType, IntervalTableType]:
+    """Emit the canonical version constraint pairs of an interval table and the table reduced to the kept boundaries.
+
+    Implementer notes:
+
+    - the flags below, at, and above a boundary determine its comparator and boundaries without change are dropped
+    - the comparators emitted alternate between lower and upper bounds, so they are already optimized
+    - a table including all versions is the asterisk and a table including no version has no vers representation
+
+    Usage examples:
+
+    >>> intervals = ([generic_key(v) for v in '1357'], [False, False, False, True, True, False, False, False, False])
+    >>> _emit_version_constraints(list('1357'), intervals)[0]
+    [('3', '>='), ('5', '<')]
+
+    >>> _emit_version_constraints([], ([], [False]))
+    Traceback (most recent call last):
+      ...
+    ValueError: version ranges including no version have no vers representation
+    """
+    bounds, members = intervals
+    vc_pairs: VCPairsType = []
+    kept_bounds: list[VersionKeyType] = []
+    kept_members = [members[0]]
+    for slot, (version, bound) in enumerate(zip(versions, bounds)):
+        comparator = _EMIT.get((members[2 * slot], members[2 * slot + 1], members[2 * slot + 2]))
+        if comparator is None:
+            continue
+        vc_pairs.append((version, comparator))
+        kept_bounds.append(bound)
+        kept_members.extend(members[2 * slot + 1 : 2 * slot + 3])
+
+    if not vc_pairs:
+        if not kept_members[0]:
+            raise ValueError('version ranges including no version have no vers representation')
+        vc_pairs.append((ASTERISK, EQ))
+
+    return vc_pairs, (kept_bounds, kept_members)
+
+
+_PAIR_COMPARATORS = frozenset((GE, LE, NE))
+_SINGLE_COMPARATORS = frozenset((LT, GT, EQ))
+
+
+def _text(version_range: VersionRangeInputType) -> str:
+    """Decode binary input (without copying memoryview slices first) and remove all whitespace.
+
+    Usage examples:
+
+    >>> _text(memoryview(b'vers:npm/ >=1.0.0 | <2.0.0 ')[:19])
+    'vers:npm/>=1.0.0|'
+    """
+    if not isinstance(version_range, str):
+        version_range = str(version_range, ENCODING)
+    return ''.join(version_range.split())
+
+
+def _tokenize(text: str) -> tuple[ErrorCode, int, str, VCPairsType]:
+    """Split the whitespace free version range into versioning scheme and version constraint pairs in one scan.
+
+    Implementer notes:
+
+    - the rules and their order are the same as for the parse phases, but nothing is logged and no model is built
+    - one split at the pipes with a look at the first two characters per constraint detects the comparators
+    - the pairs are percent-decoded and in input order
+    - on failure the error code comes with the offset of the problem, otherwise the position is minus one
+
+    Usage examples:
+
+    >>> _tokenize('vers:pypi/|>=1.0|<2%2E0||')
+    (<ErrorCode.OK: 'ok'>, -1, 'pypi', [('1.0', '>='), ('2.0', '<')])
+
+    >>> _tokenize('vers:pypi/1.0|<|3.0')
+    (<ErrorCode.EMPTY_VERSION: 'empty-version'>, 14, 'pypi', [])
+    """
+    if not text.startswith(f'vers{COLON}'):
+        return ErrorCode.MISSING_URI_SCHEME, 0, '', []
+
+    slash = text.find(SLASH, 5)
+    if slash < 0:
+        return ErrorCode.MISSING_SLASH, 5, '', []
+
+    versioning_scheme = text[5:slash]
+    if not versioning_scheme:
+        return ErrorCode.EMPTY_VERSIONING_SCHEME, 5, versioning_scheme, []
+
+    if versioning_scheme.lower() != versioning_scheme:
+        return ErrorCode.UPPER_CASE_VERSIONING_SCHEME, 5, versioning_scheme, []
+
+    start = slash + 1
+    if start == len(text):
+        return ErrorCode.EMPTY_VERSION_CONSTRAINTS, start, versioning_scheme, []
+
+    if text.find(PIPE, start) >= 0:
+        first = start
+        while text.startswith(PIPE, first):
+            first += 1
+        if text.startswith(ASTERISK, first) and text[first:].rstrip(PIPE) != ASTERISK:
+            return ErrorCode.MISPLACED_ASTERISK, first, versioning_scheme, []
+
+    vc_pairs: VCPairsType = []
+    for constraint in text[start:].split(PIPE):
+        if not constraint:
+            continue
+        comparator = constraint[:2]
+        if comparator in _PAIR_COMPARATORS:
+            version = constraint[2:]
+        elif constraint[0] in _SINGLE_COMPARATORS:
+            comparator, version = constraint[0], constraint[1:]
+        else:
+            comparator, version = EQ, constraint
+        if not version:
+            return ErrorCode.EMPTY_VERSION, _position(text, len(vc_pairs)), versioning_scheme, []
+        vc_pairs.append((unquote(version) if PERCENT in version else version, comparator))
+
+    if not vc_pairs:
+        return ErrorCode.EMPTY_VERSION_CONSTRAINTS, start, versioning_scheme, []
+
+    return ErrorCode.OK, -1, versioning_scheme, vc_pairs
+
+
+def _position(text: str, index: int) -> int:
+    """Locate the start of the version constraint with the index (counting only non empty constraints).
+
+    Usage examples:
+
+    >>> _position('vers:pypi/||1|>=2||3', 2)
+    19
+    """
+    position = text.find(SLASH) + 1
+    for constraint in text[position:].split(PIPE):
+        if constraint:
+            if not index:
+                return position
+            index -= 1
+        position += len(constraint) + 1
+    return -1
+
+
+def validate(version_range: VersionRangeInputType) -> tuple[ErrorCode, int]:
+    """Validate the version range without logging and return the error code with the position of the problem.
+
+    Implementer notes:
+
+    - the rules and their order are the same as for parsing but no model is built
+    - the position is the offset into the whitespace free version range (minus one if valid)
+    - for problems with a version constraint the position is where that constraint starts
+    - while enabled, the phase statistics record the rejections only (under tokenize, or sort for duplicates),
+      so version ranges validated before parsing are not counted twice
+
+    Usage examples:
+
+    >>> validate('vers:pypi/>=1.0|<2.0')
+    (<ErrorCode.OK: 'ok'>, -1)
+
+    >>> validate('vers:pypi/1.0|<2.0|>|3.0')
+    (<ErrorCode.EMPTY_VERSION: 'empty-version'>, 19)
+
+    >>> validate(b'vers:pypi/1.0|<2.0|>=1.0.0')
+    (<ErrorCode.DUPLICATE_VERSION: 'duplicate-version'>, 19)
+
+    >>> validate(b'vers:generic/ caf\\xe9')
+    (<ErrorCode.INVALID_ENCODING: 'invalid-encoding'>, 16)
+    """
+    phase_stats = PHASE_STATS if PHASE_STATS.enabled else None
+    started = phase_stats.start() if phase_stats is not None else 0
+    try:
+        text = _text(version_range)
+    except UnicodeDecodeError as error:
+        if phase_stats is not None:
+            phase_stats.record(TOKENIZE, started, rejected=True)
+        return ErrorCode.INVALID_ENCODING, len(_text(error.object[: error.start]))
+    code, position, versioning_scheme, vc_pairs = _tokenize(text)
+    if code is not ErrorCode.OK:
+        if phase_stats is not None:
+            phase_stats.record(TOKENIZE, started, rejected=True)
+        return code, position
+
+    started = phase_stats.start() if phase_stats is not None else 0
+    key = rank_table(versioning_scheme).key
+    seen = set()
+    for index, (version, _) in enumerate(vc_pairs):
+        version_key = key(version)
+        if version_key in seen:
+            if phase_stats is not None:
+                phase_stats.record(SORT, started, rejected=True)
+            return ErrorCode.DUPLICATE_VERSION, _position(text, index)
+        seen.add(version_key)
+
+    return ErrorCode.OK, -1
+
+
 class VersionRanges:
     """Provide operations on version ranges.
 
@@ -270,9 +782,31 @@ class VersionRanges:
         >>> version_ranges = VersionRanges(f'vers:pypi/{triplicated}')
         >>> assert 'unique' in version_ranges.model.get('error', '')
 
+    In lean mode only the versioning scheme and the tuple of version constraint pairs are kept,
+    and the diagnostic model of valid version ranges is built only on request:
+
+        >>> lean = VersionRanges('vers:pypi/<44|>42', lean=True)
+        >>> lean.versioning_scheme, lean.version_constraint_pairs
+        ('pypi', (('42', '>'), ('44', '<')))
+        >>> lean.model['version-range']
+        'vers:pypi/>42|<44'
     """
 
-    def __init__(self, version_range: str) -> None:
+    __slots__ = (
+        'failed',
+        'versioning_scheme',
+        'version_constraint_pairs',
+        '_model',
+        '_intervals',
+        '_ranks',
+        '_frozen',
+        '_lean',
+    )
+
+    _intervals: Union[IntervalTableType, None]
+    _ranks: Union[tuple[int, tuple[list[int], list[bool]]], None]
+
+    def __init__(self, version_range: VersionRangeInputType, lean: bool = False) -> None:
         """Later alligator.
 
         Usage examples:
@@ -281,9 +815,49 @@ class VersionRanges:
         >>> version_ranges = VersionRanges(hidden_emopty_version)
         >>> assert 'empty version detected' in version_ranges.model.get('error', '')
         """
-        self.failed, self.model = self.parse(''.join(version_range.split()))
-
-    def normalize(self, version_range: Union[str, None] = None) -> str:
+        self._frozen = False
+        self._lean = lean
+        self._load(version_range)
+
+    def _load(self, version_range: VersionRangeInputType) -> None:
+        """Parse the decoded whitespace free version range keeping the model only if not lean or failed."""
+        try:
+            text = _text(version_range)
+        except UnicodeDecodeError:
+            self._intervals, self._ranks = None, None
+            message = ERROR_MESSAGES[ErrorCode.INVALID_ENCODING]
+            received = ''.join(str(version_range, ENCODING, ENCODING_ERRORS_POLICY).split())  # type: ignore
+            model: ModelType = {'received': received, 'error': message}
+            self.failed = fail(message)
+        else:
+            self.failed, model = self.parse(text)
+        self._model: Union[ModelType, None] = None if self._lean and not self.failed else model
+
+    @property
+    def model(self) -> ModelType:
+        """The diagnostic model (built from the version range on request in lean mode)."""
+        if self._model is None:
+            return VersionRanges(self.version_range).model
+        return self._model
+
+    @property
+    def version_constraints(self) -> list[str]:
+        """The version constraints as comparator and version strings."""
+        if self.failed:
+            raise AttributeError('invalid version ranges have no version constraints')
+        return [f'{c}{v}' for v, c in self.version_constraint_pairs]
+
+    @property
+    def version_range(self) -> str:
+        """The normalized version range string."""
+        if self.failed:
+            raise AttributeError('invalid version ranges have no normalized version range')
+        if self._model is not None:
+            return self._model['version-range']  # type: ignore
+        vcs_compressed = PIPE.join(f'{c}{v}' if c != EQ else v for v, c in self.version_constraint_pairs)
+        return 'vers' + COLON + self.versioning_scheme + SLASH + vcs_compressed
+
+    def normalize(self, version_range: Union[VersionRangeInputType, None] = None) -> str:
         """Normalize version range.
 
         Usage examples:
@@ -298,12 +872,243 @@ class VersionRanges:
         >>> vr = VersionRanges('vers:abc/42')
         >>> vr.normalize(hidden_emopty_version)
         'ERROR:<empty version detected>'
+
+        Instances shared by a parse cache are frozen and normalize other version ranges without changing:
+
+        >>> shared = ParseCache().get('vers:pypi/42')
+        >>> shared.normalize('vers:pypi/|1.2.3||||')
+        'vers:pypi/1.2.3'
+        >>> shared.normalize()
+        'vers:pypi/42'
         """
         if version_range is not None:
-            self.failed, self.model = self.parse(''.join(version_range.split()))
-        if error := self.model.get('error', ''):
-            return 'ERROR:<' + error + '>'  # type: ignore
-        return self.version_range  # type:ignore
+            if self._frozen:
+                return VersionRanges(version_range, lean=self._lean).normalize()
+            self._load(version_range)
+        if self.failed:
+            return 'ERROR:<' + self.model['error'] + '>'  # type: ignore
+        return self.version_range
+
+    def contains(self, version: str) -> bool:
+        """Assess if the version is included in the version ranges.
+
+        The interval table is compiled once per parsed version range and every lookup is a bisection
+        through the integer ranks of the boundary versions in the rank table of the versioning scheme
+        (versions not ranked in the table bisect the compiled version keys, so probing never relabels the table).
+
+        Usage examples:
+
+        >>> version_ranges = VersionRanges('vers:pypi/>=1|!=3|<5')
+        >>> [version_ranges.contains(version) for version in ('0', '1', '2', '3', '4', '5')]
+        [False, True, True, False, True, False]
+        >>> '4' in version_ranges
+        True
+
+        >>> VersionRanges('vers:pypi/*').contains('42')
+        True
+        """
+        version = version.strip()
+        if not version:
+            raise ValueError('version to assess for inclusion must be non empty')
+        table, intervals = self._ranked()
+        rank = table.get(version)
+        if rank is None:
+            key, compiled = self._compiled()
+            return _lookup(compiled, key(version))
+        return _lookup(intervals, rank)  # type: ignore
+
+    def contains_many(self, versions: list[str]) -> list[bool]:
+        """Assess the inclusion of many versions in a single sorted sweep through the compiled intervals.
+
+        Usage examples:
+
+        >>> version_ranges = VersionRanges('vers:npm/>=1.0.0|<2.0.0')
+        >>> version_ranges.contains_many(['2.0.0', '1.10.0', '0.9.0', '1.2.3'])
+        [False, True, False, True]
+        """
+        stripped = [version.strip() for version in versions]
+        if not all(stripped):
+            raise ValueError('versions to assess for inclusion must be non empty')
+        table, intervals = self._ranked()
+        ranks = [table.get(version) for version in stripped]
+        if None in ranks:
+            key, compiled = self._compiled()
+            return _sweep(compiled, [key(version) for version in stripped])
+        return _sweep(intervals, ranks)  # type: ignore
+
+    def _compiled(self) -> tuple[KeyFunctionType, IntervalTableType]:
+        """Provide the (interning) key function and the interval table compiling the latter once."""
+        if self.failed:
+            raise ValueError(f'cannot assess inclusion for invalid version ranges ({self.model["error"]})')
+        key = rank_table(self.versioning_scheme).key
+        if self._intervals is None:
+            self._intervals = _compile_intervals(list(self.version_constraint_pairs), key)
+        return key, self._intervals
+
+    def _ranked(self) -> tuple[RankTable, tuple[list[int], list[bool]]]:
+        """Provide the rank table and the interval table with the ranks of the boundary versions (renewed as needed).
+
+        Only the boundary versions are ranked, so looking up interned versions afterwards keeps the generation.
+
+        Usage examples:
+
+        >>> version_ranges = VersionRanges('vers:pypi/>=1|!=3|<5')
+        >>> table, (bounds, members) = version_ranges._ranked()
+        >>> table is rank_table('pypi'), bounds == sorted(bounds), members == version_ranges._compiled()[1][1]
+        (True, True, True)
+        """
+        if self._ranks is None:
+            self._compiled()  # refuses invalid version ranges
+        table = rank_table(self.versioning_scheme)
+        if self._ranks is None or self._ranks[0] != table.generation:
+            versions, (_, members) = self._versions()
+            bounds = table.ranks(versions)
+            self._ranks = table.generation, (bounds, members)
+        return table, self._ranks[1]
+
+    def __contains__(self, version: object) -> bool:
+        """Delegate the in operator for version strings to contains."""
+        if not isinstance(version, str):
+            return False
+        return self.contains(version)
+
+    def _versions(self) -> tuple[list[str], IntervalTableType]:
+        """Provide the boundary versions aligned with the compiled interval table (none for the asterisk)."""
+        _, intervals = self._compiled()
+        return [version for version, _ in self.version_constraint_pairs] if intervals[0] else [], intervals
+
+    @classmethod
+    def _from_intervals(
+        cls, versioning_scheme: str, versions: list[str], intervals: IntervalTableType, lean: bool
+    ) -> 'VersionRanges':
+        """Create normalized version ranges from an interval table without parsing (the model is built on request)."""
+        vc_pairs, reduced = _emit_version_constraints(versions, intervals)
+        return cls._from_pairs(versioning_scheme, tuple(vc_pairs), lean, reduced)
+
+    @classmethod
+    def _from_pairs(
+        cls,
+        versioning_scheme: str,
+        vc_pairs: VCPairsTupleType,
+        lean: bool,
+        intervals: Union[IntervalTableType, None] = None,
+    ) -> 'VersionRanges':
+        """Create version ranges from canonical version constraint pairs without parsing (model built on request).
+
+        Usage examples:
+
+        >>> VersionRanges._from_pairs('pypi', (('42', '>'), ('44', '<')), lean=True)
+        VersionRanges('vers:pypi/>42|<44')
+        """
+        version_ranges = cls.__new__(cls)
+        version_ranges.failed = False
+        version_ranges.versioning_scheme = versioning_scheme
+        version_ranges.version_constraint_pairs = vc_pairs
+        version_ranges._model = None
+        version_ranges._intervals = intervals
+        version_ranges._ranks = None
+        version_ranges._frozen = False
+        version_ranges._lean = lean
+        return version_ranges
+
+    def _combine(self, other: 'VersionRanges', operation: Callable[[bool, bool], bool]) -> 'VersionRanges':
+        """Merge with other version ranges of the same versioning scheme in one pass over both interval tables."""
+        if self.failed or other.failed:
+            raise ValueError('cannot combine invalid version ranges')
+        if self.versioning_scheme != other.versioning_scheme:
+            raise ValueError(
+                f'cannot combine version ranges of versioning schemes {self.versioning_scheme}'
+                f' and {other.versioning_scheme}'
+            )
+        left_versions, left = self._versions()
+        right_versions, right = other._versions()
+        versions, intervals = _merge_intervals(left, left_versions, right, right_versions, operation)
+        return VersionRanges._from_intervals(self.versioning_scheme, versions, intervals, self._lean)
+
+    def __or__(self, other: object) -> 'VersionRanges':
+        """The union includes the versions included in any of the version ranges.
+
+        Usage examples:
+
+        >>> VersionRanges('vers:pypi/>=1.0|<2.0') | VersionRanges('vers:pypi/>=1.5|<3.0|!=2.5')
+        VersionRanges('vers:pypi/>=1.0|!=2.5|<3.0')
+
+        >>> VersionRanges('vers:npm/<1.0.0') | VersionRanges('vers:npm/>=1.0.0')
+        VersionRanges('vers:npm/*')
+        """
+        if not isinstance(other, VersionRanges):
+            return NotImplemented
+        return self._combine(other, bool.__or__)
+
+    def __and__(self, other: object) -> 'VersionRanges':
+        """The intersection includes the versions included in both version ranges.
+
+        Usage examples:
+
+        >>> VersionRanges('vers:pypi/>=1.0|<2.0') & VersionRanges('vers:pypi/>1.5|<3.0|!=1.7')
+        VersionRanges('vers:pypi/>1.5|!=1.7|<2.0')
+
+        >>> VersionRanges('vers:pypi/<1.0') & VersionRanges('vers:pypi/>2.0')
+        Traceback (most recent call last):
+          ...
+        ValueError: version ranges including no version have no vers representation
+        """
+        if not isinstance(other, VersionRanges):
+            return NotImplemented
+        return self._combine(other, bool.__and__)
+
+    def __sub__(self, other: object) -> 'VersionRanges':
+        """The difference includes the versions included in these but not in the other version ranges.
+
+        Usage examples:
+
+        >>> VersionRanges('vers:pypi/>=1.0|<2.0') - VersionRanges('vers:pypi/1.2|>=1.5')
+        VersionRanges('vers:pypi/>=1.0|!=1.2|<1.5')
+        """
+        if not isinstance(other, VersionRanges):
+            return NotImplemented
+        return self._combine(other, lambda left, right: left and not right)
+
+    def __invert__(self) -> 'VersionRanges':
+        """The complement includes all versions not included in the version ranges.
+
+        Usage examples:
+
+        >>> ~VersionRanges('vers:golang/>=v1.2.0|!=v1.3.0|<v2.0.0')
+        VersionRanges('vers:golang/<v1.2.0|v1.3.0|>=v2.0.0')
+        """
+        if self.failed:
+            raise ValueError('cannot complement invalid version ranges')
+        versions, (bounds, members) = self._versions()
+        inverted = [not inside for inside in members]
+        return VersionRanges._from_intervals(self.versioning_scheme, versions, (bounds, inverted), self._lean)
+
+    def to_bytes(self) -> bytes:
+        """Encode the normalized version ranges compactly (see the codec module for the format and bulk functions).
+
+        Usage examples:
+
+        >>> VersionRanges.from_bytes(VersionRanges('vers:npm/>=1.0.0|<2.0.0').to_bytes())
+        VersionRanges('vers:npm/>=1.0.0|<2.0.0')
+
+        >>> VersionRanges('vers:npm/<').to_bytes()
+        Traceback (most recent call last):
+          ...
+        ValueError: invalid version ranges have no binary encoding
+        """
+        import versioalueet.codec as codec
+
+        return codec.dumps([self])
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, bytearray, memoryview], lean: bool = False) -> 'VersionRanges':
+        """Decode version ranges encoded by to_bytes without parsing."""
+        import versioalueet.codec as codec
+
+        block = codec.Block(data)
+        if len(block) != 1 or block.end != len(data):
+            raise ValueError('binary data must hold exactly one version ranges')
+        return cls._from_pairs(*block.entry(0), lean=lean)
 
     def __eq__(self, other: object) -> bool:
         """We define equality per the version ranges."""
@@ -335,57 +1140,144 @@ class VersionRanges:
         >>> version_ranges = VersionRanges(maybe_43)
         >>> assert 'vers:pypi/>42|<44' == str(version_ranges)
         """
-        return self.version_range  # type: ignore
+        return self.version_range
 
     def parse(self, version_range: str) -> tuple[bool, ModelType]:
-        """Poor person parser for bootstrap."""
+        """Poor person parser for bootstrap (skipping the string forms of the model in lean mode).
+
+        Valid version ranges take the single scan of the tokenizer and only invalid ones run the parse phases.
+        While enabled, the phase statistics record every phase (see the phases module).
+        """
         model: ModelType = {
             'received': version_range,
         }
-
-        failed, scheme_and_vcs = _parse_uri_scheme(version_range, model)
-        if failed:
-            return failed, model
-
-        failed, vc_string = _parse_version_scheme(scheme_and_vcs, model)
+        self._intervals = None
+        self._ranks = None
+
+        phase_stats = PHASE_STATS if PHASE_STATS.enabled else None
+        started = phase_stats.start() if phase_stats is not None else 0
+        code, _, versioning_scheme, vc_pairs = _tokenize(version_range)
+        if phase_stats is not None:
+            started = phase_stats.record(TOKENIZE, started, code is not ErrorCode.OK)
+        if code is ErrorCode.OK:
+            model['uri-scheme'] = 'vers'
+            model['versioning-scheme'] = versioning_scheme
+            failed, vc_pairs = _sort_version_constraint_pairs(vc_pairs, model)
+            if phase_stats is not None:
+                started = phase_stats.record(SORT, started, failed)
+        else:
+            failed, vc_pairs = _diagnose(version_range, model, phase_stats, started)
         if failed:
             return failed, model
 
-        failed, version_constraints = _split_version_constraints(vc_string, model)
-        if failed:
-            return failed, model
+        vc_pairs = _optimize_version_constraints(vc_pairs, model)
+        if phase_stats is not None:
+            started = phase_stats.record(OPTIMIZE, started)
 
-        failed, vc_pairs = _parse_version_constraint_pairs(version_constraints, model)
-        if failed:
+        self.versioning_scheme: str = model['versioning-scheme']  # type: ignore
+        self.version_constraint_pairs: VCPairsTupleType = tuple(vc_pairs)
+        if self._lean:
             return failed, model
 
-        vc_pairs = _optimize_version_constraints(vc_pairs, model)
-
         model['version-constraints'] = [f'{c}{v}' for v, c in vc_pairs]
         vcs_compressed = PIPE.join(f'{c}{v}' if c != EQ else v for v, c in vc_pairs)
         model['version-constraints-string-compressed'] = vcs_compressed
         model['version-range'] = 'vers' + COLON + model['versioning-scheme'] + SLASH + vcs_compressed  # type: ignore
-
-        self.versioning_scheme = model['versioning-scheme']
-        self.version_constraints = model['version-constraints']
-        self.version_range = model['version-range']
+        if phase_stats is not None:
+            phase_stats.record(MODEL, started)
 
         return failed, model
 
 
-def main(options: argparse.Namespace) -> int:
+class ParseCache:
+    """Bounded cache of parsed version ranges keyed by the whitespace free input evicting the least recently used.
+
+    The cached instances are frozen, so normalizing other version ranges through them cannot change the cache.
+    An optional store (like the persistent disk cache of the store module) is asked on misses before parsing
+    and receives the valid version ranges parsed.
+
+    Usage examples:
+
+    >>> cache = ParseCache(maxsize=2)
+    >>> first = cache.get('vers:pypi/ 42')
+    >>> first is cache.get('vers:pypi/42')
+    True
+    >>> _ = cache.get('vers:pypi/1'), cache.get('vers:pypi/2')
+    >>> cache.stats()
+    {'hits': 1, 'misses': 3, 'evictions': 1, 'size': 2, 'maxsize': 2}
+    >>> cache.clear()
+    >>> cache.stats()
+    {'hits': 0, 'misses': 0, 'evictions': 0, 'size': 0, 'maxsize': 2}
+    """
+
+    def __init__(self, maxsize: int = 4096, lean: bool = False, store: Union['DiskCache', None] = None) -> None:
+        """The maximum size must be positive and lean caches hold lean version ranges."""
+        if maxsize < 1:
+            raise ValueError('parse cache maximum size must be positive')
+        self.maxsize = maxsize
+        self.lean = lean
+        self.store = store
+        self._entries: OrderedDict[str, VersionRanges] = OrderedDict()
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def get(self, version_range: str) -> VersionRanges:
+        """Provide the cached version ranges parsing and caching on a miss."""
+        stripped = ''.join(version_range.split())
+        cached = self._entries.get(stripped)
+        if cached is not None:
+            self._entries.move_to_end(stripped)
+            self.hits += 1
+            return cached
+
+        self.misses += 1
+        cached = self.store.get(stripped, lean=self.lean) if self.store is not None else None
+        if cached is None:
+            cached = VersionRanges(stripped, lean=self.lean)
+            if self.store is not None and not cached.failed:
+                self.store.put(stripped, cached)
+        cached._frozen = True
+        self._entries[stripped] = cached
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return cached
+
+    def clear(self) -> None:
+        """Drop all entries and reset the counters."""
+        self._entries.clear()
+        self.hits, self.misses, self.evictions = 0, 0, 0
+
+    def stats(self) -> dict[str, int]:
+        """Report the counters together with the current and maximum size."""
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._entries),
+            'maxsize': self.maxsize,
+        }
+
+    def __len__(self) -> int:
+        """The number of cached version ranges."""
+        return len(self._entries)
+
+
+def main(options: 'argparse.Namespace') -> int:
     if options.debug:
+        import versioalueet.env as env
+
         for line in env.report(options, format='text').split('\n'):  # type: ignore
             log.debug(line)
     if options.versions:
-        log.warning('version inclusion assessment requested, but not implemented yet')
-        log.warning("details: requested versions were ('%s')" % ("', '".join(options.versions),))
+        if not options.version_ranges:
+            log.warning('version inclusion assessment requested, but no version ranges given')
+            log.warning("details: requested versions were ('%s')" % ("', '".join(options.versions),))
         non_space_versions = [v.strip() for v in options.versions]
         non_empty_versions = [v for v in non_space_versions if v]
         if non_space_versions != non_empty_versions:
             log.error('received empty or space only version identifiers for inclusion test')
             return 2
-    version_ranges = VersionRanges(options.version_ranges)
+    version_ranges = VersionRanges(options.version_ranges[0] if options.version_ranges else '')
     if not version_ranges.failed:
         if options.debug:
             log.debug('model: [')
@@ -396,6 +1288,10 @@ def main(options: argparse.Namespace) -> int:
                     log.debug('- %s: %s' % (k, str(v)))
             log.debug(']')
         print(version_ranges)
+        if options.versions:
+            verdicts = version_ranges.contains_many(non_empty_versions)
+            for version, inside in zip(non_empty_versions, verdicts):
+                print(f'{"in" if inside else "out"} {version}')
         return 0
 
     return 1
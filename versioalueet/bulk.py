@@ -0,0 +1,331 @@
+"""Provide bulk processing of many version ranges as newline delimited JSON (NDJSON) records.
+
+Use case example:
+
+>>> import io
+>>> sink = io.StringIO()
+>>> stream(io.StringIO('vers:pypi/|1.2.3||\\n\\nvers:pypi/\\n'), sink)
+(2, 1)
+>>> print(sink.getvalue(), end='')  # doctest: +ELLIPSIS
+{"line": 1, "input": "vers:pypi/|1.2.3||", "normalized": "vers:pypi/1.2.3"}
+{"line": 3, "input": "vers:pypi/", "code": "empty-version-constraints", "position": 10, "error": "version ...empty"}
+"""
+
+import argparse
+import contextlib
+import functools
+import json
+import mmap
+import os
+import sys
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import IO, Callable, Union
+
+from versioalueet import ENCODING, ENCODING_ERRORS_POLICY, log
+from versioalueet.api import ERROR_MESSAGES, ErrorCode, ParseCache, validate
+from versioalueet.env import ResourceDelta
+from versioalueet.store import configured
+
+BATCH_SIZE = 1024
+CHUNK_SIZE = 4096
+STDIN = '-'
+
+LINE_FEED = b'\n'
+
+LineType = Union[str, bytes, bytearray, memoryview]
+RecordType = dict[str, Union[str, int]]
+ChunkType = tuple[int, list[Union[str, bytes]]]
+
+_worker_cache: Union[ParseCache, None] = None
+
+
+def mapped_lines(path: str) -> Iterator[memoryview]:
+    """Memory-map the file and yield its lines (without line feeds) as slices of the mapping.
+
+    Implementer notes:
+
+    - the file is never read into memory as a whole, the operating system pages it in (and out) as needed
+    - every slice shares the memory of the mapping, so decode it before asking for the next line
+    - the mapping is closed at the end, unless slices are still held (then it closes with the last of them)
+
+    Usage examples:
+
+    >>> import tempfile
+    >>> with tempfile.NamedTemporaryFile(suffix='.txt') as handle:
+    ...     _ = handle.write(b'vers:npm/1.0.0\\n\\nvers:npm/*')
+    ...     handle.flush()
+    ...     [str(line, ENCODING) for line in mapped_lines(handle.name)]
+    ['vers:npm/1.0.0', '', 'vers:npm/*']
+    """
+    with open(path, 'rb') as handle:
+        if not os.fstat(handle.fileno()).st_size:
+            return
+        mapped = mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(mapped)
+    try:
+        start, size = 0, len(view)
+        while start < size:
+            end = mapped.find(LINE_FEED, start)
+            if end < 0:
+                end = size
+            yield view[start:end]
+            start = end + 1
+    finally:
+        view.release()
+        with contextlib.suppress(BufferError):
+            mapped.close()
+
+
+def _decoded(line: LineType) -> str:
+    """Decode binary lines (like the slices of mapped files) raising UnicodeDecodeError if not valid UTF-8.
+
+    Usage examples:
+
+    >>> _decoded(memoryview(b'vers:npm/1.0.0\\r'))
+    'vers:npm/1.0.0\\r'
+    """
+    return line if isinstance(line, str) else str(line, ENCODING)
+
+
+def _validated(lines: Iterable[LineType], start: int = 1) -> Iterator[tuple[int, str, ErrorCode, int]]:
+    """Yield the line number, the stripped text, and the validation code and position of every non blank line.
+
+    Every line is decoded on its own, so a line that is not valid UTF-8 fails as invalid-encoding
+    (with the text decoded per the errors policy) and the lines after it are processed as usual.
+
+    Usage examples:
+
+    >>> [(number, text, code.value, position) for number, text, code, position in _validated([b'caf\\xe9', b' '])]
+    [(1, 'caf', 'invalid-encoding', 3)]
+    """
+    for number, line in enumerate(lines, start=start):
+        try:
+            received = _decoded(line).strip()
+        except UnicodeDecodeError:
+            received = str(line, ENCODING, ENCODING_ERRORS_POLICY).strip()  # type: ignore
+            code, position = validate(line)
+        else:
+            if not received:
+                continue
+            code, position = validate(received)
+        yield number, received, code, position
+
+
+def normalize_records(
+    lines: Iterable[LineType], cache: Union[ParseCache, None] = None, start: int = 1
+) -> Iterator[RecordType]:
+    """Yield one record per non blank line with the normalized version ranges or the error code and message.
+
+    Every line is validated first (without logging), so only valid version ranges are parsed and cached.
+
+    Usage examples:
+
+    >>> list(normalize_records(['vers:npm/<2|>1', ' ']))
+    [{'line': 1, 'input': 'vers:npm/<2|>1', 'normalized': 'vers:npm/>1|<2'}]
+
+    >>> list(normalize_records([b'vers:npm/1.0.0']))
+    [{'line': 1, 'input': 'vers:npm/1.0.0', 'normalized': 'vers:npm/1.0.0'}]
+    """
+    cache = ParseCache(lean=True) if cache is None else cache
+    for number, received, code, position in _validated(lines, start):
+        if code is not ErrorCode.OK:
+            yield _error_record(number, received, code, position)
+        else:
+            yield {'line': number, 'input': received, 'normalized': str(cache.get(received))}
+
+
+def _error_record(number: int, received: str, code: ErrorCode, position: int) -> RecordType:
+    """Describe why the received version range is invalid by code, position, and message."""
+    return {
+        'line': number,
+        'input': received,
+        'code': code.value,
+        'position': position,
+        'error': ERROR_MESSAGES[code],
+    }
+
+
+def validate_records(lines: Iterable[LineType], start: int = 1) -> Iterator[RecordType]:
+    """Yield one record per invalid non blank line without logging and without building any models.
+
+    Usage examples:
+
+    >>> records = validate_records(['vers:npm/<2|>1', 'vers:npm/1|<2|1'])
+    >>> [(record['line'], record['code'], record['position']) for record in records]
+    [(2, 'duplicate-version', 14)]
+    """
+    for number, received, code, position in _validated(lines, start):
+        if code is not ErrorCode.OK:
+            yield _error_record(number, received, code, position)
+
+
+def _chunks(lines: Iterable[LineType], chunk_size: int) -> Iterator[ChunkType]:
+    """Group the lines into chunks tagged with the line number of their first line.
+
+    The lines are decoded by the workers, slices of mapped files are copied into picklable bytes.
+
+    Usage examples:
+
+    >>> list(_chunks(['a', memoryview(b'b'), 'c'], chunk_size=2))
+    [(1, ['a', b'b']), (3, ['c'])]
+    """
+    chunk: list[Union[str, bytes]] = []
+    start = 1
+    for line in lines:
+        chunk.append(line if isinstance(line, (str, bytes)) else bytes(line))
+        if len(chunk) >= chunk_size:
+            yield start, chunk
+            start += len(chunk)
+            chunk = []
+    if chunk:
+        yield start, chunk
+
+
+def _normalize_chunk(chunk: ChunkType) -> list[RecordType]:
+    """Normalize one chunk inside a worker process sharing one parse cache across the chunks of the worker.
+
+    The workers open the configured disk cache read only, so only the sequential stream adds entries to it.
+    """
+    global _worker_cache  # pylint: disable=global-statement
+    if _worker_cache is None:
+        _worker_cache = ParseCache(lean=True, store=configured(read_only=True))
+    start, lines = chunk
+    return list(normalize_records(lines, cache=_worker_cache, start=start))
+
+
+def _validate_chunk(chunk: ChunkType) -> list[RecordType]:
+    """Validate one chunk inside a worker process."""
+    start, lines = chunk
+    return list(validate_records(lines, start=start))
+
+
+def _parallel(
+    lines: Iterable[LineType],
+    process: Callable[[ChunkType], list[RecordType]],
+    jobs: Union[int, None],
+    chunk_size: int,
+) -> Iterator[RecordType]:
+    """Yield the records of the chunks in input order while the chunks are processed by a pool of processes.
+
+    Implementer notes:
+
+    - jobs is the number of worker processes (default is the number of CPUs)
+    - at most two chunks per worker are in flight, so the memory use does not grow with the input size
+    """
+    if chunk_size < 1:
+        raise ValueError('chunk size must be positive')
+    workers = jobs if jobs else os.cpu_count() or 1
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending: deque[Future[list[RecordType]]] = deque()
+        for chunk in _chunks(lines, chunk_size):
+            pending.append(pool.submit(process, chunk))
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+
+def normalize_parallel(
+    lines: Iterable[LineType], jobs: Union[int, None] = None, chunk_size: int = CHUNK_SIZE
+) -> Iterator[RecordType]:
+    """Yield the records of normalize_records in input order while chunks are processed by a pool of processes.
+
+    The jobs are the number of worker processes (default is the number of CPUs).
+    """
+    return _parallel(lines, _normalize_chunk, jobs, chunk_size)
+
+
+def validate_parallel(
+    lines: Iterable[LineType], jobs: Union[int, None] = None, chunk_size: int = CHUNK_SIZE
+) -> Iterator[RecordType]:
+    """Yield the records of validate_records in input order while chunks are processed by a pool of processes.
+
+    The jobs are the number of worker processes (default is the number of CPUs).
+    """
+    return _parallel(lines, _validate_chunk, jobs, chunk_size)
+
+
+def stream(
+    source: Iterable[LineType],
+    sink: IO[str],
+    batch_size: int = BATCH_SIZE,
+    jobs: int = 1,
+    chunk_size: int = CHUNK_SIZE,
+    cache: Union[ParseCache, None] = None,
+    validate_only: bool = False,
+) -> tuple[int, int]:
+    """Normalize the source (like an open file or the lines of a mapped file) line by line writing NDJSON to the sink.
+
+    The memory use is constant as only one batch of output records is held at any time.
+    Any number of jobs other than one normalizes the chunks of lines in parallel (zero means one job per CPU).
+    The cache (if any) is used when normalizing sequentially.
+    When only validating, records are written for the invalid lines only and no version ranges are parsed.
+    Returns the number of records written and the number of failures among them.
+
+    Usage examples:
+
+    >>> import io
+    >>> sink = io.StringIO()
+    >>> stream(io.StringIO('vers:npm/1.0.0\\nvers:npm/<\\n'), sink, validate_only=True)
+    (1, 1)
+    >>> sink.getvalue()
+    '{"line": 2, "input": "vers:npm/<", "code": "empty-version", "position": 9, "error": "empty version detected"}\\n'
+    """
+    records, failures = 0, 0
+    batch: list[str] = []
+    produced: Iterator[RecordType]
+    if validate_only:
+        produced = validate_records(source) if jobs == 1 else validate_parallel(source, jobs, chunk_size)
+    else:
+        produced = normalize_records(source, cache) if jobs == 1 else normalize_parallel(source, jobs, chunk_size)
+    for record in produced:
+        records += 1
+        failures += 'error' in record
+        batch.append(json.dumps(record))
+        if len(batch) >= batch_size:
+            sink.write('\n'.join(batch) + '\n')
+            batch.clear()
+    if batch:
+        sink.write('\n'.join(batch) + '\n')
+    sink.flush()
+    return records, failures
+
+
+def main(options: argparse.Namespace) -> int:
+    """Stream the file (optionally memory-mapped) or standard input (if the path is a dash) to standard output.
+
+    The lines are read as bytes and decoded one by one, so an invalid byte fails only the line holding it.
+    When only validating, the records of the invalid lines are written and the disk cache is not used.
+    On request the resource usage deltas of the streaming (including worker processes) follow as last record.
+    """
+    store = None if options.validate_only else configured()
+    cache = ParseCache(lean=True, store=store)
+    run = functools.partial(
+        stream,
+        sink=sys.stdout,
+        jobs=options.jobs,
+        chunk_size=options.chunk_size or CHUNK_SIZE,
+        cache=cache,
+        validate_only=options.validate_only,
+    )
+    with ResourceDelta() as delta:
+        if options.stream == STDIN:
+            records, failures = run(sys.stdin.buffer)
+        elif options.mmap:
+            records, failures = run(mapped_lines(options.stream))
+        else:
+            with open(options.stream, 'rb') as source:
+                records, failures = run(source)
+        delta.items = records
+    log.info('streamed %d records with %d failures' % (records, failures))
+    if options.usage:
+        sys.stdout.write(json.dumps(delta.report()) + '\n')
+        sys.stdout.flush()
+    if store is not None:
+        stats = store.stats()
+        log.info('disk cache %s had %d hits and %d misses' % (store.path, stats['hits'], stats['misses']))
+        store.save()
+        log.info('disk cache %s received %d entries' % (store.path, store.saved))
+    return 1 if failures else 0
@@ -6,8 +6,9 @@ import sys
 from typing import Union
 
 import versioalueet.api as api
-import versioalueet.env as env
-from versioalueet import APP_ALIAS, APP_NAME, DEBUG, VERSION, log
+from versioalueet import APP_ALIAS, APP_ENV, APP_NAME, DEBUG, ENCODING, VERSION, init_logger, log
+
+AT = '@'
 
 
 def parse_request(argv: list[str]) -> Union[int, argparse.Namespace]:
@@ -59,16 +60,90 @@ def parse_request(argv: list[str]) -> Union[int, argparse.Namespace]:
         '-r',
         '--version-ranges',
         dest='version_ranges',
+        default=[],
+        action='append',
+        type=str,
+        help="version ranges as valid vers string (repeatable, @file reads one per line) (default: '')",
+    )
+    parser.add_argument(
+        '--matrix',
+        dest='matrix',
+        default='',
+        choices=('csv', 'ndjson', 'bitmap'),
+        help="print the inclusion matrix (exit code 3 if any version is included) (default: '' i.e. csv if many -r)",
+    )
+    parser.add_argument(
+        '-s',
+        '--stream',
+        dest='stream',
+        default='',
+        type=str,
+        help="normalize version ranges line by line from file (or standard input if -) to NDJSON (default: '')",
+    )
+    parser.add_argument(
+        '-m',
+        '--mmap',
+        dest='mmap',
+        default=False,
+        action='store_true',
+        help='memory-map the file to stream instead of reading it (default: False)',
+    )
+    parser.add_argument(
+        '-j',
+        '--jobs',
+        dest='jobs',
+        default=1,
+        type=int,
+        help='number of worker processes when streaming (0 is one per CPU) (default: 1)',
+    )
+    parser.add_argument(
+        '--chunk-size',
+        dest='chunk_size',
+        default=None,
+        type=int,
+        help='number of lines per chunk handed to a worker process when streaming (default: 4096)',
+    )
+    parser.add_argument(
+        '--validate-only',
+        dest='validate_only',
+        default=False,
+        action='store_true',
+        help='only validate the streamed lines writing NDJSON records for the invalid ones (default: False)',
+    )
+    parser.add_argument(
+        '--usage',
+        dest='usage',
+        default=False,
+        action='store_true',
+        help='append the resource usage deltas of the run as last NDJSON record when streaming (default: False)',
+    )
+    parser.add_argument(
+        '--serve',
+        dest='serve',
+        default=False,
+        action='store_true',
+        help='run the local daemon answering normalize and contains requests on the socket (default: False)',
+    )
+    parser.add_argument(
+        '--socket',
+        dest='socket',
         default='',
         type=str,
-        help="version ranges as valid vers string (default: '')",
+        help=f"daemon socket path (default: '' i.e. ${APP_ENV}_SOCKET or {APP_ALIAS}.sock in the runtime folder)",
+    )
+    parser.add_argument(
+        '--stats',
+        dest='stats',
+        default=False,
+        action='store_true',
+        help='report calls, rejections, and latencies per parse phase to standard error (default: False)',
     )
     parser.add_argument(
         dest='versions',
         nargs='*',
         default='',
         type=str,
-        help="version(s) to test against version ranges for inclusion (default: '')",
+        help="version(s) to test against version ranges for inclusion (@file reads one per line) (default: '')",
     )
     if not argv:
         parser.print_help()
@@ -81,12 +156,42 @@ def parse_request(argv: list[str]) -> Union[int, argparse.Namespace]:
         return 0
 
     if options.report:
+        import versioalueet.env as env
+
         print(env.report(options, format='json'))
         return 0
 
     if options.verbose and options.quiet:
         parser.error('you cannot be quiet and verbose at the same time')
 
+    if options.jobs < 0 or (options.chunk_size is not None and options.chunk_size < 1):
+        parser.error('jobs must not be negative and the chunk size must be positive')
+
+    if options.mmap and options.stream in ('', '-'):
+        parser.error('memory mapping needs a file to stream')
+
+    if options.usage and not options.stream:
+        parser.error('resource usage deltas are only reported when streaming')
+
+    if options.validate_only and not options.stream:
+        parser.error('validation only applies when streaming')
+
+    if options.serve and (options.stream or options.version_ranges):
+        parser.error('the daemon cannot also stream or evaluate version ranges')
+
+    try:
+        options.version_ranges = expand(options.version_ranges)
+        options.versions = expand(options.versions)
+    except OSError as err:
+        parser.error(f'cannot read arguments from file ({err})')
+    if len(options.version_ranges) > 1 and not options.matrix:
+        options.matrix = 'csv'
+    if options.matrix and (options.stream or options.serve):
+        parser.error('the inclusion matrix cannot be combined with streaming or the daemon')
+
+    if options.stats and (options.serve or options.jobs != 1):
+        parser.error('parse phase statistics need a single job and no daemon')
+
     if DEBUG:
         options.debug = True  # pragma: no cover
     if options.debug and options.quiet:
@@ -95,6 +200,24 @@ def parse_request(argv: list[str]) -> Union[int, argparse.Namespace]:
     return options
 
 
+def expand(arguments: list[str]) -> list[str]:
+    """Replace every argument starting with an at sign by the non blank lines of the file it names.
+
+    Examples:
+
+    >>> expand(['vers:npm/*', '1.0.0'])
+    ['vers:npm/*', '1.0.0']
+    """
+    expanded: list[str] = []
+    for argument in arguments:
+        if argument.startswith(AT) and len(argument) > 1:
+            with open(argument[1:], 'rt', encoding=ENCODING) as handle:
+                expanded.extend(line.strip() for line in handle if line.strip())
+        else:
+            expanded.append(argument)
+    return expanded
+
+
 def main(argv: Union[list[str], None] = None) -> int:
     """Delegate processing to functional module.
 
@@ -105,6 +228,7 @@ def main(argv: Union[list[str], None] = None) -> int:
     0
     """
     argv = sys.argv[1:] if argv is None else argv
+    init_logger(name=APP_ENV, level=logging.DEBUG if DEBUG else None)
     options = parse_request(argv)
     if isinstance(options, int):
         return 0
@@ -113,4 +237,42 @@ def main(argv: Union[list[str], None] = None) -> int:
     elif options.debug:
         log.setLevel(logging.DEBUG)
 
+    if not options.stats:
+        return dispatch(options)
+
+    import versioalueet.phases as phases
+
+    phases.reset()
+    phases.enable()
+    try:
+        return dispatch(options)
+    finally:
+        phases.disable()
+        print(phases.table(), file=sys.stderr)
+
+
+def dispatch(options: argparse.Namespace) -> int:
+    """Delegate the request to the module processing it."""
+    if options.stream:
+        import versioalueet.bulk as bulk
+
+        return bulk.main(options)
+
+    if options.serve:
+        import versioalueet.serve as serve
+
+        return serve.main(options)
+
+    if options.matrix:
+        import versioalueet.matrix as matrix
+
+        return matrix.main(options)
+
+    if options.version_ranges and not options.debug and not options.stats:
+        import versioalueet.serve as serve
+
+        forwarded = serve.client(options)
+        if forwarded is not None:
+            return forwarded
+
     return api.main(options)
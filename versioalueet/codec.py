@@ -0,0 +1,273 @@
+"""Provide a compact binary encoding of normalized version ranges (single and in bulk).
+
+Implementer notes:
+
+- a block holds any number of version ranges as columns: the scheme reference and the pair count per record,
+  one comparator byte (array of unsigned chars) and one string reference per version constraint pair
+- the versioning schemes and the versions of all records in a block share one table of unique strings
+- the references use the narrowest unsigned width (1, 2, or 4 bytes) fitting the block, and so do the pair counts
+- the string table is stored as a column of the string lengths (in code points) followed by the concatenated UTF-8,
+  so versions may hold any character (like percent-encoded line feeds)
+- the bulk format is a sequence of blocks, so writing and reading hold one block in memory at a time
+
+Use case example:
+
+>>> data = VersionRanges('vers:pypi/<44|>42').to_bytes()
+>>> data[:4], len(data)
+(b'VRBK', 41)
+>>> VersionRanges.from_bytes(data)
+VersionRanges('vers:pypi/>42|<44')
+"""
+
+import struct
+import sys
+from array import array
+from collections.abc import Iterable, Iterator
+from itertools import accumulate
+from typing import IO, Union
+
+from versioalueet import ENCODING
+from versioalueet.api import EQ, GE, GT, LE, LT, NE, VCPairsTupleType, VersionRanges
+
+MAGIC = b'VRBK'
+FORMAT_VERSION = 2
+BLOCK_SIZE = 65536
+COMPARATORS = (EQ, NE, LT, LE, GT, GE)
+COMPARATOR_CODES = {comparator: code for code, comparator in enumerate(COMPARATORS)}
+TYPECODES = {1: 'B', 2: 'H', 4: 'I'}
+BIG_ENDIAN = sys.byteorder == 'big'
+
+# magic, format version, reference width, count width, length width, record count, pair count, string count,
+# string table size
+HEADER = struct.Struct('<4sBBBBIIII')
+
+EntryType = tuple[str, VCPairsTupleType]
+BinaryType = Union[bytes, bytearray, memoryview]
+
+
+def _width(largest: int) -> int:
+    """The narrowest width in bytes of the unsigned integer array type holding the largest value.
+
+    Usage examples:
+
+    >>> _width(255), _width(256), _width(65536)
+    (1, 2, 4)
+    """
+    return 1 if largest < 1 << 8 else 2 if largest < 1 << 16 else 4
+
+
+def _column(typecode: str, values: Iterable[int]) -> bytes:
+    """The little endian bytes of the values as array of the type."""
+    column = array(typecode, values)
+    if BIG_ENDIAN:  # pragma: no cover
+        column.byteswap()
+    return column.tobytes()
+
+
+def encode(entries: Iterable[EntryType]) -> bytes:
+    """Encode the versioning schemes and canonical version constraint pairs as one block.
+
+    Usage examples:
+
+    >>> encode([('pypi', (('42', '>'), ('44', '<')))])[HEADER.size :]
+    b'\\x00\\x02\\x04\\x02\\x01\\x02\\x04\\x02\\x02pypi4244'
+    """
+    strings: dict[str, int] = {}
+    schemes, counts, comparators, references = [], [], array('B'), []
+    for scheme, vc_pairs in entries:
+        schemes.append(strings.setdefault(scheme, len(strings)))
+        counts.append(len(vc_pairs))
+        for version, comparator in vc_pairs:
+            references.append(strings.setdefault(version, len(strings)))
+            comparators.append(COMPARATOR_CODES[comparator])
+
+    lengths = [len(string) for string in strings]
+    table = ''.join(strings).encode(ENCODING)
+    reference_width, count_width = _width(len(strings)), _width(max(counts, default=0))
+    length_width = _width(max(lengths, default=0))
+    return b''.join(
+        (
+            HEADER.pack(
+                MAGIC,
+                FORMAT_VERSION,
+                reference_width,
+                count_width,
+                length_width,
+                len(schemes),
+                len(references),
+                len(strings),
+                len(table),
+            ),
+            _column(TYPECODES[reference_width], schemes),
+            _column(TYPECODES[count_width], counts),
+            comparators.tobytes(),
+            _column(TYPECODES[reference_width], references),
+            _column(TYPECODES[length_width], lengths),
+            table,
+        )
+    )
+
+
+def _body_size(
+    reference_width: int, count_width: int, length_width: int, records: int, pairs: int, strings: int, table_size: int
+) -> int:
+    """The size in bytes of the block after the header."""
+    columns = records * (reference_width + count_width) + pairs * (1 + reference_width) + strings * length_width
+    return columns + table_size
+
+
+class Block:
+    """Decoded columns of one block providing the entries by record index.
+
+    Usage examples:
+
+    >>> block = Block(encode([('npm', (('1.0.0', '>='), ('2.0.0', '<'))), ('npm', (('*', '='),))]))
+    >>> len(block), block.end
+    (2, 52)
+    >>> block.entry(1)
+    ('npm', (('*', '='),))
+    """
+
+    def __init__(self, data: BinaryType, offset: int = 0) -> None:
+        """Decode the columns of the block starting at the offset into the data."""
+        view = memoryview(data)
+        if len(view) - offset < HEADER.size:
+            raise ValueError('truncated version ranges block')
+        magic, format_version, reference_width, count_width, length_width, records, pairs, strings, table_size = (
+            HEADER.unpack_from(view, offset)
+        )
+        if magic != MAGIC:
+            raise ValueError('data is not a version ranges block')
+        if format_version != FORMAT_VERSION:
+            raise ValueError(f'unsupported version ranges block format version {format_version}')
+        if reference_width not in TYPECODES or count_width not in TYPECODES or length_width not in TYPECODES:
+            raise ValueError('corrupt version ranges block')
+        self.end = offset + HEADER.size
+        self.end += _body_size(reference_width, count_width, length_width, records, pairs, strings, table_size)
+        if self.end > len(view):
+            raise ValueError('truncated version ranges block')
+
+        columns = []
+        start = offset + HEADER.size
+        for typecode, size in (
+            (TYPECODES[reference_width], records),
+            (TYPECODES[count_width], records),
+            ('B', pairs),
+            (TYPECODES[reference_width], pairs),
+            (TYPECODES[length_width], strings),
+        ):
+            column = array(typecode)
+            column.frombytes(view[start : start + size * column.itemsize])
+            if BIG_ENDIAN:  # pragma: no cover
+                column.byteswap()
+            columns.append(column)
+            start += size * column.itemsize
+        self._schemes, counts, self._comparators, self._references, lengths = columns
+        text = str(view[start : self.end], ENCODING)
+        bounds = list(accumulate(lengths, initial=0))
+        self._strings = [text[low:high] for low, high in zip(bounds, bounds[1:])]
+        self._starts = list(accumulate(counts, initial=0))
+
+        strings_count = len(self._strings)
+        if (
+            bounds[-1] != len(text)
+            or self._starts[-1] != pairs
+            or max(self._comparators, default=0) >= len(COMPARATORS)
+            or max(self._schemes, default=-1) >= strings_count
+            or max(self._references, default=-1) >= strings_count
+        ):
+            raise ValueError('corrupt version ranges block')
+
+    def __len__(self) -> int:
+        """The number of records in the block."""
+        return len(self._schemes)
+
+    def entry(self, index: int) -> EntryType:
+        """The versioning scheme and the version constraint pairs of the record at the index."""
+        strings, start, end = self._strings, self._starts[index], self._starts[index + 1]
+        versions = [strings[reference] for reference in self._references[start:end]]
+        comparators = [COMPARATORS[code] for code in self._comparators[start:end]]
+        return strings[self._schemes[index]], tuple(zip(versions, comparators))
+
+    def version_ranges(self, lean: bool = False) -> Iterator[VersionRanges]:
+        """Yield the version ranges of all records in order (without parsing)."""
+        for index in range(len(self)):
+            yield VersionRanges._from_pairs(*self.entry(index), lean=lean)
+
+
+def _entry(version_ranges: VersionRanges) -> EntryType:
+    """The versioning scheme and the canonical version constraint pairs of valid version ranges."""
+    if version_ranges.failed:
+        raise ValueError('invalid version ranges have no binary encoding')
+    return version_ranges.versioning_scheme, version_ranges.version_constraint_pairs
+
+
+def dumps(version_ranges: Iterable[VersionRanges]) -> bytes:
+    """Encode the valid version ranges as one block.
+
+    Usage examples:
+
+    >>> len(dumps([VersionRanges('vers:npm/1.0.0'), VersionRanges('vers:npm/<1.0.0')]))
+    42
+    """
+    return encode(_entry(item) for item in version_ranges)
+
+
+def loads(data: BinaryType, lean: bool = False) -> list[VersionRanges]:
+    """Decode all blocks of the data into version ranges.
+
+    Usage examples:
+
+    >>> loads(dumps([VersionRanges('vers:npm/1.0.0')]) + dumps([VersionRanges('vers:npm/<1.0.0')]))
+    [VersionRanges('vers:npm/1.0.0'), VersionRanges('vers:npm/<1.0.0')]
+    """
+    decoded: list[VersionRanges] = []
+    offset = 0
+    while offset < len(data):
+        block = Block(data, offset)
+        decoded.extend(block.version_ranges(lean))
+        offset = block.end
+    return decoded
+
+
+def dump(version_ranges: Iterable[VersionRanges], sink: IO[bytes], block_size: int = BLOCK_SIZE) -> int:
+    """Write the valid version ranges to the binary sink in blocks of at most block size records.
+
+    Returns the number of version ranges written.
+
+    Usage examples:
+
+    >>> import io
+    >>> sink = io.BytesIO()
+    >>> dump(map(VersionRanges, ('vers:npm/1', 'vers:npm/2', 'vers:pypi/3')), sink, block_size=2)
+    3
+    >>> [str(item) for item in load(io.BytesIO(sink.getvalue()))]
+    ['vers:npm/1', 'vers:npm/2', 'vers:pypi/3']
+    """
+    if block_size < 1:
+        raise ValueError('block size must be positive')
+    written = 0
+    batch: list[EntryType] = []
+    for item in version_ranges:
+        batch.append(_entry(item))
+        if len(batch) >= block_size:
+            sink.write(encode(batch))
+            written += len(batch)
+            batch.clear()
+    if batch:
+        sink.write(encode(batch))
+        written += len(batch)
+    return written
+
+
+def load(source: IO[bytes], lean: bool = False) -> Iterator[VersionRanges]:
+    """Yield the version ranges of the blocks read one by one from the binary source."""
+    while header := source.read(HEADER.size):
+        if len(header) < HEADER.size:
+            raise ValueError('truncated version ranges block')
+        _, _, reference_width, count_width, length_width, records, pairs, strings, table_size = HEADER.unpack(header)
+        body_size = _body_size(reference_width, count_width, length_width, records, pairs, strings, table_size)
+        body = source.read(body_size)
+        if len(body) < body_size:
+            raise ValueError('truncated version ranges block')
+        yield from Block(header + body).version_ranges(lean)
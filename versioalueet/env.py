@@ -1,6 +1,7 @@
 """Report facts from the environment."""
 
 import argparse
+import contextlib
 import importlib.util
 import json
 import os
@@ -11,16 +12,128 @@ if importlib.util.find_spec('resource'):
 else:  # pragma: no cover
     pass
 import sys
+import time
 import uuid
 from typing import Union
 from versioalueet import ENCODING, ENCODING_ERRORS_POLICY, VERSION
 
 VolatileDictType = dict[str, Union[str, bool, float, int]]
+UsageType = dict[str, Union[float, int]]
 EnvType = dict[str, dict[str, VolatileDictType]]
 FormatType = str
 FORMATS = ('text', 'dict', 'json')
 
 
+USAGE_KEYS = (
+    'ru-maxrss-mbytes-kbytes-precision',
+    'ru-utime-msec-usec-precision',
+    'ru-stime-msec-usec-precision',
+    'ru-minflt',
+    'ru-majflt',
+    'ru-inblock',
+    'ru-outblock',
+    'ru_nvcsw',
+    'ru_nivcsw',
+)
+PEAK_KEY = USAGE_KEYS[0]
+
+
+def resource_usage(children: bool = False) -> UsageType:
+    """Snapshot the resource usage of the process (or of its terminated children) in the os-resource-usage shape.
+
+    All values are minus one if the resource module is not available.
+
+    Usage examples:
+
+    >>> usage = resource_usage()
+    >>> list(usage) == list(USAGE_KEYS)
+    True
+    """
+    if 'resource' not in sys.modules:
+        return dict.fromkeys(USAGE_KEYS, -1)
+
+    res = resource.getrusage(resource.RUSAGE_CHILDREN if children else resource.RUSAGE_SELF)
+    ru_maxrss = float(res.ru_maxrss)  # maximum resident set size used (linux in kilobytes)
+    if platform.platform(aliased=True, terse=True).lower().startswith('macos'):  # pragma: no cover
+        ru_maxrss /= 1024  # "man 2 getrusage" on MacOS indicates unit is bytes
+    return {
+        'ru-maxrss-mbytes-kbytes-precision': round(ru_maxrss / 1024, 3),
+        'ru-utime-msec-usec-precision': round(res.ru_utime * 1e3, 3),  # time in user mode (usec resolution)
+        'ru-stime-msec-usec-precision': round(res.ru_stime * 1e3, 3),  # time in kernel mode (usec resolution)
+        'ru-minflt': res.ru_minflt,  # number of page faults serviced without any I/O activity
+        'ru-majflt': res.ru_majflt,  # number of page faults serviced that required I/O activity
+        'ru-inblock': res.ru_inblock,  # number of times the filesystem had to perform input
+        'ru-outblock': res.ru_oublock,  # number of times the filesystem had to perform output
+        # number of times a context switch resulted due to a process voluntarily giving up the processor
+        # before its time slice was completed
+        'ru_nvcsw': res.ru_nvcsw,
+        # number of times a context switch resulted due to a higher priority process becoming runnable
+        # or because the current process exceeded its time slice
+        'ru_nivcsw': res.ru_nivcsw,
+    }
+
+
+def _combined_usage() -> UsageType:
+    """The resource usage of the process and its terminated children (the peak is the larger of both)."""
+    own, children = resource_usage(), resource_usage(children=True)
+    if own[PEAK_KEY] == -1:
+        return own
+    combined = {key: own[key] + children[key] for key in USAGE_KEYS}
+    combined[PEAK_KEY] = max(own[PEAK_KEY], children[PEAK_KEY])
+    return combined
+
+
+class ResourceDelta(contextlib.ContextDecorator):
+    """Measure the resource usage deltas, the wall time, and the throughput of a block of work.
+
+    Implementer notes:
+
+    - the snapshots include terminated child processes (like the workers of a process pool after its shutdown)
+    - the maximum resident set size is a peak, so its delta is the growth of the peak during the work
+    - set the number of items processed within the block to report the items per second
+    - as decorator every call measures anew and the report describes the latest call
+
+    Usage examples:
+
+    >>> with ResourceDelta() as delta:
+    ...     delta.items = len([number * number for number in range(1000)])
+    >>> report = delta.report()['os-resource-usage-delta']
+    >>> report['items'], report['items-per-sec'] > 0, list(report)[:2]
+    (1000, True, ['wall-msec-usec-precision', 'items'])
+    """
+
+    def __init__(self, items: int = 0) -> None:
+        """The number of items processed may also be set (or counted up) within the block."""
+        self.items = items
+        self.elapsed = 0.0
+        self._before: UsageType = {}
+        self._after: UsageType = {}
+        self._started = 0.0
+
+    def __enter__(self) -> 'ResourceDelta':
+        """Take the snapshot before the work."""
+        self._before = _combined_usage()
+        self._started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Take the snapshot after the work (exceptions propagate)."""
+        self.elapsed = time.perf_counter() - self._started
+        self._after = _combined_usage()
+
+    def report(self) -> dict[str, VolatileDictType]:
+        """Report the wall time, the throughput, and the resource usage deltas (minus one if not available)."""
+        delta: VolatileDictType = {
+            'wall-msec-usec-precision': round(self.elapsed * 1e3, 3),
+            'items': self.items,
+            'items-per-sec': round(self.items / self.elapsed, 3) if self.elapsed > 0 else 0.0,
+        }
+        for key in USAGE_KEYS:
+            before, after = self._before.get(key, -1), self._after.get(key, -1)
+            delta[key] = -1 if before == -1 or after == -1 else round(after - before, 3)
+        return {'os-resource-usage-delta': delta}
+
+
 def assess(options: argparse.Namespace) -> EnvType:
     """Assess process environment with standard library functions."""
     if not platform.platform(aliased=True, terse=True).lower().startswith('windows'):
@@ -43,39 +156,6 @@ def assess(options: argparse.Namespace) -> EnvType:
     )
     flags = {name: getattr(sys.flags, name) for name in names if getattr(sys.flags, name)}
 
-    if 'resource' in sys.modules:
-        res_self = resource.getrusage(resource.RUSAGE_SELF)
-        ru_utime_msec = res_self.ru_utime  # time spent executing in user mode in seconds (usec resolution)
-        ru_utime_msec *= 1e3
-        ru_utime_msec_usec_precision = round(ru_utime_msec, 3)
-        ru_stime_msec = res_self.ru_stime  # time spent executing in kernel mode in seconds (usec resolution)
-        ru_stime_msec *= 1e3
-        ru_stime_msec_usec_precision = round(ru_stime_msec, 3)
-        ru_maxrss = float(res_self.ru_maxrss)  # maximum resident set size used (linux in kilobytes)
-        if platform.platform(aliased=True, terse=True).lower().startswith('macos'):  # pragma: no cover
-            ru_maxrss /= 1024  # "man 2 getrusage" on MacOS indicates unit is bytes
-        ru_maxrss_mbytes_kbytes_precision = round(ru_maxrss / 1024, 3)
-        ru_minflt = res_self.ru_minflt  # number of page faults serviced without any I/O activity
-        ru_majflt = res_self.ru_majflt  # number of page faults serviced that required I/O activity
-        ru_inblock = res_self.ru_inblock  # number of times the filesystem had to perform input
-        ru_oublock = res_self.ru_oublock  # number of times the filesystem had to perform output
-        ru_nvcsw = res_self.ru_nvcsw  # number of times a context switch resulted due to a process
-        # voluntarily giving up the processor before its time slice
-        # was completed
-        ru_nivcsw = res_self.ru_nivcsw  # number of times a context switch resulted due to a higher
-        # priority process becoming runnable or because the current
-        # process exceeded its time slice
-    else:
-        ru_utime_msec_usec_precision = -1
-        ru_stime_msec_usec_precision = -1
-        ru_maxrss_mbytes_kbytes_precision = -1
-        ru_minflt = -1
-        ru_majflt = -1
-        ru_inblock = -1
-        ru_oublock = -1
-        ru_nvcsw = -1
-        ru_nivcsw = -1
-
     data = {
         'library-env': {
             'debug-mode': options.debug,
@@ -113,17 +193,7 @@ def assess(options: argparse.Namespace) -> EnvType:
             'os-nodename': os_nodename,
             'os-version': os_version,
         },
-        'os-resource-usage': {
-            'ru-maxrss-mbytes-kbytes-precision': ru_maxrss_mbytes_kbytes_precision,
-            'ru-utime-msec-usec-precision': ru_utime_msec_usec_precision,
-            'ru-stime-msec-usec-precision': ru_stime_msec_usec_precision,
-            'ru-minflt': ru_minflt,
-            'ru-majflt': ru_majflt,
-            'ru-inblock': ru_inblock,
-            'ru-outblock': ru_oublock,
-            'ru_nvcsw': ru_nvcsw,
-            'ru_nivcsw': ru_nivcsw,
-        },
+        'os-resource-usage': resource_usage(),
         'os-cpu-resources': {
             'os-cpu-present': os_cpu_present,
             'os-cpu-available': os_cpu_available,
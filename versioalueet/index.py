@@ -0,0 +1,158 @@
+"""Provide the class VersionRangesIndex answering which of many version ranges include a version.
+
+Use case example:
+
+>>> index = VersionRangesIndex()
+>>> index.add(VersionRanges('vers:pypi/>=1.0|<2.0'), label='ADV-1')
+>>> index.add(VersionRanges('vers:pypi/<1.5'), label='ADV-2')
+>>> sorted(index.stab('pypi', '1.2'))
+['ADV-1', 'ADV-2']
+>>> index.stab('pypi', '1.7')
+['ADV-1']
+"""
+
+from bisect import bisect_left
+from collections.abc import Hashable
+from typing import Union
+
+from versioalueet.api import IntervalTableType, VersionRanges
+from versioalueet.schemes import VersionKeyType, key_function
+
+LabelType = Hashable
+SegmentTreeType = tuple[list[VersionKeyType], int, list[Union[list[int], None]]]
+
+
+def _runs(members: list[bool]) -> list[tuple[int, int]]:
+    """Collect the inclusive region slot pairs of maximal runs of members.
+
+    Usage examples:
+
+    >>> _runs([False, True, True, False, True, False, False])
+    [(1, 2), (4, 4)]
+
+    >>> _runs([True])
+    [(0, 0)]
+    """
+    runs = []
+    start = -1
+    for slot, inside in enumerate(members):
+        if inside and start < 0:
+            start = slot
+        elif not inside and start >= 0:
+            runs.append((start, slot - 1))
+            start = -1
+    if start >= 0:
+        runs.append((start, len(members) - 1))
+    return runs
+
+
+def _store(nodes: list[Union[list[int], None]], node: int, entry: int) -> None:
+    """Append the entry to the bucket of the node creating the bucket on first use."""
+    bucket = nodes[node]
+    if bucket is None:
+        nodes[node] = [entry]
+    else:
+        bucket.append(entry)
+
+
+def _build(compiled: list[IntervalTableType]) -> SegmentTreeType:
+    """Build the segment tree over the elementary regions of all boundaries of the compiled intervals.
+
+    Implementer notes:
+
+    - for m distinct boundaries there are 2m + 1 elementary regions (below, at, and between the boundaries)
+    - every run of included regions of an entry is stored at the O(log m) canonical nodes covering it
+    - the runs of one entry are disjoint, so any leaf to root path meets an entry at most once
+    """
+    bounds = sorted({bound for entry_bounds, _ in compiled for bound in entry_bounds})
+    slots = {bound: slot for slot, bound in enumerate(bounds)}
+    size = 2 * len(bounds) + 1
+    nodes: list[Union[list[int], None]] = [None] * (2 * size)
+
+    for entry, (entry_bounds, members) in enumerate(compiled):
+        places = [slots[bound] for bound in entry_bounds]
+        count = len(places)
+        for first, last in _runs(members):
+            if first % 2:
+                low = 2 * places[first // 2] + 1
+            else:
+                low = 0 if not first else 2 * places[first // 2 - 1] + 2
+            if last % 2:
+                high = 2 * places[last // 2] + 1
+            else:
+                high = size - 1 if last // 2 == count else 2 * places[last // 2]
+
+            low, high = low + size, high + size + 1
+            while low < high:
+                if low & 1:
+                    _store(nodes, low, entry)
+                    low += 1
+                if high & 1:
+                    high -= 1
+                    _store(nodes, high, entry)
+                low >>= 1
+                high >>= 1
+
+    return bounds, size, nodes
+
+
+class VersionRangesIndex:
+    """Stabbing index over many version ranges grouped by versioning scheme.
+
+    The segment tree of a versioning scheme is (re)built lazily at the first stab after additions.
+    Every stab then costs O(log N + k) for N boundaries and k matching version ranges.
+
+    Usage examples:
+
+    >>> index = VersionRangesIndex([VersionRanges('vers:npm/<2.0.0'), VersionRanges('vers:npm/!=1.0.0')])
+    >>> len(index)
+    2
+    >>> index.stab('npm', '1.0.0')
+    [VersionRanges('vers:npm/<2.0.0')]
+    >>> index.stab('pypi', '1.0.0')
+    []
+    """
+
+    def __init__(self, version_ranges: Union[list[VersionRanges], None] = None) -> None:
+        """Optionally add version ranges labeled by themselves."""
+        self._entries: dict[str, list[tuple[LabelType, IntervalTableType]]] = {}
+        self._trees: dict[str, SegmentTreeType] = {}
+        for entry in version_ranges or []:
+            self.add(entry)
+
+    def add(self, version_ranges: VersionRanges, label: Union[LabelType, None] = None) -> None:
+        """Add valid version ranges with a label (default is the version ranges object itself)."""
+        _, intervals = version_ranges._compiled()
+        scheme = version_ranges.versioning_scheme
+        self._entries.setdefault(scheme, []).append((version_ranges if label is None else label, intervals))
+        self._trees.pop(scheme, None)
+
+    def stab(self, versioning_scheme: str, version: str) -> list[LabelType]:
+        """Provide the labels of all version ranges of the versioning scheme including the version (in no order)."""
+        entries = self._entries.get(versioning_scheme)
+        if not entries:
+            return []
+        version = version.strip()
+        if not version:
+            raise ValueError('version to stab with must be non empty')
+
+        tree = self._trees.get(versioning_scheme)
+        if tree is None:
+            tree = self._trees[versioning_scheme] = _build([intervals for _, intervals in entries])
+        bounds, size, nodes = tree
+
+        version_key = key_function(versioning_scheme)(version)
+        slot = bisect_left(bounds, version_key)
+        region = 2 * slot + 1 if slot < len(bounds) and bounds[slot] == version_key else 2 * slot
+
+        labels = []
+        node = region + size
+        while node:
+            for entry in nodes[node] or ():
+                labels.append(entries[entry][0])
+            node >>= 1
+        return labels
+
+    def __len__(self) -> int:
+        """The number of indexed version ranges."""
+        return sum(len(entries) for entries in self._entries.values())
@@ -0,0 +1,236 @@
+"""Provide containment matrices of many versions against many version ranges (optionally vectorized per NumPy).
+
+Implementer notes:
+
+- the versions and the boundary versions of all version ranges sharing a rank table are ranked in one batch
+- the ranks of the versions are sorted once, so every version range cuts the sorted ranks into runs of equal verdicts
+- the pure Python matrix is the default, the NumPy masks are only available when NumPy is installed
+
+The command line prints the matrix per version ranges as CSV, NDJSON, or bitmap (see main).
+
+Use case example:
+
+>>> ranges = [VersionRanges('vers:pypi/>=1.0|<2.0'), VersionRanges('vers:npm/<1.5.0'), VersionRanges('vers:pypi/*')]
+>>> contains_matrix(['1.2.0', '2.0.0'], ranges)
+[[True, True, True], [False, False, True]]
+"""
+
+import argparse
+import csv
+import importlib.util
+import json
+import sys
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from itertools import chain
+from typing import TYPE_CHECKING, Any
+
+from versioalueet import log
+from versioalueet.api import VersionRanges, validate
+from versioalueet.schemes import RankTable, rank_table
+
+if TYPE_CHECKING:  # pragma: no cover
+    from numpy.typing import NDArray  # type: ignore[import-not-found, unused-ignore]
+
+HAS_NUMPY = importlib.util.find_spec('numpy') is not None  # imported on the first call of contains_masks
+
+CSV = 'csv'
+NDJSON = 'ndjson'
+BITMAP = 'bitmap'
+FORMATS = (CSV, NDJSON, BITMAP)
+INCLUDED = 3
+
+RankedIntervalsType = tuple[list[int], list[bool]]
+
+
+def _stripped(versions: Sequence[str]) -> list[str]:
+    """Strip the versions and refuse empty ones."""
+    stripped = [version.strip() for version in versions]
+    if not all(stripped):
+        raise ValueError('versions to assess for inclusion must be non empty')
+    return stripped
+
+
+def _groups(version_ranges: Sequence[VersionRanges]) -> dict[RankTable, list[int]]:
+    """Group the column indices of the version ranges per rank table of their versioning schemes.
+
+    Usage examples:
+
+    >>> groups = _groups([VersionRanges('vers:npm/1'), VersionRanges('vers:pypi/1'), VersionRanges('vers:npm/2')])
+    >>> list(groups.values())
+    [[0, 2], [1]]
+    """
+    groups: dict[RankTable, list[int]] = {}
+    for column, item in enumerate(version_ranges):
+        if item.failed:
+            raise ValueError(f'cannot assess inclusion for invalid version ranges ({item.model["error"]})')
+        groups.setdefault(rank_table(item.versioning_scheme), []).append(column)
+    return groups
+
+
+def _ranked(
+    versions: list[str], group: list[VersionRanges], table: RankTable
+) -> tuple[list[int], list[RankedIntervalsType]]:
+    """Rank the versions and the boundary versions of the group of version ranges in one batch.
+
+    The ranks come from a private table (sharing the memoized keys of the scheme table),
+    so the shared table neither overflows nor changes its generation for large matrices.
+
+    Usage examples:
+
+    >>> probes, intervals = _ranked(['2', '0'], [VersionRanges('vers:pypi/>=1|<3')], rank_table('pypi'))
+    >>> probes[1] < intervals[0][0][0] < probes[0] < intervals[0][0][1], intervals[0][1]
+    (True, [False, True, True, False, False])
+    """
+    boundaries = [item._versions() for item in group]
+    flat = list(chain.from_iterable(bounds for bounds, _ in boundaries))
+    ranks = RankTable(table.key, maxsize=max(len(versions) + len(flat), 1)).ranks(versions + flat)
+    intervals, offset = [], len(versions)
+    for bounds, (_, members) in boundaries:
+        intervals.append((ranks[offset : offset + len(bounds)], members))
+        offset += len(bounds)
+    return ranks[: len(versions)], intervals
+
+
+def _edges(ordered: list[int], bounds: list[int]) -> list[int]:
+    """Cut the sorted ranks into the runs of the interval table (below, at, and above every boundary).
+
+    Usage examples:
+
+    >>> _edges([1, 2, 2, 5, 7], [2, 6])
+    [0, 1, 3, 4, 4, 5]
+    """
+    edges = [0]
+    for bound in bounds:
+        edges.append(bisect_left(ordered, bound))
+        edges.append(bisect_right(ordered, bound))
+    edges.append(len(ordered))
+    return edges
+
+
+def contains_matrix(versions: Sequence[str], version_ranges: Sequence[VersionRanges]) -> list[list[bool]]:
+    """Assess the inclusion of every version in every version ranges as one row of verdicts per version.
+
+    Usage examples:
+
+    >>> contains_matrix(['3', '1'], [VersionRanges('vers:pypi/>=1|!=3|<5'), VersionRanges('vers:pypi/3')])
+    [[False, True], [True, False]]
+
+    >>> contains_matrix(['1'], [])
+    [[]]
+    """
+    stripped = _stripped(versions)
+    rows = [[False] * len(version_ranges) for _ in stripped]
+    for table, columns in _groups(version_ranges).items():
+        probes, intervals = _ranked(stripped, [version_ranges[column] for column in columns], table)
+        order = sorted(range(len(probes)), key=probes.__getitem__)
+        ordered = [probes[index] for index in order]
+        for column, (bounds, members) in zip(columns, intervals):
+            edges = _edges(ordered, bounds)
+            for slot, member in enumerate(members):
+                if member:
+                    for index in order[edges[slot] : edges[slot + 1]]:
+                        rows[index][column] = True
+    return rows
+
+
+def contains_masks(versions: Sequence[str], version_ranges: Sequence[VersionRanges]) -> 'NDArray[Any]':
+    """Assess the inclusion of every version in every version ranges as boolean NumPy array (versions × ranges).
+
+    Implementer notes:
+
+    - requires NumPy (see HAS_NUMPY), the rows and columns match the ones of contains_matrix
+    - per rank table one searchsorted call locates all boundaries within the sorted ranks of the versions
+    - the runs of all version ranges of a rank table expand in one repeat call (the result is a transposed view)
+    """
+    if not HAS_NUMPY:
+        raise ImportError('containment masks require NumPy')
+    import numpy  # type: ignore[import-not-found, unused-ignore]
+
+    stripped = _stripped(versions)
+    count = len(stripped)
+    masks: 'NDArray[Any]' = numpy.zeros((len(version_ranges), count), dtype=numpy.bool_)
+    if not count:
+        return masks.T
+    for table, columns in _groups(version_ranges).items():
+        probes, intervals = _ranked(stripped, [version_ranges[column] for column in columns], table)
+        ranks = numpy.array(probes, dtype=numpy.int64)
+        order = numpy.argsort(ranks, kind='stable')
+        ordered = ranks[order]
+
+        sizes = numpy.array([len(bounds) for bounds, _ in intervals], dtype=numpy.int64)
+        bounds = numpy.fromiter(chain.from_iterable(bounds for bounds, _ in intervals), dtype=numpy.int64)
+        starts = numpy.concatenate(([0], numpy.cumsum(2 * sizes + 2)[:-1]))
+        edges = numpy.zeros(int(numpy.sum(2 * sizes + 2)), dtype=numpy.int64)
+        edges[starts + 2 * sizes + 1] = count
+        if len(bounds):
+            firsts = numpy.concatenate(([0], numpy.cumsum(sizes)[:-1]))
+            offsets = numpy.arange(len(bounds)) - numpy.repeat(firsts, sizes)
+            slots = numpy.repeat(starts, sizes) + 2 * offsets + 1
+            edges[slots] = numpy.searchsorted(ordered, bounds, side='left')
+            edges[slots + 1] = numpy.searchsorted(ordered, bounds, side='right')
+        runs = numpy.delete(numpy.diff(edges), starts[1:] - 1)
+        members = numpy.fromiter(chain.from_iterable(members for _, members in intervals), dtype=numpy.bool_)
+        swept = numpy.repeat(members, runs).reshape(len(columns), count)
+        masks[numpy.array(columns)[:, None], order[None, :]] = swept
+    return masks.T
+
+
+def main(options: argparse.Namespace) -> int:
+    """Print the inclusion matrix with one row per version ranges and one column per version in the format requested.
+
+    Implementer notes:
+
+    - all version ranges are parsed and compiled once, the versions are ranked once per versioning scheme
+    - csv has a header row naming the versions and one row per version ranges with 1 (in) or 0 (out) per version
+    - ndjson has one record per version ranges like streaming with the verdicts per version as contains member
+    - bitmap has one line per version ranges with one character per version (1, 0, or - if invalid) and the ranges
+    - the exit code is 2 for empty versions, 1 for invalid version ranges, 3 if any version is included, else 0
+
+    Usage examples:
+
+    >>> main(argparse.Namespace(version_ranges=['vers:npm/<2', 'vers:npm/>3'], versions=['1', '2'], matrix='bitmap'))
+    10 vers:npm/<2
+    00 vers:npm/>3
+    3
+    """
+    from versioalueet.bulk import _error_record
+
+    versions = [version.strip() for version in options.versions]
+    if not all(versions):
+        log.error('received empty or space only version identifiers for inclusion test')
+        return 2
+    received = [''.join(text.split()) for text in options.version_ranges]
+    parsed = [VersionRanges(text, lean=True) for text in received]
+    valid = [item for item in parsed if not item.failed]
+    rows = contains_matrix(versions, valid)
+    columns = iter([list(column) for column in zip(*rows)] if versions else [[] for _ in valid])
+
+    writer = csv.writer(sys.stdout, lineterminator='\n')
+    if options.matrix == CSV:
+        writer.writerow(['version-ranges', *versions])
+    invalid, included = 0, 0
+    for line, (text, item) in enumerate(zip(received, parsed), start=1):
+        if item.failed:
+            invalid += 1
+            if options.matrix == NDJSON:
+                print(json.dumps(_error_record(line, text, *validate(text))))
+            elif options.matrix == CSV:
+                writer.writerow([text, *([''] * len(versions))])
+            else:
+                print('-' * len(versions), text)
+            continue
+        column = next(columns)
+        included += sum(column)
+        if options.matrix == NDJSON:
+            print(json.dumps({'line': line, 'input': text, 'normalized': str(item), 'contains': column}))
+        elif options.matrix == CSV:
+            writer.writerow([str(item), *(int(inside) for inside in column)])
+        else:
+            print(''.join('1' if inside else '0' for inside in column), item)
+    sys.stdout.flush()
+    log.info(
+        'assessed %d versions against %d version ranges (%d invalid) with %d inclusions'
+        % (len(versions), len(parsed), invalid, included)
+    )
+    return 1 if invalid else INCLUDED if included else 0
@@ -0,0 +1,166 @@
+"""Provide low overhead counters and timers for the phases of parsing version ranges.
+
+Implementer notes:
+
+- recording is disabled by default and parsing then only checks one flag per version range
+- per phase the calls, the rejections, the total and maximum latency, and a bounded sample of latencies are kept
+- the sample is a reservoir (every latency has the same chance to be in it), so the percentiles need constant memory
+- the valid version ranges take the tokenize, sort, optimize, and model phases (the latter only if not lean),
+  and the invalid ones after the tokenize phase run the diagnostic parse phases from uri-scheme to pairs
+- validation (like in bulk processing before parsing) records its rejections under the tokenize or sort phase
+
+Use case example:
+
+>>> from versioalueet.api import VersionRanges
+>>> enable()
+>>> _ = VersionRanges('vers:pypi/>=1|<2'), VersionRanges('vers:pypi/1|1.0')
+>>> disable()
+>>> {phase: (entry['calls'], entry['rejected']) for phase, entry in report().items()}
+{'tokenize': (2, 0), 'sort': (2, 1), 'optimize': (1, 0), 'model': (1, 0)}
+>>> reset()
+"""
+
+import random
+from math import ceil
+from time import perf_counter_ns
+from typing import Union
+
+TOKENIZE = 'tokenize'
+SORT = 'sort'
+OPTIMIZE = 'optimize'
+MODEL = 'model'
+URI_SCHEME = 'uri-scheme'
+VERSIONING_SCHEME = 'versioning-scheme'
+SPLIT = 'split'
+PAIRS = 'pairs'
+PHASES = (TOKENIZE, SORT, OPTIMIZE, MODEL, URI_SCHEME, VERSIONING_SCHEME, SPLIT, PAIRS)
+
+PERCENTILES = (50, 90, 99)
+SAMPLE_SIZE = 4096
+
+PhaseReportType = dict[str, Union[int, float]]
+
+
+def _percentile(ordered: list[int], percent: int) -> int:
+    """The nearest rank percentile of the sorted values (zero if none).
+
+    Usage examples:
+
+    >>> _percentile([10, 20, 30, 40], 50), _percentile([10, 20, 30, 40], 99), _percentile([], 50)
+    (20, 40, 0)
+    """
+    if not ordered:
+        return 0
+    return ordered[max(ceil(percent * len(ordered) / 100) - 1, 0)]
+
+
+class PhaseStats:
+    """Counters, timers, and latency samples per parse phase recording only while enabled.
+
+    Usage examples:
+
+    >>> phase_stats = PhaseStats()
+    >>> started = phase_stats.record(SORT, phase_stats.start(), rejected=True)
+    >>> phase_stats.report()[SORT]['rejected']
+    1
+    """
+
+    def __init__(self, sample_size: int = SAMPLE_SIZE) -> None:
+        """The sample size bounds the latencies kept per phase for the percentiles."""
+        if sample_size < 1:
+            raise ValueError('phase statistics sample size must be positive')
+        self.enabled = False
+        self.sample_size = sample_size
+        self._random = random.Random(0)
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget everything recorded so far (the enabled state is kept)."""
+        self._calls = dict.fromkeys(PHASES, 0)
+        self._rejected = dict.fromkeys(PHASES, 0)
+        self._total_ns = dict.fromkeys(PHASES, 0)
+        self._max_ns = dict.fromkeys(PHASES, 0)
+        self._samples: dict[str, list[int]] = {phase: [] for phase in PHASES}
+
+    @staticmethod
+    def start() -> int:
+        """The clock reading (in nanoseconds) the first phase started at."""
+        return perf_counter_ns()
+
+    def record(self, phase: str, started: int, rejected: bool = False) -> int:
+        """Record the phase ending now and return the clock reading the next phase starts at."""
+        elapsed = perf_counter_ns() - started
+        calls = self._calls[phase] = self._calls[phase] + 1
+        self._rejected[phase] += rejected
+        self._total_ns[phase] += elapsed
+        if elapsed > self._max_ns[phase]:
+            self._max_ns[phase] = elapsed
+        samples = self._samples[phase]
+        if len(samples) < self.sample_size:
+            samples.append(elapsed)
+        else:
+            slot = self._random.randrange(calls)
+            if slot < self.sample_size:
+                samples[slot] = elapsed
+        return perf_counter_ns()
+
+    def report(self) -> dict[str, PhaseReportType]:
+        """Report the phases called so far in parse order with latencies in microseconds."""
+        reported = {}
+        for phase in PHASES:
+            calls = self._calls[phase]
+            if not calls:
+                continue
+            ordered = sorted(self._samples[phase])
+            entry: PhaseReportType = {
+                'calls': calls,
+                'rejected': self._rejected[phase],
+                'total-usec': round(self._total_ns[phase] / 1e3, 3),
+            }
+            for percent in PERCENTILES:
+                entry[f'p{percent}-usec'] = round(_percentile(ordered, percent) / 1e3, 3)
+            entry['max-usec'] = round(self._max_ns[phase] / 1e3, 3)
+            reported[phase] = entry
+        return reported
+
+    def table(self) -> str:
+        """Format the report as text table with one row per phase called.
+
+        Usage examples:
+
+        >>> print(PhaseStats().table())
+        phase                     calls     rejected   total-usec     p50-usec     p90-usec     p99-usec     max-usec
+        """
+        columns = ('calls', 'rejected', 'total-usec', *(f'p{percent}-usec' for percent in PERCENTILES), 'max-usec')
+        lines = [f'{"phase":<18}' + ''.join(f'{column:>13}' for column in columns)]
+        for phase, entry in self.report().items():
+            lines.append(f'{phase:<18}' + ''.join(f'{entry[column]:>13}' for column in columns))
+        return '\n'.join(lines)
+
+
+PHASE_STATS = PhaseStats()
+
+
+def enable() -> None:
+    """Start recording the parse phases."""
+    PHASE_STATS.enabled = True
+
+
+def disable() -> None:
+    """Stop recording the parse phases (keeping what was recorded)."""
+    PHASE_STATS.enabled = False
+
+
+def reset() -> None:
+    """Forget what was recorded for the parse phases."""
+    PHASE_STATS.reset()
+
+
+def report() -> dict[str, PhaseReportType]:
+    """Report calls, rejections, and latencies in microseconds per parse phase called."""
+    return PHASE_STATS.report()
+
+
+def table() -> str:
+    """Format the report of the parse phases called as text table."""
+    return PHASE_STATS.table()
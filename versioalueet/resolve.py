@@ -0,0 +1,103 @@
+"""Provide the function best_match resolving the highest (or lowest) available version satisfying version ranges.
+
+Use case example:
+
+>>> catalog = ['1.0.0', '1.2.0', '1.10.0', '2.0.0', '2.1.0']
+>>> best_match(catalog, VersionRanges('vers:npm/>=1.0.0|<2.1.0'), VersionRanges('vers:npm/!=2.0.0'))
+'1.10.0'
+>>> best_match(catalog, VersionRanges('vers:npm/>1.0.0'), highest=False)
+'1.2.0'
+>>> best_match(catalog, VersionRanges('vers:npm/>3.0.0')) is None
+True
+"""
+
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from typing import Union
+
+from versioalueet.api import IntervalTableType, VersionRanges, _merge_intervals
+from versioalueet.schemes import KeyFunctionType, VersionKeyType, rank_table
+
+
+class _Keys:
+    """Sequence view of the sort keys of the sorted versions computing only the keys the bisection looks at."""
+
+    __slots__ = ('_versions', '_key')
+
+    def __init__(self, versions: Sequence[str], key: KeyFunctionType) -> None:
+        """The versions sorted per the key function."""
+        self._versions = versions
+        self._key = key
+
+    def __len__(self) -> int:
+        """The number of versions."""
+        return len(self._versions)
+
+    def __getitem__(self, index: int) -> VersionKeyType:
+        """The sort key of the version at the index."""
+        return self._key(self._versions[index])
+
+
+def _intersection(version_ranges: Sequence[VersionRanges]) -> tuple[str, IntervalTableType]:
+    """Merge the interval tables of the version ranges (of one versioning scheme) into the table of their intersection.
+
+    Usage examples:
+
+    >>> _intersection([VersionRanges('vers:pypi/>=1|<5'), VersionRanges('vers:pypi/>3')])[1][1]
+    [False, False, False, False, True, False, False]
+    """
+    for item in version_ranges:
+        if item.failed:
+            raise ValueError(f'cannot match invalid version ranges ({item.model["error"]})')
+    versioning_scheme = version_ranges[0].versioning_scheme
+    versions, intervals = version_ranges[0]._versions()
+    for item in version_ranges[1:]:
+        if item.versioning_scheme != versioning_scheme:
+            raise ValueError(
+                f'cannot match version ranges of versioning schemes {versioning_scheme} and {item.versioning_scheme}'
+            )
+        other_versions, other = item._versions()
+        versions, intervals = _merge_intervals(intervals, versions, other, other_versions, bool.__and__)
+    return versioning_scheme, intervals
+
+
+def best_match(catalog: Sequence[str], *version_ranges: VersionRanges, highest: bool = True) -> Union[str, None]:
+    """Resolve the highest (or lowest) version of the catalog included in all version ranges (None if there is none).
+
+    Implementer notes:
+
+    - the catalog must be sorted ascending per the versioning scheme of the version ranges
+      (like sorted(versions, key=key_function(versioning_scheme)))
+    - the interval tables of the version ranges are intersected in one pass per version ranges
+    - the included regions are visited from the top (or the bottom) and each one bisects the catalog,
+      so the cost is O(n log m) for n boundaries and m catalog versions and only the keys bisected are computed
+    - without version ranges every catalog version matches
+
+    Usage examples:
+
+    >>> best_match(['1.0', '2.0', '3.0'], VersionRanges('vers:pypi/!=3.0'), VersionRanges('vers:pypi/*'))
+    '2.0'
+    >>> best_match(['1.0', '2.0'], highest=False)
+    '1.0'
+    """
+    if not catalog:
+        return None
+    if not version_ranges:
+        return catalog[-1] if highest else catalog[0]
+
+    versioning_scheme, (bounds, members) = _intersection(version_ranges)
+    keys = _Keys(catalog, rank_table(versioning_scheme).key)
+    count = len(catalog)
+    slots = range(len(members) - 1, -1, -1) if highest else range(len(members))
+    for slot in slots:
+        if not members[slot]:
+            continue
+        index = slot // 2
+        if slot % 2:
+            low, high = bisect_left(keys, bounds[index]), bisect_right(keys, bounds[index])
+        else:
+            low = bisect_right(keys, bounds[index - 1]) if index else 0
+            high = bisect_left(keys, bounds[index]) if index < len(bounds) else count
+        if low < high:
+            return catalog[high - 1] if highest else catalog[low]
+    return None
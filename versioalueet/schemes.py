@@ -0,0 +1,410 @@
+"""Provide the registry of versioning schemes mapping version strings to comparable sort keys.
+
+Every key function turns a version string once into a tuple that compares cheaply and in the order
+of the versioning scheme.
+Keys of one scheme always share the same shape, so any two keys of a scheme can be compared.
+
+Use case example:
+
+>>> sorted(['10.0', '9.0', '9.0rc1'], key=key_function('pypi'))
+['9.0rc1', '9.0', '10.0']
+"""
+
+import itertools
+import re
+from bisect import bisect_left, insort
+from collections.abc import Iterable
+from typing import Any, Callable, Union
+
+VersionKeyType = tuple[Any, ...]
+KeyFunctionType = Callable[[str], VersionKeyType]
+
+GENERIC = 'generic'
+
+_SEGMENTS = re.compile(r'(\d+)|([^\W\d_]+)')
+_NUMERIC = 1
+_ALPHA = 0
+
+
+def generic_key(version: str) -> VersionKeyType:
+    """Natural order of alternating numeric and alphabetic segments (separators only break ties).
+
+    Implementer notes:
+
+    - numeric segments compare as integers and sort after alphabetic segments at the same position
+    - a version that is a prefix of another version sorts first
+    - versions with equal segments (like 1.0 and 1_0 or 1.0 and 1.00) are ordered by the version string,
+      so distinct versions of schemes without a registered key function never count as duplicates
+
+    Usage examples:
+
+    >>> sorted(['1.10', '1.9', '1.9a', '1.9.1'], key=generic_key)
+    ['1.9', '1.9a', '1.9.1', '1.10']
+
+    >>> sorted(['1_0', '1.00', '1.0'], key=generic_key)
+    ['1.0', '1.00', '1_0']
+    """
+    segments = tuple(
+        (_NUMERIC, int(digits), '') if digits else (_ALPHA, 0, letters.lower())
+        for digits, letters in _SEGMENTS.findall(version)
+    )
+    return segments, version
+
+
+def intdot_key(version: str) -> VersionKeyType:
+    """Dot separated integers with a generic fallback sorting before all valid versions.
+
+    Usage examples:
+
+    >>> sorted(['1.10', '1.9', 'x'], key=intdot_key)
+    ['x', '1.9', '1.10']
+    """
+    parts = version.split('.')
+    if all(part.isdigit() for part in parts):
+        return 1, tuple(int(part) for part in parts)
+    return 0, generic_key(version)
+
+
+def semver_key(version: str) -> VersionKeyType:
+    """Semantic versioning precedence (a leading v as in golang is accepted and build metadata ignored).
+
+    Implementer notes:
+
+    - missing minor or patch parts count as zero
+    - a release sorts after all its pre-releases
+    - numeric pre-release identifiers sort before alphanumeric ones
+
+    Usage examples:
+
+    >>> sorted(['1.0.0', '1.0.0-rc.1', '1.0.0-alpha', '1.0.0-alpha.1', '0.9.12'], key=semver_key)
+    ['0.9.12', '1.0.0-alpha', '1.0.0-alpha.1', '1.0.0-rc.1', '1.0.0']
+
+    >>> sorted(['v10.0.0', 'v9.1.0', 'v9.1.0+build.7'], key=semver_key)[0]
+    'v9.1.0'
+    """
+    core, _, _ = version.partition('+')
+    if core[:1] in ('v', 'V'):
+        core = core[1:]
+    core, dash, pre_release = core.partition('-')
+    parts = [(int(part), '') if part.isdigit() else (-1, part) for part in core.split('.')]
+    parts.extend([(0, '')] * (3 - len(parts)))
+    if not dash:
+        return tuple(parts), 1, ()
+    identifiers = tuple(
+        (0, int(identifier), '') if identifier.isdigit() else (1, 0, identifier)
+        for identifier in pre_release.split('.')
+    )
+    return tuple(parts), 0, identifiers
+
+
+_PEP440_PATTERN = r"""
+    ^v?
+    (?:(?P<epoch>[0-9]+)!)?
+    (?P<release>[0-9]+(?:\.[0-9]+)*)
+    (?P<pre>[-_.]?(?P<pre_l>alpha|a|beta|b|preview|pre|c|rc)[-_.]?(?P<pre_n>[0-9]+)?)?
+    (?P<post>(?:-(?P<post_n1>[0-9]+))|(?:[-_.]?(?P<post_l>post|rev|r)[-_.]?(?P<post_n2>[0-9]+)?))?
+    (?P<dev>[-_.]?(?P<dev_l>dev)[-_.]?(?P<dev_n>[0-9]+)?)?
+    (?:\+(?P<local>[a-z0-9]+(?:[-_.][a-z0-9]+)*))?
+    $
+"""
+_pep440: Union[re.Pattern[str], None] = None  # compiled on first use to keep the import fast
+_PEP440_PRE = {'alpha': 'a', 'a': 'a', 'beta': 'b', 'b': 'b', 'c': 'rc', 'pre': 'rc', 'preview': 'rc', 'rc': 'rc'}
+
+
+def pypi_key(version: str) -> VersionKeyType:
+    """Version ordering per PEP 440 with a generic fallback sorting before all valid versions.
+
+    Implementer notes:
+
+    - trailing zeros of the release segment are insignificant
+    - developmental releases sort before pre-releases, which sort before releases, which sort before post-releases
+
+    Usage examples:
+
+    >>> candidates = ['1.0.post1', '1.0', '1.0rc1', '1.0.dev3', '1.0a1', '1.0+local.7', '0.9']
+    >>> sorted(candidates, key=pypi_key)
+    ['0.9', '1.0.dev3', '1.0a1', '1.0rc1', '1.0', '1.0+local.7', '1.0.post1']
+
+    >>> pypi_key('1.0') == pypi_key('1.0.0')
+    True
+    """
+    global _pep440  # pylint: disable=global-statement
+    if _pep440 is None:
+        _pep440 = re.compile(_PEP440_PATTERN, re.VERBOSE | re.IGNORECASE)
+    match = _pep440.match(version.strip())
+    if not match:
+        return 0, generic_key(version)
+
+    release = [int(part) for part in match.group('release').split('.')]
+    while len(release) > 1 and not release[-1]:
+        release.pop()
+
+    if match.group('pre'):
+        pre = (0, _PEP440_PRE[match.group('pre_l').lower()], int(match.group('pre_n') or 0))
+    elif match.group('dev') and not match.group('post'):
+        pre = (-1, '', 0)
+    else:
+        pre = (1, '', 0)
+
+    post = -1
+    if match.group('post'):
+        post = int(match.group('post_n1') or match.group('post_n2') or 0)
+
+    dev = (0, int(match.group('dev_n') or 0)) if match.group('dev') else (1, 0)
+
+    local: VersionKeyType = ()
+    if match.group('local'):
+        local = tuple(
+            (1, int(part), '') if part.isdigit() else (0, 0, part.lower())
+            for part in re.split(r'[-_.]', match.group('local'))
+        )
+
+    return 1, (int(match.group('epoch') or 0), tuple(release), pre, post, dev, local)
+
+
+_MAVEN_QUALIFIERS = {
+    'alpha': 0,
+    'a': 0,
+    'beta': 1,
+    'b': 1,
+    'milestone': 2,
+    'm': 2,
+    'rc': 3,
+    'cr': 3,
+    'snapshot': 4,
+    '': 5,
+    'ga': 5,
+    'final': 5,
+    'release': 5,
+    'sp': 6,
+}
+_MAVEN_RELEASE = 5
+_MAVEN_UNKNOWN = 7
+_MAVEN_ITEMS = re.compile(r'(\d+)|([^\W\d_]+)|([.-])')
+
+
+def maven_key(version: str) -> VersionKeyType:
+    """Simplified maven ComparableVersion ordering of numbers and well known qualifiers.
+
+    Implementer notes:
+
+    - numbers sort after qualifiers and unknown qualifiers sort after service packs in lexical order
+    - trailing zeros and release qualifiers are insignificant
+    - a closing release item makes the comparison of versions with different lengths work
+
+    Usage examples:
+
+    >>> sorted(['1.0', '1.0-sp', '1.0-alpha-1', '1.0-SNAPSHOT', '1.0-rc1', '1.1', '1.0.1'], key=maven_key)
+    ['1.0-alpha-1', '1.0-rc1', '1.0-SNAPSHOT', '1.0', '1.0-sp', '1.0.1', '1.1']
+
+    >>> maven_key('1.0.0') == maven_key('1-final')
+    True
+    """
+    items: list[tuple[int, int, str]] = []
+    for digits, letters, _ in _MAVEN_ITEMS.findall(version.lower()):
+        if digits:
+            items.append((2, int(digits), ''))
+        elif letters:
+            while items and items[-1] == (2, 0, ''):
+                items.pop()
+            rank = _MAVEN_QUALIFIERS.get(letters, _MAVEN_UNKNOWN)
+            items.append((1, rank, letters if rank == _MAVEN_UNKNOWN else ''))
+    while items and items[-1] in ((2, 0, ''), (1, _MAVEN_RELEASE, '')):
+        items.pop()
+    items.append((1, _MAVEN_RELEASE, ''))
+    return tuple(items)
+
+
+SCHEMES: dict[str, KeyFunctionType] = {
+    'cargo': semver_key,
+    'gem': generic_key,
+    GENERIC: generic_key,
+    'golang': semver_key,
+    'hex': semver_key,
+    'intdot': intdot_key,
+    'maven': maven_key,
+    'npm': semver_key,
+    'nuget': semver_key,
+    'pypi': pypi_key,
+    'semver': semver_key,
+}
+
+
+def register(versioning_scheme: str, key: KeyFunctionType) -> None:
+    """Register (or replace) the key function for the versioning scheme.
+
+    Usage examples:
+
+    >>> register('reverse-intdot', lambda version: tuple(-int(part) for part in version.split('.')))
+    >>> sorted(['1', '3', '2'], key=key_function('reverse-intdot'))
+    ['3', '2', '1']
+    >>> del SCHEMES['reverse-intdot']
+    """
+    if not versioning_scheme or versioning_scheme.lower() != versioning_scheme:
+        raise ValueError('versioning scheme must be non empty and lower case')
+    SCHEMES[versioning_scheme] = key
+    _RANK_TABLES.pop(versioning_scheme, None)
+
+
+def key_function(versioning_scheme: str) -> KeyFunctionType:
+    """Provide the key function for the versioning scheme falling back to the generic scheme.
+
+    Usage examples:
+
+    >>> key_function('npm') is semver_key
+    True
+
+    >>> key_function('no-such-scheme') is generic_key
+    True
+    """
+    return SCHEMES.get(versioning_scheme, generic_key)
+
+
+RANK_GAP = 1 << 32
+RANK_TABLE_MAXSIZE = 1 << 18
+_BATCH_INSERT = 16
+_GENERATIONS = itertools.count()
+
+
+class RankTable:
+    """Interning table of the distinct versions of one versioning scheme with their sort keys and integer ranks.
+
+    Implementer notes:
+
+    - every version string is keyed once, and versions with equal keys share the key and the rank
+    - ranks compare like the keys and are spaced apart, so new versions usually fit between the known ones
+    - when no gap is left all ranks are spread out again in a new generation (stale ranks must be renewed)
+    - the table is cleared (a new generation as well) when it grows beyond its maximum size
+    - generations are unique across all tables, so ranks of a replaced table are never taken as current
+
+    Usage examples:
+
+    >>> table = RankTable(pypi_key)
+    >>> table.ranks(['1.0', '2.0', '1.0.0']) == [RANK_GAP, 2 * RANK_GAP, RANK_GAP]
+    True
+    >>> table.rank('1.5') == 3 * RANK_GAP // 2
+    True
+    >>> len(table)
+    4
+    >>> table.get('3.0') is None, len(table)
+    (True, 4)
+    """
+
+    def __init__(self, key: KeyFunctionType, maxsize: int = RANK_TABLE_MAXSIZE) -> None:
+        """The key function of the versioning scheme and the maximum number of versions interned."""
+        self._key = key
+        self.maxsize = maxsize
+        self.generation = next(_GENERATIONS)
+        self._keys: dict[str, VersionKeyType] = {}
+        self._labels: dict[str, int] = {}
+        self._key_labels: dict[VersionKeyType, int] = {}
+        self._sorted: list[VersionKeyType] = []
+
+    def key(self, version: str) -> VersionKeyType:
+        """The (interned) sort key of the version computed once per distinct version string."""
+        key = self._keys.get(version)
+        if key is None:
+            if len(self._keys) >= self.maxsize:
+                self.clear()
+            key = self._keys[version] = self._key(version)
+        return key
+
+    def rank(self, version: str) -> int:
+        """The integer rank of the version (interning the version if new)."""
+        label = self._labels.get(version)
+        if label is None:
+            return self.ranks([version])[0]
+        return label
+
+    def get(self, version: str) -> Union[int, None]:
+        """The integer rank of the version if interned (None otherwise, the table is left unchanged)."""
+        return self._labels.get(version)
+
+    def ranks(self, versions: Iterable[str]) -> list[int]:
+        """The integer ranks of the versions interning all new versions in one batch."""
+        versions = list(versions)
+        distinct = dict.fromkeys(versions)
+        missing = [version for version in distinct if version not in self._labels]
+        if missing:
+            if len(self._keys) + len(missing) > self.maxsize:
+                self.clear()
+                missing = list(distinct)
+            self._insert(missing)
+        labels = self._labels
+        return [labels[version] for version in versions]
+
+    def _insert(self, versions: list[str]) -> None:
+        """Rank the new versions between the known ones (relabeling all if a gap is too small)."""
+        keys, key_labels, ordered = self._keys, self._key_labels, self._sorted
+        for version in versions:
+            if version not in keys:
+                keys[version] = self._key(version)
+        fresh = sorted({keys[version] for version in versions if keys[version] not in key_labels})
+        if fresh and not self._fit(fresh):
+            self._relabel(sorted(ordered + fresh))
+        elif len(fresh) > _BATCH_INSERT:
+            self._sorted = sorted(ordered + fresh)
+        else:
+            for key in fresh:
+                insort(ordered, key)
+        for version in versions:
+            self._labels[version] = self._key_labels[keys[version]]
+
+    def _fit(self, fresh: list[VersionKeyType]) -> bool:
+        """Label the sorted new keys within the gaps between the known keys if all gaps are wide enough."""
+        ordered, key_labels = self._sorted, self._key_labels
+        groups: dict[int, list[VersionKeyType]] = {}
+        for key in fresh:
+            groups.setdefault(bisect_left(ordered, key), []).append(key)
+        placed: dict[VersionKeyType, int] = {}
+        for slot, keys in groups.items():
+            low = key_labels[ordered[slot - 1]] if slot else None
+            high = key_labels[ordered[slot]] if slot < len(ordered) else None
+            if low is None:
+                low = 0 if high is None else high - (len(keys) + 1) * RANK_GAP
+            if high is None:
+                high = low + (len(keys) + 1) * RANK_GAP
+            step = (high - low) // (len(keys) + 1)
+            if not step:
+                return False
+            placed.update((key, low + step * (offset + 1)) for offset, key in enumerate(keys))
+        key_labels.update(placed)
+        return True
+
+    def _relabel(self, ordered: list[VersionKeyType]) -> None:
+        """Spread the ranks of all keys evenly and start a new generation."""
+        self._sorted = ordered
+        key_labels = self._key_labels = {key: (slot + 1) * RANK_GAP for slot, key in enumerate(ordered)}
+        self._labels = {version: key_labels[key] for version, key in self._keys.items() if key in key_labels}
+        self.generation = next(_GENERATIONS)
+
+    def clear(self) -> None:
+        """Forget all versions and start a new generation."""
+        self._keys, self._labels, self._key_labels, self._sorted = {}, {}, {}, []
+        self.generation = next(_GENERATIONS)
+
+    def __len__(self) -> int:
+        """The number of distinct version strings interned."""
+        return len(self._keys)
+
+
+_RANK_TABLES: dict[str, RankTable] = {}
+
+
+def rank_table(versioning_scheme: str) -> RankTable:
+    """Provide the rank table of the versioning scheme (unknown schemes share the table of the generic scheme).
+
+    Usage examples:
+
+    >>> rank_table('npm') is rank_table('npm')
+    True
+
+    >>> rank_table('no-such-scheme') is rank_table(GENERIC)
+    True
+    """
+    if versioning_scheme not in SCHEMES:
+        versioning_scheme = GENERIC
+    table = _RANK_TABLES.get(versioning_scheme)
+    if table is None:
+        table = _RANK_TABLES[versioning_scheme] = RankTable(SCHEMES[versioning_scheme])
+    return table
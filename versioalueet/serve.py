@@ -0,0 +1,263 @@
+"""Provide a local daemon answering version ranges requests over a Unix domain socket (and the client side of it).
+
+Requests and responses are single lines of JSON (NDJSON) and any id member of a request is echoed:
+
+- {"op": "normalize", "vers": "vers:npm/<2|>1"} is answered by {"normalized": "vers:npm/>1|<2"}
+- {"op": "contains", "vers": "vers:npm/<2", "versions": ["1"]} adds {"contains": [true]} to that
+- invalid version ranges are answered with code, position, and error as in bulk processing
+
+Use case example:
+
+>>> cache = ParseCache(lean=True)
+>>> answer({'id': 7, 'op': 'contains', 'vers': 'vers:npm/>=1.0.0|<2.0.0', 'versions': ['1.5.0', '2.0.0']}, cache)
+{'id': 7, 'normalized': 'vers:npm/>=1.0.0|<2.0.0', 'contains': [True, False]}
+"""
+
+import argparse
+import os
+from typing import TYPE_CHECKING, Union
+
+from versioalueet import APP_ALIAS, APP_ENV, ENCODING, log
+from versioalueet.api import ERROR_MESSAGES, ErrorCode, ParseCache, validate
+
+if TYPE_CHECKING:
+    import asyncio
+
+SOCKET_ENV = f'{APP_ENV}_SOCKET'
+NORMALIZE = 'normalize'
+CONTAINS = 'contains'
+BAD_REQUEST = 'bad-request'
+TIMEOUT_SECS = 10.0
+LINE_LIMIT = 1 << 24  # bytes per request line (far beyond the default 64 KiB of asyncio streams)
+
+RequestType = dict[str, object]
+ResponseType = dict[str, object]
+
+
+def socket_path() -> str:
+    """The path of the daemon socket from the environment or in the runtime (or temporary) folder of the user."""
+    configured = os.getenv(SOCKET_ENV, '')
+    if configured:
+        return configured
+    folder = os.getenv('XDG_RUNTIME_DIR', '')
+    if not folder:
+        import tempfile
+
+        folder = tempfile.gettempdir()
+    return os.path.join(folder, f'{APP_ALIAS}.sock')
+
+
+def _bad_request(response: ResponseType, error: str) -> ResponseType:
+    """Complete the response for a malformed request."""
+    response.update({'code': BAD_REQUEST, 'error': error})
+    return response
+
+
+def answer(request: RequestType, cache: ParseCache) -> ResponseType:
+    """Answer a single request using the cache of parsed (and compiled) version ranges.
+
+    Usage examples:
+
+    >>> answer({'op': 'normalize', 'vers': 'vers:pypi/'}, ParseCache())
+    {'code': 'empty-version-constraints', 'position': 10, 'error': 'version constraints must be non empty'}
+
+    >>> answer({'op': 'compare'}, ParseCache())
+    {'code': 'bad-request', 'error': 'operation must be normalize or contains'}
+    """
+    response: ResponseType = {'id': request['id']} if 'id' in request else {}
+    operation, vers = request.get('op'), request.get('vers')
+    if operation not in (NORMALIZE, CONTAINS):
+        return _bad_request(response, f'operation must be {NORMALIZE} or {CONTAINS}')
+    if not isinstance(vers, str):
+        return _bad_request(response, 'vers must be a string')
+
+    code, position = validate(vers)
+    if code is not ErrorCode.OK:
+        response.update({'code': code.value, 'position': position, 'error': ERROR_MESSAGES[code]})
+        return response
+
+    version_ranges = cache.get(vers)
+    response['normalized'] = str(version_ranges)
+    if operation == CONTAINS:
+        versions = request.get('versions')
+        if not isinstance(versions, list) or not all(isinstance(v, str) and v.strip() for v in versions):
+            return _bad_request(response, 'versions must be a list of non empty strings')
+        response['contains'] = version_ranges.contains_many(versions)
+    return response
+
+
+async def _connection(reader: 'asyncio.StreamReader', writer: 'asyncio.StreamWriter', cache: ParseCache) -> None:
+    """Answer the requests of one connection line by line until the client closes its side."""
+    import json
+
+    try:
+        while True:
+            try:
+                line = await reader.readline()
+            except ValueError:
+                writer.write(json.dumps(_bad_request({}, 'request line too long')).encode(ENCODING) + b'\n')
+                await writer.drain()
+                break
+            if not line:
+                break
+            try:
+                request = json.loads(line)
+            except ValueError:
+                response = _bad_request({}, 'request must be a JSON object on one line')
+            else:
+                if isinstance(request, dict):
+                    response = answer(request, cache)
+                else:
+                    response = _bad_request({}, 'request must be a JSON object on one line')
+            writer.write(json.dumps(response).encode(ENCODING) + b'\n')
+            await writer.drain()
+    except ConnectionError as err:  # pragma: no cover
+        log.debug('client went away (%s)' % (err,))
+    finally:
+        writer.close()
+
+
+async def serve(path: str, cache: Union[ParseCache, None] = None) -> None:
+    """Serve connections concurrently on the Unix domain socket until cancelled (removing the socket afterwards).
+
+    The default cache uses the configured disk cache (if any) and saves the entries added when stopping.
+    """
+    import asyncio
+
+    from versioalueet.store import configured
+
+    if available(path):
+        raise RuntimeError(f'a daemon is already serving on {path}')
+    if os.path.exists(path):
+        os.unlink(path)  # stale socket of a daemon that did not clean up
+
+    cache = ParseCache(lean=True, store=configured()) if cache is None else cache
+
+    async def connection(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        await _connection(reader, writer, cache)
+
+    umask = os.umask(0o177)  # the socket is created accessible by the user only
+    try:
+        server = await asyncio.start_unix_server(connection, path=path, limit=LINE_LIMIT)
+    finally:
+        os.umask(umask)
+    log.info('serving on %s' % (path,))
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        if os.path.exists(path):
+            os.unlink(path)
+        if cache.store is not None:
+            cache.store.save()
+            log.info('disk cache %s received %d entries' % (cache.store.path, cache.store.saved))
+        log.info('stopped serving on %s with cache stats %s' % (path, cache.stats()))
+
+
+def available(path: str) -> bool:
+    """Assess if a daemon accepts connections on the socket path.
+
+    Usage examples:
+
+    >>> available('/no/such/folder/versioalueet.sock')
+    False
+    """
+    if not os.path.exists(path):
+        return False
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(path)
+        except OSError:
+            return False
+    return True
+
+
+def owned(path: str) -> bool:
+    """Assess if the socket path belongs to the current user (anyone may create sockets in the temporary folder).
+
+    Usage examples:
+
+    >>> owned('/no/such/folder/versioalueet.sock')
+    False
+    """
+    try:
+        owner = os.stat(path).st_uid
+    except OSError:
+        return False
+    return not hasattr(os, 'getuid') or owner == os.getuid()
+
+
+def forward(requests: list[RequestType], path: Union[str, None] = None) -> Union[list[ResponseType], None]:
+    """Send the requests to the daemon and collect the responses (None if no daemon of the user is running).
+
+    The socket and JSON machinery is imported only if the socket exists, so runs without a daemon stay quick to start.
+
+    Usage examples:
+
+    >>> forward([{'op': 'normalize', 'vers': 'vers:npm/42'}], path='/no/such/folder/versioalueet.sock') is None
+    True
+    """
+    path = socket_path() if path is None else path
+    if not os.path.exists(path):
+        return None
+    if not owned(path):
+        log.warning('ignoring socket %s of another user' % (path,))
+        return None
+    import json
+    import socket
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        client.settimeout(TIMEOUT_SECS)
+        try:
+            client.connect(path)
+        except OSError:
+            return None
+        try:
+            client.sendall(b''.join(json.dumps(request).encode(ENCODING) + b'\n' for request in requests))
+            client.shutdown(socket.SHUT_WR)
+            with client.makefile('rb') as responses:
+                return [json.loads(line) for line in responses]
+        except (OSError, ValueError) as err:
+            log.warning('ignoring daemon on %s that failed to answer (%s)' % (path, err))
+            return None
+
+
+def client(options: argparse.Namespace) -> Union[int, None]:
+    """Forward the version ranges and versions of the command line to a running daemon (None if there is none).
+
+    The output and the exit code are the same as for local processing.
+    """
+    versions = [version.strip() for version in options.versions]
+    if not all(versions):
+        return None
+    request: RequestType = {'op': CONTAINS if versions else NORMALIZE, 'vers': options.version_ranges[0]}
+    if versions:
+        request['versions'] = versions
+    responses = forward([request], options.socket or None)
+    if not responses or responses[0].get('code') == BAD_REQUEST:  # the daemon could not take the request
+        return None
+
+    response = responses[0]
+    if 'error' in response:
+        log.error(response['error'])
+        return 1
+    print(response['normalized'])
+    for version, inside in zip(versions, response.get('contains', [])):  # type: ignore
+        print(f'{"in" if inside else "out"} {version}')
+    return 0
+
+
+def main(options: argparse.Namespace) -> int:
+    """Run the daemon in the foreground until interrupted."""
+    import asyncio
+
+    try:
+        asyncio.run(serve(options.socket or socket_path()))
+    except KeyboardInterrupt:  # pragma: no cover
+        pass
+    except RuntimeError as err:
+        log.error(str(err))
+        return 1
+    return 0
@@ -0,0 +1,199 @@
+"""Provide an optional persistent cache of canonical version ranges across runs.
+
+The cache file maps a hash of the whitespace free version range string to its canonical form
+(versioning scheme and version constraint pairs) in a compact and versioned binary encoding:
+a header with the hash of the library version and the entry count, the hashes in entry order,
+and one block of the codec module.
+Files written by other library versions are discarded, as their canonical forms may differ.
+The file is configured by the environment variable VERSIOALUEET_CACHE or else by the cache member
+of the configuration file .versioalueet.json in the current or the home folder (relative to that file).
+
+Use case example:
+
+>>> import os, tempfile
+>>> with tempfile.TemporaryDirectory() as folder:
+...     path = os.path.join(folder, 'ranges.cache')
+...     DiskCache(path).put('vers:pypi/<44|>42', VersionRanges('vers:pypi/<44|>42'))
+...     DiskCache(path).get('vers:pypi/<44|>42') is None
+...     writer = DiskCache(path)
+...     writer.put('vers:pypi/<44|>42', VersionRanges('vers:pypi/<44|>42'))
+...     writer.save()
+...     DiskCache(path).get('vers:pypi/<44|>42')
+True
+1
+VersionRanges('vers:pypi/>42|<44')
+"""
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from typing import Union
+
+from versioalueet import APP_ENV, DEFAULT_CONFIG_NAME, ENCODING, VERSION, log
+from versioalueet.api import VersionRanges
+from versioalueet.codec import Block, EntryType, encode
+
+STORE_ENV = f'{APP_ENV}_CACHE'
+CONFIG_KEY = 'cache'
+MAGIC = b'VRSC'
+FORMAT_VERSION = 4
+DIGEST_SIZE = 16
+FLUSH_SIZE = 65536
+
+# magic, format version, library version hash, entry count
+HEADER = struct.Struct('<4sB16sI')
+
+
+def digest(version_range: str) -> bytes:
+    """The hash of the whitespace free version range string keying the cache entries.
+
+    Usage examples:
+
+    >>> len(digest('vers:pypi/42')) == DIGEST_SIZE
+    True
+    """
+    return hashlib.blake2b(version_range.encode(ENCODING), digest_size=DIGEST_SIZE).digest()
+
+
+STAMP = digest(VERSION)
+
+
+class DiskCache:
+    """Persistent cache of canonical version ranges loaded lazily on the first lookup and written on save.
+
+    Implementer notes:
+
+    - loading indexes the hashes and decodes the columns of the block, an entry is decoded when it is looked up
+    - unreadable files and files of other format or library versions are ignored (and replaced on save)
+    - saving writes a temporary file next to the cache file and renames it, so readers never see partial files
+    - read only caches (like the ones of worker processes) ignore added entries
+    - the added entries are saved whenever their number reaches the flush size, so memory use stays bounded
+    """
+
+    def __init__(self, path: str, read_only: bool = False, flush_size: int = FLUSH_SIZE) -> None:
+        """The path of the cache file (which need not exist yet)."""
+        self.path = path
+        self.read_only = read_only
+        self.flush_size = flush_size
+        self._block: Union[Block, None] = None
+        self._index: Union[dict[bytes, int], None] = None
+        self._added: dict[bytes, EntryType] = {}
+        self.hits, self.misses, self.saved = 0, 0, 0
+
+    def _load(self) -> dict[bytes, int]:
+        """Index the entries of the cache file by hash mapping to their record index in the block."""
+        if self._index is not None:
+            return self._index
+        self._index = {}
+        try:
+            with open(self.path, 'rb') as handle:
+                blob = handle.read()
+        except FileNotFoundError:
+            return self._index
+        except OSError as err:
+            log.warning('ignoring unreadable cache file %s (%s)' % (self.path, err))
+            return self._index
+
+        try:
+            magic, format_version, stamp, entry_count = HEADER.unpack_from(blob, 0)
+            if magic != MAGIC or format_version != FORMAT_VERSION:
+                log.warning('ignoring cache file %s of other format (version %d)' % (self.path, format_version))
+                return self._index
+            if stamp != STAMP:
+                log.info('ignoring cache file %s of other library version' % (self.path,))
+                return self._index
+            offset = HEADER.size + entry_count * DIGEST_SIZE
+            starts = range(HEADER.size, offset, DIGEST_SIZE)
+            index = {blob[start : start + DIGEST_SIZE]: slot for slot, start in enumerate(starts)}
+            block = Block(blob, offset)
+            if len(block) != entry_count or len(index) != entry_count or block.end != len(blob):
+                raise ValueError('inconsistent entries')
+        except (struct.error, UnicodeDecodeError, ValueError) as err:
+            log.warning('ignoring corrupt cache file %s (%s)' % (self.path, err))
+            return self._index
+
+        self._block, self._index = block, index
+        return self._index
+
+    def get(self, version_range: str, lean: bool = False) -> Union[VersionRanges, None]:
+        """Provide the version ranges for the whitespace free version range string if cached in the file."""
+        slot = self._load().get(digest(version_range))
+        if slot is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return VersionRanges._from_pairs(*self._block.entry(slot), lean=lean)  # type: ignore
+
+    def put(self, version_range: str, version_ranges: VersionRanges) -> None:
+        """Add the valid version ranges for the whitespace free version range string (written on save)."""
+        if self.read_only:
+            return
+        key = digest(version_range)
+        if key not in self._load():
+            self._added[key] = (version_ranges.versioning_scheme, version_ranges.version_constraint_pairs)
+            if len(self._added) >= self.flush_size:
+                self.save()
+
+    def save(self) -> int:
+        """Write the loaded and the added entries to the cache file if entries were added and return their count."""
+        if not self._added:
+            return 0
+        index, block = self._load(), self._block
+        keys = list(index) + list(self._added)
+        entries = [block.entry(slot) for slot in index.values()] if block is not None else []
+        entries.extend(self._added.values())
+        parts = [HEADER.pack(MAGIC, FORMAT_VERSION, STAMP, len(keys)), b''.join(keys), encode(entries)]
+
+        folder = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(folder, exist_ok=True)
+        handle, temporary = tempfile.mkstemp(prefix='.cache-', dir=folder)
+        try:
+            with os.fdopen(handle, 'wb') as target:
+                target.write(b''.join(parts))
+            os.replace(temporary, self.path)
+        except OSError:
+            os.unlink(temporary)
+            raise
+
+        added = len(self._added)
+        self._block, self._index, self._added = None, None, {}
+        self.saved += added
+        return added
+
+    def stats(self) -> dict[str, int]:
+        """Report the lookup counters together with the number of loaded and added entries."""
+        return {'hits': self.hits, 'misses': self.misses, 'loaded': len(self._index or {}), 'added': len(self._added)}
+
+
+def configured(read_only: bool = False) -> Union[DiskCache, None]:
+    """The disk cache configured by environment variable or configuration file (None if not configured).
+
+    Usage examples:
+
+    >>> os.environ[STORE_ENV] = '/some/where/ranges.cache'
+    >>> configured().path
+    '/some/where/ranges.cache'
+    >>> del os.environ[STORE_ENV]
+    """
+    path = os.getenv(STORE_ENV, '')
+    if path:
+        return DiskCache(os.path.expanduser(path), read_only=read_only)
+
+    for folder in (os.getcwd(), os.path.expanduser('~')):
+        config_path = os.path.join(folder, DEFAULT_CONFIG_NAME)
+        if not os.path.isfile(config_path):
+            continue
+        try:
+            with open(config_path, 'rt', encoding=ENCODING) as handle:
+                config = json.load(handle)
+        except (OSError, ValueError) as err:
+            log.warning('ignoring unreadable configuration file %s (%s)' % (config_path, err))
+            return None
+        path = config.get(CONFIG_KEY, '') if isinstance(config, dict) else ''
+        if not isinstance(path, str) or not path:
+            return None
+        return DiskCache(os.path.join(folder, os.path.expanduser(path)), read_only=read_only)
+
+    return None